@@ -0,0 +1,46 @@
+"""
+요청당 JWT 인증 오버헤드 벤치마크.
+
+    python -m benchmarks.authentication --requests 5000
+"""
+import argparse
+
+from benchmarks.utils import per_call_micros, setup_django, test_database
+
+setup_django()
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from blog_project.authentication import CachedJWTAuthentication  # noqa: E402
+from user.models import CustomUser  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with test_database():
+        user = CustomUser.objects.create_user("bench", "bench@example.com", "password123")
+        token = AccessToken.for_user(user)
+        request = APIRequestFactory().get(
+            "/api/books/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+        results = {}
+        for name, auth in (
+            ("JWTAuthentication", JWTAuthentication()),
+            ("CachedJWTAuthentication", CachedJWTAuthentication()),
+        ):
+            auth.authenticate(request)
+            results[name] = per_call_micros(lambda: auth.authenticate(request), args.requests)
+
+    print(f"{'authentication':<26}{'us/request':>12}")
+    for name, micros in results.items():
+        print(f"{name:<26}{micros:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+대용량 합성 데이터 생성기.
+
+팩토리처럼 행마다 Faker 를 호출하고 save() 하는 대신, 테이블을 고정 크기 청크로
+나누어 청크마다 열(column) 단위 리스트를 만들고, 메인 프로세스의 단일 writer 가
+청크 하나를 한 트랜잭션 안에서 cursor.executemany 로 넣습니다.
+
+- 결정적: 청크마다 (seed, 테이블, 청크 번호) 로 난수를 초기화하므로 워커 수와
+  관계없이 같은 seed 는 같은 데이터를 만듭니다.
+- 병렬: 열 생성은 Django 에 의존하지 않는 순수 함수라 multiprocessing 워커에서
+  실행하고, DB 쓰기는 메인 프로세스 하나가 담당합니다.
+- 관계: id 를 1 부터 직접 부여해 FK, M2M(book_genres), ReadingHistory 를 다시
+  조회하지 않고 바로 연결합니다. 비어 있는 DB 에서만 사용하세요.
+
+    python -m benchmarks.harness seed --scale full --workers 8
+"""
+import multiprocessing
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import repeat
+
+DEFAULT_CHUNK_SIZE = 50000
+BULK_LOAD_PRAGMAS = {"synchronous": "OFF", "cache_size": "-262144", "temp_store": "MEMORY"}
+
+STUDY_SPAN_DAYS = 730
+EXPERIMENT_STATUSES = ("PLANNED", "IN_PROGRESS", "COMPLETED", "CANCELLED")
+GENDERS = ("MALE", "FEMALE", "OTHER")
+
+_vocabularies = {}
+
+
+def vocabulary(seed):
+    """
+    Faker 로 한 번만 만든 단어/이름 풀. 같은 seed 면 프로세스마다 같은 풀이 만들어집니다.
+    """
+    pools = _vocabularies.get(seed)
+    if pools is None:
+        from faker import Faker
+
+        fake = Faker()
+        fake.seed_instance(seed)
+        pools = _vocabularies[seed] = {
+            "words": sorted(set(fake.words(nb=5000))),
+            "first_names": sorted({fake.first_name() for _ in range(2000)}),
+            "last_names": sorted({fake.last_name() for _ in range(2000)}),
+            "domains": sorted({fake.free_email_domain() for _ in range(50)}),
+        }
+    return pools
+
+
+def _sentence(rng, words, low, high):
+    return " ".join(rng.choices(words, k=rng.randint(low, high))).capitalize()
+
+
+def _text(rng, words, sentences=3):
+    return " ".join(_sentence(rng, words, 6, 14) + "." for _ in range(sentences))
+
+
+def _day(base, offset):
+    return (base + timedelta(days=offset)).isoformat()
+
+
+def gen_users(rng, start, size, pools, params):
+    ids = range(start + 1, start + size + 1)
+    return {
+        "id": list(ids),
+        "username": [f"user{i}" for i in ids],
+        "email": [f"user{i}@{rng.choice(pools['domains'])}" for i in ids],
+        "first_name": rng.choices(pools["first_names"], k=size),
+        "last_name": rng.choices(pools["last_names"], k=size),
+    }
+
+
+def gen_profiles(rng, start, size, pools, params):
+    ids = list(range(start + 1, start + size + 1))
+    return {"id": ids, "user_id": ids}
+
+
+def gen_genres(rng, start, size, pools, params):
+    ids = range(start + 1, start + size + 1)
+    return {
+        "id": list(ids),
+        "name": [f"{rng.choice(pools['words']).capitalize()} {i}" for i in ids],
+    }
+
+
+def gen_authors(rng, start, size, pools, params):
+    first, last, words = pools["first_names"], pools["last_names"], pools["words"]
+    return {
+        "id": list(range(start + 1, start + size + 1)),
+        "name": [f"{rng.choice(first)} {rng.choice(last)}" for _ in range(size)],
+        "bio": [_text(rng, words, 2) for _ in range(size)],
+    }
+
+
+def gen_books(rng, start, size, pools, params):
+    words = pools["words"]
+    ids = range(start + 1, start + size + 1)
+    titles = [_sentence(rng, words, 2, 5) for _ in range(size)]
+    base = date(2000, 1, 1)
+    days = (date.fromisoformat(params["today"]) - base).days
+    authors = params["authors"]
+    return {
+        "id": list(ids),
+        "title": titles,
+        "slug": [f"{'-'.join(t.lower().split()[:3])[:36]}-{i}" for t, i in zip(titles, ids)],
+        "author_id": [rng.randint(1, authors) for _ in range(size)],
+        "publication_date": [_day(base, rng.randrange(days)) for _ in range(size)],
+        "isbn": [str(9780000000000 + i) for i in ids],
+        "price": [f"{rng.uniform(1, 999):.2f}" for _ in range(size)],
+        "pages": [rng.randint(50, 1000) for _ in range(size)],
+        "rating": [round(rng.uniform(0, 5), 1) for _ in range(size)],
+        "description": [_text(rng, words) for _ in range(size)],
+    }
+
+
+def gen_book_genres(rng, start, size, pools, params):
+    # 책 id 범위 [start+1, start+size] 에 대해 책마다 장르 1~3 개
+    genres = range(1, params["genres"] + 1)
+    book_ids, genre_ids = [], []
+    for book_id in range(start + 1, start + size + 1):
+        for genre_id in rng.sample(genres, min(len(genres), rng.randint(1, 3))):
+            book_ids.append(book_id)
+            genre_ids.append(genre_id)
+    return {"book_id": book_ids, "genre_id": genre_ids}
+
+
+def gen_reading_history(rng, start, size, pools, params):
+    today = date.fromisoformat(params["today"])
+    users, books = params["users"], params["books"]
+    return {
+        "user_id": [rng.randint(1, users) for _ in range(size)],
+        "book_id": [rng.randint(1, books) for _ in range(size)],
+        "date_read": [_day(today, -rng.randrange(3650)) for _ in range(size)],
+        "rating": [rng.randint(1, 5) for _ in range(size)],
+    }
+
+
+def gen_studies(rng, start, size, pools, params):
+    words = pools["words"]
+    base = date.fromisoformat(params["today"]) - timedelta(days=STUDY_SPAN_DAYS // 2)
+    starts = [rng.randrange(STUDY_SPAN_DAYS) for _ in range(size)]
+    durations = [rng.randint(1, 365) for _ in range(size)]
+    return {
+        "title": [_sentence(rng, words, 2, 5) for _ in range(size)],
+        "description": [_text(rng, words) for _ in range(size)],
+        "start_date": [_day(base, offset) for offset in starts],
+        "end_date": [_day(base, offset + days) for offset, days in zip(starts, durations)],
+        "duration_days": durations,
+        "owner_id": [rng.randint(1, params["users"]) for _ in range(size)],
+    }
+
+
+def gen_experiments(rng, start, size, pools, params):
+    words = pools["words"]
+    base = datetime.fromisoformat(params["today"]) - timedelta(days=STUDY_SPAN_DAYS // 2)
+    starts = [base + timedelta(minutes=rng.randrange(STUDY_SPAN_DAYS * 1440)) for _ in range(size)]
+    return {
+        "name": [_sentence(rng, words, 2, 5) for _ in range(size)],
+        "description": [_text(rng, words) for _ in range(size)],
+        "start_date": [value.isoformat(" ") for value in starts],
+        "end_date": [
+            (value + timedelta(days=rng.randint(1, 180))).isoformat(" ") for value in starts
+        ],
+        "status": rng.choices(EXPERIMENT_STATUSES, k=size),
+        "researcher_id": [rng.randint(1, params["users"]) for _ in range(size)],
+    }
+
+
+def gen_people(rng, start, size, pools, params):
+    first = rng.choices(pools["first_names"], k=size)
+    last = rng.choices(pools["last_names"], k=size)
+    today = date.fromisoformat(params["today"])
+    ids = range(start + 1, start + size + 1)
+    return {
+        "first_name": first,
+        "last_name": last,
+        "email": [f"{f}.{l}.{i}@example.com".lower() for f, l, i in zip(first, last, ids)],
+        "birth_date": [_day(today, -rng.randint(18 * 365, 90 * 365)) for _ in range(size)],
+        "gender": rng.choices(GENDERS, k=size),
+    }
+
+
+# (이름, 모델 경로, 생성 함수, 행 수를 정하는 counts 키) — 의존 순서대로
+TABLES = (
+    ("users", "user.CustomUser", gen_users, "users"),
+    ("profiles", "book.UserProfile", gen_profiles, "users"),
+    ("genres", "book.Genre", gen_genres, "genres"),
+    ("authors", "book.Author", gen_authors, "authors"),
+    ("books", "book.Book", gen_books, "books"),
+    ("book_genres", "book.Book.genres", gen_book_genres, "books"),
+    ("reading_history", "book.ReadingHistory", gen_reading_history, "reading_history"),
+    ("studies", "study.Study", gen_studies, "studies"),
+    ("experiments", "lab.Experiment", gen_experiments, "experiments"),
+    ("people", "people.Person", gen_people, "people"),
+)
+GENERATORS = {name: func for name, _, func, _ in TABLES}
+
+
+def generate_chunk(task):
+    """
+    워커에서 실행됩니다. 청크 하나의 행 튜플 리스트를 반환합니다.
+    """
+    name, index, start, size, seed, params, constants = task
+    rng = random.Random(f"{seed}:{name}:{index}")
+    columns = GENERATORS[name](rng, start, size, vocabulary(seed), params)
+    values = list(columns.values())
+    rows = len(values[0]) if values else 0
+    values.extend(repeat(value, rows) for value in constants)
+    return name, list(columns), list(zip(*values))
+
+
+def resolve_model(path):
+    from django.apps import apps
+
+    app_label, model_name, *field = path.split(".")
+    model = apps.get_model(app_label, model_name)
+    if field:
+        return model._meta.get_field(field[0]).remote_field.through
+    return model
+
+
+def constant_columns(model, generated, connection, now):
+    """
+    생성 함수가 채우지 않는 열을 기본값/NULL/현재 시각으로 채울 (열 이름, 값) 목록.
+    값은 DB 에 맞게 한 번만 변환합니다.
+    """
+    columns = []
+    for field in model._meta.concrete_fields:
+        if field.column in generated or field.attname in generated or field.primary_key:
+            continue
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            value = now
+        elif field.has_default():
+            value = field.get_default()
+        elif field.null:
+            value = None
+        elif field.blank and field.empty_strings_allowed:
+            value = ""
+        else:
+            raise ValueError(f"{model.__name__}.{field.name} 에 값을 채울 수 없습니다.")
+        columns.append((field.column, field.get_db_prep_save(value, connection)))
+    return columns
+
+
+def _chunks(total, chunk_size):
+    for index, start in enumerate(range(0, total, chunk_size)):
+        yield index, start, min(chunk_size, total - start)
+
+
+def insert_sql(connection, model, columns):
+    qn = connection.ops.quote_name
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        qn(model._meta.db_table),
+        ", ".join(qn(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+
+
+def generate(
+    counts,
+    seed=0,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    overrides=None,
+    using="default",
+    log=print,
+):
+    """
+    counts (seed.SCALES 형식) 만큼 데이터를 생성해 저장하고 테이블별 (행 수, 쓰기 초) 를 반환합니다.
+    overrides 는 {테이블: {열: 값}} 형태로 모든 행에 같은 값을 넣을 열을 지정합니다.
+    """
+    from django.core.management.color import no_style
+    from django.db import connections, transaction
+    from django.utils import timezone
+
+    connection = connections[using]
+    now = timezone.now()
+    params = {
+        "today": now.date().isoformat(),
+        "users": counts["users"],
+        "authors": counts["authors"],
+        "books": counts["books"],
+        "genres": counts["genres"],
+    }
+    overrides = overrides or {}
+
+    plans = {}
+    tasks = []
+    for name, path, func, count_key in TABLES:
+        model = resolve_model(path)
+        generated = list(func(random.Random(seed), 0, 1, vocabulary(seed), params))
+        fixed = dict(overrides.get(name, {}))
+        constants = constant_columns(model, set(generated) | set(fixed), connection, now)
+        constants += list(fixed.items())
+        columns = generated + [column for column, _ in constants]
+        plans[name] = (model, insert_sql(connection, model, columns))
+        values = [value for _, value in constants]
+        for index, start, size in _chunks(counts[count_key], chunk_size):
+            tasks.append((name, index, start, size, seed, params, values))
+
+    stats = {name: [0, 0.0] for name, *_ in TABLES}
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    pool = multiprocessing.get_context("fork").Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap(generate_chunk, tasks) if pool else map(generate_chunk, tasks)
+        tables = [model._meta.db_table for model, _ in plans.values()]
+        with bulk_load(connection, tables):
+            for name, columns, rows in results:
+                model, sql = plans[name]
+                write_started = time.perf_counter()
+                with transaction.atomic(using=using):
+                    with connection.cursor() as cursor:
+                        cursor.executemany(sql, rows)
+                stats[name][0] += len(rows)
+                stats[name][1] += time.perf_counter() - write_started
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    # id 를 직접 넣었으므로 (PostgreSQL 등) 시퀀스를 맞춥니다.
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [model for model, _ in plans.values()]
+    )
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    # 직접 넣은 책은 save() 를 거치지 않았으므로 저자의 책 수를 다시 셉니다.
+    if counts["books"]:
+        from book.models import recount_author_books
+
+        recount_author_books(using=using)
+
+    elapsed = time.perf_counter() - started
+    total = sum(rows for rows, _ in stats.values())
+    for name, (rows, seconds) in stats.items():
+        log(f"{name:<16}{rows:>12,} rows  write {seconds:>7.1f}s")
+    log(f"{'total':<16}{total:>12,} rows  {elapsed:>7.1f}s ({total / elapsed:,.0f} rows/s)")
+    return {name: tuple(value) for name, value in stats.items()}
+
+
+@contextmanager
+def bulk_load(connection, tables):
+    """
+    SQLite 적재 중에는 fsync 를 끄고 캐시를 키우며, 보조 인덱스를 지웠다가 끝난 뒤
+    한 번에 다시 만듭니다 (무작위 순서의 FK 값으로 인덱스를 갱신하는 비용 제거).
+    트랜잭션 안(테스트 등)에서는 PRAGMA 를 바꿀 수 없으므로 그대로 둡니다.
+    """
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        yield
+        return
+    previous = {}
+    with connection.cursor() as cursor:
+        for name, value in BULK_LOAD_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}")
+            previous[name] = cursor.fetchone()[0]
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            "AND tbl_name IN ({})".format(", ".join(["%s"] * len(tables))),
+            list(tables),
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+            for name, value in previous.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,133 @@
+"""
+N 개 워커 프로세스가 동시에 쓸 때의 DB 프로필별 쓰기 처리량.
+
+워커마다 "읽고 나서 쓰는" 요청 하나를 흉내 내는 트랜잭션(카운터 조회, 갱신,
+이벤트 행 삽입)을 반복합니다. 각 트랜잭션 뒤에는 요청 종료 때처럼
+close_if_unusable_or_obsolete() 를 호출하므로 CONN_MAX_AGE=0 이면 매번 새로
+연결합니다.
+
+    python -m benchmarks.db_concurrency --profiles sqlite-basic,sqlite --workers 1,2,4,8
+
+postgresql 프로필은 DB_NAME/DB_USER/DB_HOST 등 환경 변수의 DB 를 사용합니다.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.utils import setup_django
+
+setup_django()
+
+from django.db import DatabaseError, connections, transaction  # noqa: E402
+
+from blog_project.database import database_profile  # noqa: E402
+
+ALIAS = "concurrency"
+COUNTERS = 16
+
+
+def configure(profile, name):
+    # 이전 실행의 커넥션(다른 파일/프로필)을 버리고 새 설정으로 만듭니다.
+    if ALIAS in connections.databases:
+        connections[ALIAS].close()
+        del connections[ALIAS]
+    connections.databases[ALIAS] = database_profile(profile, name)
+    connections.ensure_defaults(ALIAS)
+    connections.prepare_test_settings(ALIAS)
+    return connections[ALIAS]
+
+
+def prepare(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS bench_event")
+        cursor.execute("DROP TABLE IF EXISTS bench_counter")
+        cursor.execute(
+            "CREATE TABLE bench_counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        cursor.execute(
+            "CREATE TABLE bench_event (worker INTEGER, counter INTEGER, payload VARCHAR(64))"
+        )
+        for counter in range(COUNTERS):
+            cursor.execute("INSERT INTO bench_counter (id, value) VALUES (%s, 0)", [counter])
+
+
+def worker(profile, name, index, transactions, start, results):
+    connection = configure(profile, name)
+    start.wait()
+    done = errors = 0
+    started = time.perf_counter()
+    for n in range(transactions):
+        counter = (index + n) % COUNTERS
+        try:
+            with transaction.atomic(using=ALIAS):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT value FROM bench_counter WHERE id = %s", [counter])
+                    cursor.fetchone()
+                    cursor.execute(
+                        "UPDATE bench_counter SET value = value + 1 WHERE id = %s", [counter]
+                    )
+                    cursor.execute(
+                        "INSERT INTO bench_event (worker, counter, payload) VALUES (%s, %s, %s)",
+                        [index, counter, f"event-{index}-{n}"],
+                    )
+            done += 1
+        except DatabaseError:
+            errors += 1
+        connection.close_if_unusable_or_obsolete()
+    connection.close()
+    results.put((done, errors, time.perf_counter() - started))
+
+
+def run(profile, workers, transactions):
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        name = os.path.join(tmp, "concurrency.sqlite3") if profile.startswith("sqlite") else None
+        connection = configure(profile, name)
+        prepare(connection)
+        connection.close()
+
+        start = context.Barrier(workers + 1)
+        results = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(profile, name, i, transactions, start, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        start.wait()
+        started = time.perf_counter()
+        outcomes = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+        if not profile.startswith("sqlite"):
+            connection = configure(profile, name)
+            with connection.cursor() as cursor:
+                cursor.execute("DROP TABLE bench_event")
+                cursor.execute("DROP TABLE bench_counter")
+            connection.close()
+
+    done = sum(outcome[0] for outcome in outcomes)
+    errors = sum(outcome[1] for outcome in outcomes)
+    return done / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", default="sqlite-basic,sqlite")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--transactions", type=int, default=500, help="워커당 트랜잭션 수")
+    args = parser.parse_args()
+
+    print(f"{'profile':<14}{'workers':>8}{'tx/s':>10}{'errors':>8}")
+    for profile in args.profiles.split(","):
+        for workers in (int(value) for value in args.workers.split(",")):
+            throughput, errors = run(profile, workers, args.transactions)
+            print(f"{profile:<14}{workers:>8}{throughput:>10.0f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
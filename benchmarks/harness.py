@@ -0,0 +1,528 @@
+"""
+API 엔드포인트 부하 테스트 하네스.
+
+1) 시드: 전용 DB(benchmarks.settings)에 규모별 데이터를 채웁니다.
+
+    python -m benchmarks.harness seed --scale full
+
+2) 측정: 모든 엔드포인트를 APIClient(프로세스 내부)와 로컬 HTTP 서버에 대한
+   동시 요청으로 호출하고 처리량, p50/p95/p99 지연, 쿼리 수, 최대 메모리를
+   JSON 보고서로 저장합니다.
+
+    python -m benchmarks.harness run --output benchmarks/reports/head.json
+
+   --accept-encoding gzip 로 압축 응답을 받아 전송량(response_bytes)을 비교할 수 있습니다.
+
+3) 비교: 두 보고서를 비교해 임계값 이상 나빠진 지표가 있으면 종료 코드 1.
+
+    python -m benchmarks.harness compare base.json head.json --threshold 0.1
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+# 높을수록 나쁜 지표와 낮을수록 나쁜 지표
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "queries", "peak_memory_kb", "response_bytes")
+HIGHER_IS_BETTER = ("throughput_rps",)
+# 이보다 작은 지연 변화(ms)는 측정 잡음으로 보고 무시합니다.
+MIN_LATENCY_DELTA_MS = 0.2
+
+# PerformanceMiddleware 의 Server-Timing 헤더: db;dur=1.23;desc="4 queries"
+_SERVER_TIMING_QUERIES = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    path: str
+
+
+ENDPOINTS = (
+    Endpoint("books-list", "/api/books/"),
+    Endpoint("books-detail", "/api/books/{book}/"),
+    Endpoint("books-list-1000", "/api/books/?page_size=1000"),
+    Endpoint("books-search", "/api/books/?search=the"),
+    Endpoint("books-popular", "/api/books/popular/"),
+    Endpoint("books-recent", "/api/books/recent/"),
+    Endpoint("books-by-price-range", "/api/books/by_price_range/?min_price=10&max_price=50"),
+    Endpoint("books-top-rated", "/api/books/top_rated/"),
+    Endpoint("books-by-genre", "/api/books/by_genre/?genre={genre}"),
+    Endpoint("books-complex-analysis", "/api/complex-analysis/"),
+    Endpoint("authors-list", "/api/authors/"),
+    Endpoint("authors-detail", "/api/authors/{author}/"),
+    Endpoint("authors-books", "/api/authors/{author}/books/"),
+    Endpoint("authors-prolific", "/api/authors/prolific/"),
+    Endpoint("studies-list", "/api/studies/"),
+    Endpoint("studies-detail", "/api/studies/{study}/"),
+    Endpoint("studies-active", "/api/studies/active/"),
+    Endpoint("studies-ongoing", "/api/studies/ongoing/"),
+    Endpoint("studies-by-duration", "/api/studies/by_duration/?min_duration=10&max_duration=100"),
+    Endpoint("experiments-list", "/api/experiments/"),
+    Endpoint("experiments-detail", "/api/experiments/{experiment}/"),
+    Endpoint("experiments-by-status", "/api/experiments/by_status/"),
+    Endpoint("people-list", "/api/people/"),
+    Endpoint("people-detail", "/api/people/{person}/"),
+    Endpoint("people-adults", "/api/people/adults/"),
+    Endpoint("users-list", "/api/users/"),
+    Endpoint("users-detail", "/api/users/{user}/"),
+)
+
+
+def percentile(values, pct):
+    """
+    최근접 순위(nearest-rank) 백분위수. values 는 정렬되어 있어야 합니다.
+    """
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(latencies, statuses, elapsed):
+    latencies = sorted(latencies)
+    summary = {
+        "requests": len(latencies),
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+    for pct in (50, 95, 99):
+        value = percentile(latencies, pct)
+        summary[f"p{pct}_ms"] = None if value is None else round(value * 1000, 3)
+    return summary
+
+
+def object_ids():
+    """
+    상세 엔드포인트에 사용할 대표 객체의 id.
+    """
+    from book.models import Author, Book, Genre
+    from lab.models import Experiment
+    from people.models import Person
+    from study.models import Study
+    from user.models import CustomUser
+
+    def first(queryset, field="pk"):
+        return queryset.order_by("pk").values_list(field, flat=True).first()
+
+    return {
+        "book": first(Book.objects.all()),
+        "author": first(Author.objects.all()),
+        "genre": first(Genre.objects.all(), "name"),
+        "study": first(Study.objects.all()),
+        "experiment": first(Experiment.objects.all()),
+        "person": first(Person.objects.all()),
+        "user": first(CustomUser.objects.all()),
+    }
+
+
+def resolve(endpoints, ids):
+    ids = {key: quote(str(value)) for key, value in ids.items()}
+    return [(endpoint.name, endpoint.path.format(**ids)) for endpoint in endpoints]
+
+
+def server_timing(response):
+    """
+    (DB 시간 ms, 쿼리 수). 헤더가 없으면 (None, None).
+    """
+    match = _SERVER_TIMING_QUERIES.search(response.get("Server-Timing", ""))
+    if match is None:
+        return None, None
+    return float(match.group(1)), int(match.group(2))
+
+
+def auth_header(username):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from user.models import CustomUser
+
+    user = CustomUser.objects.get(username=username)
+    return f"Bearer {AccessToken.for_user(user)}"
+
+
+def measure_client(path, authorization, iterations, warmup=3, accept_encoding=None):
+    """
+    APIClient 로 순차 호출합니다. 최대 메모리는 별도 호출 한 번으로 측정해
+    tracemalloc 오버헤드가 지연 시간에 섞이지 않도록 합니다.
+    """
+    from rest_framework.test import APIClient
+
+    client = APIClient(raise_request_exception=False)
+    credentials = {"HTTP_AUTHORIZATION": authorization}
+    if accept_encoding:
+        credentials["HTTP_ACCEPT_ENCODING"] = accept_encoding
+    client.credentials(**credentials)
+
+    for _ in range(warmup):
+        client.get(path)
+
+    tracemalloc.start()
+    try:
+        client.get(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = []
+    db_times = []
+    statuses = Counter()
+    queries = None
+    response_bytes = None
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request_started = time.perf_counter()
+        response = client.get(path)
+        if response.streaming:
+            response_bytes = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            response_bytes = len(response.content)
+        latencies.append(time.perf_counter() - request_started)
+        statuses[response.status_code] += 1
+        db_time, queries = server_timing(response)
+        if db_time is not None:
+            db_times.append(db_time)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, statuses, elapsed)
+    summary["queries"] = queries
+    summary["db_p50_ms"] = percentile(sorted(db_times), 50)
+    summary["peak_memory_kb"] = round(peak / 1024, 1)
+    summary["response_bytes"] = response_bytes
+    return summary
+
+
+class LocalServer:
+    """
+    WSGI 애플리케이션을 임의 포트의 ThreadedWSGIServer 로 띄웁니다.
+    """
+
+    def __init__(self, host="127.0.0.1"):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadedWSGIServer((host, 0), QuietHandler, allow_reuse_address=False)
+        self.server.set_app(WSGIHandler())
+        self.host, self.port = self.server.server_address[:2]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def measure_http(host, port, path, authorization, requests, concurrency, accept_encoding=None):
+    """
+    concurrency 개 스레드가 합쳐서 requests 번 GET 합니다.
+    """
+    headers = {"Authorization": authorization, "Accept": "application/json"}
+    if accept_encoding:
+        headers["Accept-Encoding"] = accept_encoding
+    latencies = []
+    sizes = []
+    statuses = Counter()
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def worker():
+        local_latencies = []
+        local_statuses = Counter()
+        local_sizes = []
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            request_started = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                local_sizes.append(len(response.read()))
+                local_statuses[response.status] += 1
+            except (OSError, http.client.HTTPException):
+                local_statuses[599] += 1
+            finally:
+                conn.close()
+            local_latencies.append(time.perf_counter() - request_started)
+        with lock:
+            latencies.extend(local_latencies)
+            statuses.update(local_statuses)
+            sizes.extend(local_sizes)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, statuses, elapsed)
+    summary["concurrency"] = concurrency
+    summary["response_bytes"] = max(sizes) if sizes else None
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    iterations=50,
+    http_requests=200,
+    concurrency=8,
+    modes=("client", "http"),
+    only=None,
+    username=None,
+    accept_encoding=None,
+    log=print,
+):
+    """
+    모든 엔드포인트를 측정해 보고서(dict)를 반환합니다.
+    """
+    import django
+    from django.db import connection
+
+    from benchmarks.seed import BENCH_USERNAME, table_counts
+
+    ids = object_ids()
+    endpoints = [endpoint for endpoint in ENDPOINTS if not only or endpoint.name in only]
+    authorization = auth_header(username or BENCH_USERNAME)
+
+    results = {}
+    for name, path in resolve(endpoints, ids):
+        results[name] = {"path": path}
+        if "client" in modes:
+            results[name]["client"] = measure_client(
+                path, authorization, iterations, accept_encoding=accept_encoding
+            )
+
+    if "http" in modes:
+        with LocalServer() as server:
+            for name, path in resolve(endpoints, ids):
+                results[name]["http"] = measure_http(
+                    server.host,
+                    server.port,
+                    path,
+                    authorization,
+                    http_requests,
+                    concurrency,
+                    accept_encoding=accept_encoding,
+                )
+
+    for name, result in results.items():
+        log(format_result(name, result))
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "counts": table_counts(),
+            "iterations": iterations,
+            "http_requests": http_requests,
+            "concurrency": concurrency,
+            "accept_encoding": accept_encoding,
+        },
+        "endpoints": results,
+    }
+
+
+def format_result(name, result):
+    def number(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    parts = [f"{name:<26}"]
+    for mode in ("client", "http"):
+        summary = result.get(mode)
+        if summary:
+            parts.append(
+                f"{mode}: p50 {number(summary['p50_ms'], '>8.2f')}ms "
+                f"p95 {number(summary['p95_ms'], '>8.2f')}ms "
+                f"{number(summary['throughput_rps'], '>8.1f')} rps errors {summary['errors']}"
+            )
+    client = result.get("client")
+    if client:
+        parts.append(
+            f"queries {client['queries']} peak {client['peak_memory_kb']}KB "
+            f"body {client.get('response_bytes')}B"
+        )
+    return "  ".join(parts)
+
+
+def compare(base, head, threshold=0.1):
+    """
+    두 보고서를 비교해 (엔드포인트, 모드, 지표, 기준값, 현재값, 변화율) 목록을 반환합니다.
+    쿼리 수는 하나라도 늘면, 나머지는 threshold 비율 이상 나빠지면 회귀로 봅니다.
+    """
+    regressions = []
+    for name, head_result in head["endpoints"].items():
+        base_result = base["endpoints"].get(name)
+        if base_result is None:
+            continue
+        for mode in ("client", "http"):
+            before = base_result.get(mode)
+            after = head_result.get(mode)
+            if not before or not after:
+                continue
+            if after.get("errors", 0) > before.get("errors", 0):
+                regressions.append(
+                    (name, mode, "errors", before.get("errors", 0), after["errors"], math.inf)
+                )
+            # 기준 측정에 오류 응답이 섞여 있으면 지연/처리량 비교는 의미가 없습니다.
+            if before.get("errors", 0):
+                continue
+            for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                old, new = before.get(metric), after.get(metric)
+                if old is None or new is None:
+                    continue
+                change = (new - old) / old if old else (math.inf if new > old else 0.0)
+                if metric in HIGHER_IS_BETTER:
+                    regressed = change < -threshold
+                elif metric == "queries":
+                    regressed = new > old
+                else:
+                    regressed = change > threshold
+                    if metric.endswith("_ms") and new - old < MIN_LATENCY_DELTA_MS:
+                        regressed = False
+                if regressed:
+                    regressions.append((name, mode, metric, old, new, change))
+    return regressions
+
+
+def _setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    from benchmarks.utils import setup_django
+
+    setup_django()
+
+
+def _reset_database():
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    name = str(settings.DATABASES["default"]["NAME"])
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(name + suffix):
+            os.remove(name + suffix)
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="전용 DB 를 새로 만들고 데이터를 채웁니다")
+    seed_parser.add_argument("--scale", default="smoke")
+    seed_parser.add_argument("--seed", type=int, default=0)
+    seed_parser.add_argument("--workers", type=int, help="생성 프로세스 수 (기본: CPU 수)")
+    seed_parser.add_argument("--chunk-size", type=int, default=50000)
+
+    run_parser = commands.add_parser("run", help="엔드포인트를 측정해 JSON 보고서를 씁니다")
+    run_parser.add_argument("--iterations", type=int, default=50)
+    run_parser.add_argument("--http-requests", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--mode", choices=("client", "http"), action="append")
+    run_parser.add_argument("--endpoint", action="append", help="측정할 엔드포인트 이름")
+    run_parser.add_argument("--accept-encoding", help="요청 Accept-Encoding (예: gzip, br)")
+    run_parser.add_argument("--output")
+
+    compare_parser = commands.add_parser("compare", help="두 보고서를 비교합니다")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.head) as f:
+            head = json.load(f)
+        regressions = compare(base, head, args.threshold)
+        print(
+            f"{base['meta'].get('revision')} -> {head['meta'].get('revision')}: "
+            f"{len(regressions)} regression(s)"
+        )
+        for name, mode, metric, old, new, change in regressions:
+            print(f"  {name:<26}{mode:<8}{metric:<16}{old:>12} -> {new:<12} ({change:+.1%})")
+        return 1 if regressions else 0
+
+    _setup()
+    if args.command == "seed":
+        from benchmarks.seed import seed
+
+        _reset_database()
+        seed(
+            args.scale,
+            seed_value=args.seed,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        return 0
+
+    from django.db import DatabaseError
+
+    from benchmarks.seed import table_counts
+
+    try:
+        seeded = table_counts()["books"] > 0
+    except DatabaseError:
+        seeded = False
+    if not seeded:
+        parser.error("벤치마크 DB 가 비어 있습니다. 먼저 'seed' 를 실행하세요.")
+    report = run(
+        iterations=args.iterations,
+        http_requests=args.http_requests,
+        concurrency=args.concurrency,
+        modes=tuple(args.mode or ("client", "http")),
+        only=args.endpoint,
+        accept_encoding=args.accept_encoding,
+    )
+    output = args.output or os.path.join(
+        "benchmarks", "reports", f"{report['meta']['revision'] or 'report'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
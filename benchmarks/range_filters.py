@@ -0,0 +1,114 @@
+"""
+책 범위 필터(가격, 출판 연도) 벤치마크.
+
+임시 SQLite DB 에 책 N 권(기본 100만)을 만들고, 목록 API 와 같은 쿼리(count + 첫 페이지)를
+인덱스가 있을 때와 없을 때 비교합니다. 연도 조건은 BookFilter 의 날짜 범위, 이전 필터의
+__year 조회(Django 가 BETWEEN 으로 바꿈), 컬럼을 함수로 감싼 strftime('%Y') 비교를 함께
+측정합니다. 케이스마다 EXPLAIN QUERY PLAN 을 함께 출력합니다.
+
+    python -m benchmarks.range_filters --books 1000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def measure(queryset, iterations):
+    timings = {"count": [], "page": []}
+    for _ in range(iterations):
+        started = time.perf_counter()
+        queryset.count()
+        timings["count"].append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        list(queryset[:10])
+        timings["page"].append((time.perf_counter() - started) * 1000)
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def plan(queryset):
+    # 사용하는 인덱스(SEARCH ... USING INDEX)가 나오는 줄만
+    lines = [line for line in queryset.explain().splitlines() if "book_book" in line]
+    return "; ".join(line.split("--")[-1].strip() for line in lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=1000000)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--workers", type=int, help="데이터 생성 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--year", type=int, default=2015)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+        os.environ["BENCH_DATABASE"] = os.path.join(tmp, "range.sqlite3")
+        from benchmarks.utils import setup_django
+
+        setup_django()
+        run(args)
+
+
+def run(args):
+    from django.core.management import call_command
+    from django.db import connection
+    from django.db.models import CharField, F, Func
+
+    from benchmarks import datagen
+    from book.filters import BookFilter
+    from book.models import Book
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    counts = {
+        "users": 1,
+        "authors": max(args.books // 10, 1),
+        "books": args.books,
+        "genres": 50,
+        "reading_history": 0,
+        "studies": 0,
+        "experiments": 0,
+        "people": 0,
+    }
+    datagen.generate(
+        counts,
+        workers=args.workers,
+        overrides={"users": {"password": "!"}},
+        log=lambda line: None,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    def api(params):
+        return BookFilter(params, queryset=Book.objects.all()).qs
+
+    cases = {
+        "price 10-12": lambda: api({"min_price": "10", "max_price": "12"}),
+        "year (range)": lambda: api({"publication_year": str(args.year)}),
+        "year (__year)": lambda: Book.objects.filter(publication_date__year=args.year),
+        "year (strftime)": lambda: Book.objects.annotate(
+            year=Func(
+                F("publication_date"),
+                template="strftime('%%%%Y', %(expressions)s)",
+                output_field=CharField(),
+            )
+        ).filter(year=str(args.year)),
+    }
+    print(f"{args.books:,} books, median of {args.iterations} runs")
+    print(f"{'case':<22}{'indexes':<9}{'count ms':>10}{'page ms':>10}  plan")
+    for indexed in (True, False):
+        if not indexed:
+            with connection.schema_editor() as editor:
+                for index in Book._meta.indexes:
+                    editor.remove_index(Book, index)
+        for name, build in cases.items():
+            queryset = build()
+            result = measure(queryset, args.iterations)
+            print(
+                f"{name:<22}{'yes' if indexed else 'no':<9}"
+                f"{result['count']:>10.1f}{result['page']:>10.1f}  {plan(queryset)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
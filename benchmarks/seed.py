@@ -0,0 +1,82 @@
+"""
+부하 테스트용 데이터 시드.
+
+규모별 행 수(SCALES)를 정의하고 benchmarks.datagen 으로 데이터를 채운 뒤,
+측정에 사용할 관리자 계정을 만듭니다.
+"""
+from django.contrib.auth.hashers import make_password
+
+from benchmarks import datagen
+from book.models import Author, Book, Genre, ReadingHistory, UserProfile
+from lab.models import Experiment
+from people.models import Person
+from study.models import Study
+from user.models import CustomUser
+
+SCALES = {
+    "smoke": {
+        "users": 100,
+        "authors": 200,
+        "books": 2000,
+        "genres": 20,
+        "reading_history": 20000,
+        "studies": 500,
+        "experiments": 500,
+        "people": 1000,
+    },
+    "medium": {
+        "users": 10000,
+        "authors": 10000,
+        "books": 100000,
+        "genres": 50,
+        "reading_history": 1000000,
+        "studies": 10000,
+        "experiments": 10000,
+        "people": 50000,
+    },
+    "full": {
+        "users": 100000,
+        "authors": 100000,
+        "books": 1000000,
+        "genres": 100,
+        "reading_history": 10000000,
+        "studies": 100000,
+        "experiments": 100000,
+        "people": 100000,
+    },
+}
+
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "password123"
+
+
+def seed(scale="smoke", seed_value=0, workers=None, chunk_size=datagen.DEFAULT_CHUNK_SIZE, log=print):
+    """
+    빈 DB 에 SCALES[scale] 만큼 데이터를 만들고 테이블별 (행 수, 쓰기 초) 를 반환합니다.
+    """
+    # 비밀번호 해시는 한 번만 계산해 모든 사용자에게 재사용합니다.
+    password = make_password(BENCH_PASSWORD)
+    stats = datagen.generate(
+        SCALES[scale],
+        seed=seed_value,
+        workers=workers,
+        chunk_size=chunk_size,
+        overrides={"users": {"password": password}},
+        log=log,
+    )
+    user = CustomUser.objects.create_superuser(BENCH_USERNAME, "bench@example.com", BENCH_PASSWORD)
+    UserProfile.objects.create(user=user)
+    return stats
+
+
+def table_counts():
+    return {
+        "users": CustomUser.objects.count(),
+        "authors": Author.objects.count(),
+        "books": Book.objects.count(),
+        "genres": Genre.objects.count(),
+        "reading_history": ReadingHistory.objects.count(),
+        "studies": Study.objects.count(),
+        "experiments": Experiment.objects.count(),
+        "people": Person.objects.count(),
+    }
@@ -0,0 +1,44 @@
+"""
+부하 테스트용 설정. 운영 설정을 그대로 쓰되 전용 SQLite 파일을 사용하고
+측정을 방해하는 쓰로틀 한도와 쿼리 예산 검사를 끕니다.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings
+"""
+import os
+
+from blog_project.settings import *  # noqa: F401,F403
+from blog_project.database import database_profile
+from blog_project.settings import BASE_DIR, CACHES, DATABASE_PROFILE, REST_FRAMEWORK
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver", "127.0.0.1", "localhost"]
+
+DATABASES = {
+    "default": database_profile(
+        DATABASE_PROFILE,
+        os.getenv("BENCH_DATABASE", str(BASE_DIR / "benchmarks" / "bench.sqlite3")),
+    )
+}
+
+# 한도에 걸리지 않도록 충분히 큰 비율을 사용합니다.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        scope: "1000000000/day" for scope in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    },
+}
+THROTTLE_STORE = {"BACKEND": "blog_project.throttling.MemoryThrottleStore"}
+CACHES = {
+    **CACHES,
+    "shared": {
+        **CACHES["shared"],
+        "LOCATION": os.getenv("BENCH_CACHE", str(BASE_DIR / "benchmarks" / "cache.sqlite3")),
+    },
+}
+
+QUERY_BUDGET_ENFORCE = False
+# 쿼리 수를 Server-Timing 헤더에서 읽습니다 (harness.server_timing).
+SERVER_TIMING_PUBLIC = True
+
+# 시드 사용자 생성 시 PBKDF2 비용을 줄입니다.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
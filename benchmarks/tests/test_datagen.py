@@ -0,0 +1,78 @@
+import pytest
+from benchmarks import datagen
+from book.models import Author, Book, Genre, ReadingHistory, UserProfile
+from lab.models import Experiment
+from people.models import Person
+from study.models import Study
+from user.models import CustomUser
+
+COUNTS = {
+    "users": 5,
+    "authors": 4,
+    "books": 25,
+    "genres": 3,
+    "reading_history": 60,
+    "studies": 7,
+    "experiments": 7,
+    "people": 9,
+}
+
+
+def generate(**kwargs):
+    kwargs.setdefault("overrides", {"users": {"password": "!"}})
+    return datagen.generate(COUNTS, workers=1, chunk_size=10, log=lambda message: None, **kwargs)
+
+
+def test_chunks_are_deterministic():
+    task = ("books", 3, 30, 10, 42, {"today": "2024-06-01", "authors": 5}, [])
+    assert datagen.generate_chunk(task) == datagen.generate_chunk(task)
+    other_seed = ("books", 3, 30, 10, 43, {"today": "2024-06-01", "authors": 5}, [])
+    assert datagen.generate_chunk(task) != datagen.generate_chunk(other_seed)
+
+
+def test_constants_are_appended_to_rows():
+    task = ("profiles", 0, 0, 3, 0, {}, ["x"])
+    name, columns, rows = datagen.generate_chunk(task)
+    assert columns == ["id", "user_id"]
+    assert rows == [(1, 1, "x"), (2, 2, "x"), (3, 3, "x")]
+
+
+@pytest.mark.django_db
+class TestGenerate:
+    def test_row_counts(self):
+        stats = generate()
+        assert stats["books"][0] == 25
+        assert CustomUser.objects.count() == 5
+        assert UserProfile.objects.count() == 5
+        assert Genre.objects.count() == 3
+        assert Author.objects.count() == 4
+        assert Book.objects.count() == 25
+        assert ReadingHistory.objects.count() == 60
+        assert Study.objects.count() == 7
+        assert Experiment.objects.count() == 7
+        assert Person.objects.count() == 9
+
+    def test_relations_are_wired(self):
+        generate()
+        through = Book.genres.through
+        assert through.objects.values("book_id").distinct().count() == 25
+        assert not Book.objects.exclude(author__in=Author.objects.all()).exists()
+        assert ReadingHistory.objects.filter(user__user__isnull=False).count() == 60
+
+    def test_rows_are_loadable_by_orm(self):
+        generate()
+        book = Book.objects.select_related("author").first()
+        assert book.slug.endswith(f"-{book.pk}")
+        assert book.author.name
+        assert book.created_at is not None
+        assert Experiment.objects.first().start_date.tzinfo is not None
+        assert CustomUser.objects.get(username="user1").is_active
+
+    def test_same_seed_same_data(self):
+        generate(seed=7)
+        first = list(Book.objects.order_by("pk").values_list("title", "price", "author_id"))
+        Book.objects.all().delete()
+        for model in (ReadingHistory, Person, Experiment, Study, Author, Genre, UserProfile, CustomUser):
+            model._base_manager.all().delete()
+        generate(seed=7)
+        assert list(Book.objects.order_by("pk").values_list("title", "price", "author_id")) == first
@@ -0,0 +1,95 @@
+import pytest
+from benchmarks import harness, seed
+from book.models import Author, Book, ReadingHistory
+
+
+def report(**metrics):
+    summary = {
+        "errors": 0,
+        "p50_ms": 10.0,
+        "p95_ms": 20.0,
+        "p99_ms": 30.0,
+        "queries": 3,
+        "peak_memory_kb": 100.0,
+        "throughput_rps": 100.0,
+    }
+    summary.update(metrics)
+    return {"meta": {}, "endpoints": {"books-list": {"client": summary}}}
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert harness.percentile(values, 50) == 50
+    assert harness.percentile(values, 99) == 99
+    assert harness.percentile([5], 95) == 5
+    assert harness.percentile([], 50) is None
+
+
+class TestCompare:
+    def test_no_regression_within_threshold(self):
+        assert harness.compare(report(), report(p95_ms=21.0, throughput_rps=95.0)) == []
+
+    def test_small_absolute_latency_change_is_noise(self):
+        base = report(p50_ms=0.5)
+        assert harness.compare(base, report(p50_ms=0.6)) == []
+
+    def test_regressions(self):
+        head = report(p95_ms=30.0, queries=4, throughput_rps=50.0)
+        regressed = {metric for _, _, metric, *rest in harness.compare(report(), head)}
+        assert regressed == {"p95_ms", "queries", "throughput_rps"}
+
+    def test_new_errors_are_regressions(self):
+        regressed = harness.compare(report(), report(errors=2))
+        assert [metric for _, _, metric, *rest in regressed] == ["errors"]
+
+    def test_failing_baseline_skips_latency(self):
+        assert harness.compare(report(errors=5), report(errors=5, p95_ms=500.0)) == []
+
+
+@pytest.mark.django_db
+class TestSeedAndMeasure:
+    @pytest.fixture(autouse=True)
+    def tiny_scale(self, monkeypatch):
+        monkeypatch.setitem(
+            seed.SCALES,
+            "tiny",
+            {
+                "users": 3,
+                "authors": 4,
+                "books": 12,
+                "genres": 3,
+                "reading_history": 30,
+                "studies": 2,
+                "experiments": 2,
+                "people": 2,
+            },
+        )
+
+    def test_seed_counts(self):
+        seed.seed("tiny", workers=1, chunk_size=5, log=lambda message: None)
+        counts = seed.table_counts()
+        assert counts["books"] == 12
+        assert counts["authors"] == 4
+        assert counts["users"] == 4  # bench 사용자 포함
+        assert counts["reading_history"] == 30
+        assert Book.genres.through.objects.count() >= 12
+        assert len(set(Book.objects.values_list("isbn", flat=True))) == 12
+        assert ReadingHistory.objects.filter(book__in=Book.objects.all()).count() == 30
+        assert set(Book.objects.values_list("author_id", flat=True)) <= set(
+            Author.objects.values_list("id", flat=True)
+        )
+
+    def test_measure_client(self):
+        seed.seed("tiny", workers=1, chunk_size=5, log=lambda message: None)
+        authorization = harness.auth_header(seed.BENCH_USERNAME)
+        ids = harness.object_ids()
+        [(name, path)] = harness.resolve([harness.ENDPOINTS[1]], ids)
+        assert path == f"/api/books/{ids['book']}/"
+
+        summary = harness.measure_client(path, authorization, iterations=5, warmup=1)
+        assert summary["requests"] == 5
+        assert summary["status"] == {"200": 5}
+        assert summary["queries"] >= 1
+        assert summary["peak_memory_kb"] > 0
+        assert summary["response_bytes"] > 0
+        assert summary["p50_ms"] <= summary["p99_ms"]
@@ -0,0 +1,93 @@
+"""
+요청당 쓰로틀 오버헤드 벤치마크.
+
+DRF 기본 쓰로틀(캐시 + 타임스탬프 리스트)과 GCRA 저장소(메모리/SQLite)를
+DEFAULT_THROTTLE_CLASSES 와 같은 구성(anon, user, scoped)으로 비교합니다.
+
+    python -m benchmarks.throttle --requests 20000
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.utils import per_call_micros, setup_django
+
+setup_django()
+
+from django.test import override_settings  # noqa: E402
+from rest_framework import throttling as drf_throttling  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from blog_project import throttling  # noqa: E402
+
+
+class BenchUser:
+    pk = 1
+    is_authenticated = True
+
+
+class BenchView:
+    throttle_scope = "books"
+
+
+def run(throttle_classes, requests):
+    factory = APIRequestFactory()
+    view = BenchView()
+
+    def handle_request():
+        request = Request(factory.get("/api/books/"))
+        request.user = BenchUser()
+        for throttle_class in throttle_classes:
+            throttle_class().allow_request(request, view)
+
+    return per_call_micros(handle_request, requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    # 한도에 걸리지 않도록 충분히 큰 비율을 사용합니다.
+    rates = {"anon": "1000000000/day", "user": "1000000000/day", "books": "1000000000/day"}
+    drf_classes = [
+        type(cls.__name__, (cls,), {"THROTTLE_RATES": rates})
+        for cls in (
+            drf_throttling.AnonRateThrottle,
+            drf_throttling.UserRateThrottle,
+            drf_throttling.ScopedRateThrottle,
+        )
+    ]
+    gcra_classes = [
+        type(cls.__name__, (cls,), {"THROTTLE_RATES": rates})
+        for cls in (
+            throttling.AnonRateThrottle,
+            throttling.UserRateThrottle,
+            throttling.ScopedRateThrottle,
+        )
+    ]
+
+    results = {}
+    # DRF 기본 구현은 요청 수만큼 타임스탬프 리스트가 커지므로 같은 키로 반복합니다.
+    results["drf cache (LocMem)"] = run(drf_classes, args.requests)
+
+    memory = {"BACKEND": "blog_project.throttling.MemoryThrottleStore"}
+    with override_settings(THROTTLE_STORE=memory):
+        results["gcra memory"] = run(gcra_classes, args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = {
+            "BACKEND": "blog_project.throttling.SQLiteThrottleStore",
+            "OPTIONS": {"path": os.path.join(tmp, "throttle.sqlite3")},
+        }
+        with override_settings(THROTTLE_STORE=sqlite):
+            results["gcra sqlite (shared)"] = run(gcra_classes, args.requests)
+
+    print(f"{'backend':<24}{'us/request':>12}")
+    for name, micros in results.items():
+        print(f"{name:<24}{micros:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+벤치마크 스크립트 공용 유틸리티.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    개발 DB 를 건드리지 않도록 테스트 DB 를 만들고 끝나면 제거합니다.
+    """
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def per_call_micros(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
@@ -14,3 +14,21 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
 
 application = get_asgi_application()
+
+# 프록시 없이 띄울 때 미디어 파일은 Django 를 거치지 않고 바로 전송
+from blog_project.media import MediaASGIHandler  # noqa: E402
+
+application = MediaASGIHandler(application)
+
+# 목록 변경 피드 (SSE/WebSocket)
+from outbox.asgi import ChangeFeedASGIHandler  # noqa: E402
+
+application = ChangeFeedASGIHandler(application)
+
+# 별도 스케줄러 프로세스 없이 실험 상태 자동 전이를 실행
+from django.conf import settings  # noqa: E402
+
+if settings.LIFECYCLE_SCHEDULER_THREAD:
+    from lab.lifecycle import ExperimentLifecycle
+
+    ExperimentLifecycle().start()
@@ -0,0 +1,143 @@
+"""
+검증된 JWT -> 사용자 스냅샷 캐시를 사용하는 인증 클래스.
+
+기본 JWTAuthentication 은 요청마다 토큰을 디코딩/HMAC 검증하고 CustomUser 를
+DB 에서 조회합니다. 여기서는 한 번 검증한 토큰을 남은 유효 기간(최대 TIMEOUT)
+동안 프로세스 메모리에 보관하고, 캐시 적중 시 검증과 조회를 모두 건너뜁니다.
+CustomUser 가 저장되거나(soft_delete, restore 포함) 삭제되면 해당 사용자의 항목이 제거됩니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+
+class TokenUserCache:
+    """
+    raw token 을 키로 하는 LRU 캐시. 사용자 id 별 역색인으로 무효화합니다.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tokens_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, raw_token, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self._remove(raw_token)
+                return None
+            self._entries.move_to_end(raw_token)
+            return entry
+
+    def set(self, raw_token, expires_at, user_id, snapshot, validated_token):
+        with self._lock:
+            if raw_token in self._entries:
+                self._remove(raw_token)
+            self._entries[raw_token] = (expires_at, user_id, snapshot, validated_token)
+            self._tokens_by_user.setdefault(user_id, set()).add(raw_token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for raw_token in self._tokens_by_user.pop(user_id, ()):
+                self._entries.pop(raw_token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, raw_token):
+        expires_at, user_id, snapshot, validated_token = self._entries.pop(raw_token)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(raw_token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _cache_settings():
+    return getattr(settings, "JWT_USER_CACHE", {})
+
+
+token_user_cache = TokenUserCache(_cache_settings().get("MAX_ENTRIES", 10000))
+
+
+def invalidate_cached_user(user_id):
+    """
+    사용자 상태가 바뀌었을 때 캐시된 토큰을 모두 제거합니다.
+    """
+    token_user_cache.invalidate_user(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication 과 동일하게 동작하되 검증 결과를 캐시합니다.
+
+    다른 워커 프로세스의 무효화는 전달되지 않으므로 캐시 수명은
+    JWT_USER_CACHE['TIMEOUT'] 초를 넘지 않습니다.
+    """
+
+    # 스냅샷에 비밀번호 해시는 보관하지 않습니다 (필요하면 지연 로딩됨).
+    excluded_fields = ("password",)
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        entry = token_user_cache.get(raw_token)
+        if entry is not None:
+            expires_at, user_id, snapshot, validated_token = entry
+            return self.restore_user(snapshot), validated_token
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+
+        now = time.time()
+        expires_at = validated_token.get("exp", now)
+        timeout = _cache_settings().get("TIMEOUT", 300)
+        if timeout is not None:
+            expires_at = min(expires_at, now + timeout)
+        if expires_at > now:
+            token_user_cache.set(
+                raw_token, expires_at, user.pk, self.take_snapshot(user), validated_token
+            )
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if getattr(user, "deleted", False):
+            raise AuthenticationFailed(_("User is deleted"), code="user_deleted")
+        return user
+
+    def take_snapshot(self, user):
+        names = tuple(
+            field.attname
+            for field in user._meta.concrete_fields
+            if field.name not in self.excluded_fields
+        )
+        return user._state.db, names, tuple(getattr(user, name) for name in names)
+
+    def restore_user(self, snapshot):
+        # 요청마다 새 인스턴스를 만들어 요청 간에 상태가 공유되지 않도록 합니다.
+        db, names, values = snapshot
+        return self.user_model.from_db(db, names, values)
@@ -0,0 +1,115 @@
+"""
+프로세스 단위 커넥션 풀을 사용하는 PostgreSQL 백엔드.
+
+    "ENGINE": "blog_project.backends.postgresql",
+    "CONN_MAX_AGE": 0,
+    "OPTIONS": {"pool": {"min_size": 2, "max_size": 20, "timeout": 10}},
+
+Django 는 요청이 끝날 때 CONN_MAX_AGE 가 지난 커넥션을 닫습니다. 이 백엔드에서는
+닫는 대신 풀에 반환하므로, 요청마다 TCP 연결과 인증을 반복하지 않으면서도
+유휴 워커 스레드가 커넥션을 붙잡고 있지 않습니다. pool 옵션이 없으면 기본
+백엔드와 동일하게 동작합니다 (CONN_MAX_AGE 로 영구 연결만 사용).
+"""
+import os
+import threading
+
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+from psycopg2 import pool as psycopg2_pool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(psycopg2_pool.ThreadedConnectionPool):
+    """
+    커넥션이 모두 사용 중이면 PoolError 대신 timeout 초까지 기다립니다.
+    """
+
+    def __init__(self, minconn, maxconn, timeout=10, **kwargs):
+        self.timeout = timeout
+        self._available = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._available.acquire(timeout=self.timeout):
+            raise psycopg2_pool.PoolError(
+                f"no connection available within {self.timeout} seconds"
+            )
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._available.release()
+            raise
+
+    def putconn(self, conn, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._available.release()
+
+
+def get_pool(alias, conn_params, options):
+    # fork 된 워커는 부모의 소켓을 공유하면 안 되므로 pid 별로 풀을 만듭니다.
+    key = (alias, os.getpid())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = BlockingConnectionPool(
+                options.get("min_size", 1),
+                options.get("max_size", 10),
+                timeout=options.get("timeout", 10),
+                **conn_params,
+            )
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        super().__init__(settings_dict, alias)
+        self.pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.pool_options is not None and self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured(
+                "CONN_MAX_AGE must be 0 when a connection pool is configured."
+            )
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        if self.pool_options is None:
+            return super().get_new_connection(conn_params)
+
+        connection = get_pool(self.alias, conn_params, self.pool_options).getconn()
+        # 아래는 기본 백엔드의 get_new_connection 과 같은 초기화입니다.
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+        return connection
+
+    def _close(self):
+        if self.pool_options is None or self.connection is None:
+            return super()._close()
+        # 진행 중인 트랜잭션은 풀이 롤백하고, 끊어진 커넥션은 풀에서 버립니다.
+        pool = get_pool(self.alias, self.get_connection_params(), self.pool_options)
+        with self.wrap_database_errors:
+            pool.putconn(self.connection, close=bool(self.connection.closed))
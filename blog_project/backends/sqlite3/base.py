@@ -0,0 +1,52 @@
+"""
+연결할 때 PRAGMA 를 적용하는 SQLite 백엔드.
+
+    "ENGINE": "blog_project.backends.sqlite3",
+    "OPTIONS": {
+        "pragmas": {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000},
+        "transaction_mode": "IMMEDIATE",
+    }
+
+transaction_mode 를 IMMEDIATE 로 두면 atomic() 블록이 시작할 때 쓰기 잠금을 잡습니다.
+기본(DEFERRED)에서는 읽기 후 쓰기로 잠금을 올리는 시점에 다른 쓰기와 부딪히면
+busy_timeout 을 기다리지 않고 바로 "database is locked" 가 발생합니다.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?[\w.]+$")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        super().__init__(settings_dict, alias)
+        options = self.settings_dict["OPTIONS"]
+        self.pragmas = dict(options.get("pragmas") or {})
+        for name, value in self.pragmas.items():
+            if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ImproperlyConfigured(f"Invalid SQLite pragma: {name}={value!r}")
+        self.transaction_mode = (options.get("transaction_mode") or "DEFERRED").upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}"
+            )
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop("pragmas", None)
+        kwargs.pop("transaction_mode", None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
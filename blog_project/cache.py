@@ -0,0 +1,347 @@
+"""
+2단 캐시 백엔드와 캐시 스탬피드 방지.
+
+- TieredCache: 프로세스 내부 LRU(L1) 앞단 + 워커가 공유하는 L2 캐시(다른 CACHES 별칭).
+  Django 는 caches[...] 를 스레드마다 새로 만들지만 L1 은 프로세스에 하나(_l1_stores)라
+  같은 프로세스의 스레드는 삭제/갱신을 바로 봅니다. 다른 워커의 삭제/갱신은 L1 에
+  전달되지 않으므로 L1 수명은 L1_TIMEOUT 초로 제한합니다.
+- SQLiteCache: 파일 하나를 여러 워커가 공유하는 크기 제한(MAX_ENTRIES) L2 캐시.
+  Redis 를 쓸 수 있으면 L2 별칭만 django_redis 등으로 바꾸면 됩니다.
+- get_or_compute: 만료 직후 여러 요청이 한꺼번에 같은 값을 다시 계산하지 않도록
+  락을 잡은 요청 하나만 계산하고, 나머지는 stale 값을 그대로 쓰거나 잠시 기다립니다.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# L2 에서 읽은 값을 L1 에 보관하는 최대 시간 (초)
+L1_TIMEOUT = 5
+# 다른 요청이 계산 중일 때 기다리는 간격 (초)
+LOCK_POLL_INTERVAL = 0.05
+
+
+class LRUStore:
+    """
+    만료 시각을 함께 저장하는 스레드 안전 LRU.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# TieredCache 의 L1. (L2 별칭, LOCATION, L1_MAX_ENTRIES) 마다 프로세스에 하나입니다.
+_l1_stores = {}
+_l1_stores_lock = threading.Lock()
+
+
+def l1_store(key, max_entries):
+    with _l1_stores_lock:
+        store = _l1_stores.get(key)
+        if store is None:
+            store = _l1_stores[key] = LRUStore(max_entries)
+        return store
+
+
+# 테이블을 이미 만든 SQLiteCache 파일 경로
+_sqlite_schema_ready = set()
+_sqlite_schema_lock = threading.Lock()
+
+
+class SQLiteCache(BaseCache):
+    """
+    LOCATION 의 SQLite 파일을 쓰는 공유 캐시. 커넥션은 스레드별로, fork 이후에는 새로 엽니다.
+
+    MAX_ENTRIES 를 넘으면 만료된 항목, 그다음 만료가 가장 가까운 항목부터
+    1/CULL_FREQUENCY 만큼 지웁니다.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = location
+        self._local = threading.local()
+        # 캐시 객체는 스레드마다 만들어지므로 테이블은 경로마다 한 번만 만듭니다.
+        with _sqlite_schema_lock:
+            if self.path not in _sqlite_schema_ready:
+                self._connection().execute(
+                    "CREATE TABLE IF NOT EXISTS cache_entry "
+                    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID"
+                )
+                _sqlite_schema_ready.add(self.path)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _expires(self, timeout):
+        # get_backend_timeout 은 만료 시각(없으면 None)을 반환합니다.
+        return self.get_backend_timeout(timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        row = self._connection().execute(
+            "SELECT value FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._write("INSERT OR REPLACE", key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._write("INSERT", key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        cursor = self._connection().execute(
+            "UPDATE cache_entry SET expires = ? "
+            "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self._expires(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def _write(self, verb, key, value, timeout, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if verb == "INSERT":
+                # add() 는 만료된 항목을 덮어쓸 수 있어야 합니다.
+                conn.execute(
+                    "DELETE FROM cache_entry WHERE key = ? AND expires <= ?", (key, now)
+                )
+            try:
+                conn.execute(
+                    f"{verb} INTO cache_entry (key, value, expires) VALUES (?, ?, ?)",
+                    (key, data, self._expires(timeout)),
+                )
+                written = True
+            except sqlite3.IntegrityError:
+                written = False
+            self._cull(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return written
+
+    def _cull(self, conn, now):
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entry").fetchone()
+        if count <= self._max_entries:
+            return
+        conn.execute("DELETE FROM cache_entry WHERE expires <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entry").fetchone()
+        if count > self._max_entries:
+            conn.execute(
+                "DELETE FROM cache_entry WHERE key IN (SELECT key FROM cache_entry "
+                "ORDER BY expires IS NULL, expires LIMIT ?)",
+                (max(count // self._cull_frequency, count - self._max_entries),),
+            )
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        cursor = self._connection().execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        return self.get(key, self, version=version) is not self
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entry")
+
+
+class TieredCache(BaseCache):
+    """
+    OPTIONS:
+        L2: 공유 캐시 별칭 (기본 "shared")
+        L1_MAX_ENTRIES: L1 항목 수 (기본 1000)
+        L1_TIMEOUT: L1 보관 시간 상한 (기본 5초)
+
+    KEY_PREFIX/VERSION 은 L2 별칭의 설정을 따르므로 이 캐시의 키는 그대로 넘깁니다.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.l2_alias = options.get("L2", "shared")
+        self.l1_timeout = options.get("L1_TIMEOUT", L1_TIMEOUT)
+        max_entries = options.get("L1_MAX_ENTRIES", 1000)
+        self.l1 = l1_store((self.l2_alias, location, max_entries), max_entries)
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_key(self, key, version):
+        return self.make_key(key, version=version)
+
+    def _remember(self, key, value, timeout, version):
+        if self.l1_timeout <= 0:
+            return
+        expires = time.time() + self.l1_timeout
+        backend_expires = self.get_backend_timeout(timeout)
+        if backend_expires is not None:
+            expires = min(expires, backend_expires)
+        self.l1.set(self._l1_key(key, version), value, expires)
+
+    def get(self, key, default=None, version=None):
+        entry = self.l1.get(self._l1_key(key, version))
+        if entry is not None:
+            return entry[1]
+        missing = object()
+        value = self.l2.get(key, missing, version=version)
+        if value is missing:
+            return default
+        self._remember(key, value, DEFAULT_TIMEOUT, version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._remember(key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # 다른 워커와의 경쟁은 L2 가 판정합니다 (락 용도).
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._remember(key, value, timeout, version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(self._l1_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, self, version=version) is not self
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(self._l1_key(key, version))
+        return self.l2.incr(key, delta, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+
+# 프로세스 안의 스레드 락. 키마다 만들지 않고 해시로 나눠 씁니다.
+_local_locks = [threading.Lock() for _ in range(64)]
+
+
+def _local_lock(key):
+    return _local_locks[hash(key) % len(_local_locks)]
+
+
+def generation(namespace, cache=None):
+    """
+    namespace 의 세대 값. 캐시 키에 넣어 두면 bump_generation 으로 한꺼번에 무효화됩니다.
+    """
+    cache = cache or caches["default"]
+    key = f"{namespace}:generation"
+    value = cache.get(key)
+    if value is None:
+        # 없는 키는 L1 에 남지 않으므로 0 을 저장해 매번 L2 를 읽지 않게 합니다.
+        cache.add(key, 0, None)
+        value = cache.get(key, 0)
+    return value
+
+
+def bump_generation(namespace, cache=None):
+    # 읽고 더하지 않고 시각을 쓰므로 워커 간 경합에도 값이 되돌아가지 않습니다.
+    cache = cache or caches["default"]
+    cache.set(f"{namespace}:generation", time.time_ns(), None)
+
+
+def get_or_compute(key, compute, timeout, stale=None, lock_timeout=30, cache=None):
+    """
+    key 의 값을 반환하고, 없거나 timeout 초가 지났으면 compute() 로 다시 계산합니다.
+
+    계산은 워커 전체에서 한 번만 합니다(cache.add 락, 프로세스 안에서는 스레드 락).
+    timeout 이 지나고 stale 초 안이면 락을 못 잡은 요청은 이전 값을 바로 반환합니다
+    (stale-while-revalidate). 값이 전혀 없으면 계산이 끝나기를 최대 lock_timeout 초 기다립니다.
+    """
+    cache = cache or caches["default"]
+    stale = timeout if stale is None else stale
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        entry = cache.get(key)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        local_lock = _local_lock(key)
+        if local_lock.acquire(blocking=False):
+            try:
+                if cache.add(lock_key, 1, lock_timeout):
+                    try:
+                        return refresh(key, compute, timeout, stale, cache)
+                    finally:
+                        cache.delete(lock_key)
+            finally:
+                local_lock.release()
+        if entry is not None:
+            return entry[0]
+        if time.monotonic() >= deadline:
+            # 락을 잡은 쪽이 응답하지 않으면 직접 계산합니다.
+            return refresh(key, compute, timeout, stale, cache)
+        time.sleep(LOCK_POLL_INTERVAL)
+
+
+def refresh(key, compute, timeout, stale=None, cache=None):
+    """
+    값을 계산해 저장합니다. warm_caches 처럼 만료와 상관없이 미리 채울 때 사용합니다.
+    """
+    cache = cache or caches["default"]
+    stale = timeout if stale is None else stale
+    value = compute()
+    cache.set(key, (value, time.time() + timeout), timeout + stale)
+    return value
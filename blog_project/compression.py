@@ -0,0 +1,264 @@
+"""
+응답 압축 (gzip / brotli / zstd).
+
+- CompressionMiddleware: Accept-Encoding 협상으로 코덱을 고르고, COMPRESSION_MIN_SIZE 이상인
+  텍스트/JSON 응답을 압축합니다. StreamingHttpResponse 는 청크마다 flush 하며 스트림으로
+  압축합니다.
+- 압축 응답의 ETag 에는 코덱 접미사("...-br")를 붙여 표현마다 다른 강한 검증자로 만들고,
+  요청의 If-None-Match / If-Match 에서는 접미사를 떼어 뷰의 검증자와 비교되게 합니다.
+- compress_assets 명령이 정적/미디어 파일 옆에 .br/.zst/.gz 를 미리 만들어 두면
+  media.serve_media 가 런타임 압축 없이 그 파일을 보냅니다.
+
+brotli / zstd 는 각각 brotli, zstandard 패키지가 설치되어 있을 때만 사용합니다.
+"""
+import gzip
+import os
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.oai.openapi",
+    "image/svg+xml",
+)
+
+
+class GzipCodec:
+    name = "gzip"
+    suffix = ".gz"
+    level = 6
+    max_level = 9
+
+    def compress(self, data, level=None):
+        return gzip.compress(data, compresslevel=level or self.level, mtime=0)
+
+    def stream(self):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec:
+    name = "br"
+    suffix = ".br"
+    # 동적 압축은 속도 위주, 미리 압축할 때는 최고 압축률
+    level = 4
+    max_level = 11
+
+    def compress(self, data, level=None):
+        return brotli.compress(data, quality=level or self.level)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush(), compressor.finish)
+
+
+class ZstdCodec:
+    name = "zstd"
+    suffix = ".zst"
+    level = 3
+    max_level = 19
+
+    def compress(self, data, level=None):
+        return zstandard.ZstdCompressor(level=level or self.level).compress(data)
+
+    def stream(self):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return (
+            lambda chunk: compressor.compress(chunk)
+            + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+
+def available_codecs():
+    """
+    COMPRESSION_ENCODINGS 순서(서버 선호도)대로, 설치된 코덱만 반환합니다.
+    """
+    codecs = {"gzip": GzipCodec()}
+    if brotli is not None:
+        codecs["br"] = BrotliCodec()
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec()
+    order = getattr(settings, "COMPRESSION_ENCODINGS", ("br", "zstd", "gzip"))
+    return [codecs[name] for name in order if name in codecs]
+
+
+def parse_accept_encoding(header):
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        match = re.search(r"q\s*=\s*([0-9.]+)", params)
+        if match:
+            try:
+                weight = float(match.group(1))
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def negotiate(header, codecs):
+    """
+    q 값이 가장 높은 코덱, 같으면 서버 선호 순서를 따릅니다. 없으면 None.
+    """
+    weights = parse_accept_encoding(header or "")
+    best, best_weight = None, 0.0
+    for codec in codecs:
+        weight = weights.get(codec.name, weights.get("*", 0.0))
+        if codec.name == "gzip":
+            weight = max(weight, weights.get("x-gzip", 0.0))
+        if weight > best_weight:
+            best, best_weight = codec, weight
+    return best
+
+
+def is_compressible(content_type):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+_ETAG_SUFFIX = re.compile(r'-(gzip|br|zstd)"')
+
+
+def _strip_etag_suffixes(request):
+    encodings = set()
+    for header in ("HTTP_IF_NONE_MATCH", "HTTP_IF_MATCH"):
+        value = request.META.get(header)
+        if value:
+            encodings.update(_ETAG_SUFFIX.findall(value))
+            request.META[header] = _ETAG_SUFFIX.sub('"', value)
+    return encodings
+
+
+def _encoded_etag(etag, name):
+    if not etag or etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{name}"'
+
+
+class CompressionMiddleware:
+    """
+    PerformanceMiddleware 다음, 응답 본문을 만드는 미들웨어보다 앞에 둡니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        etag_encodings = _strip_etag_suffixes(request)
+        response = self.get_response(request)
+        if response.status_code == 304:
+            # 클라이언트가 가진 압축 표현의 검증자를 그대로 돌려줍니다.
+            if len(etag_encodings) == 1 and response.has_header("ETag"):
+                response["ETag"] = _encoded_etag(response["ETag"], etag_encodings.pop())
+            return response
+        return self.compress(request, response)
+
+    def compress(self, request, response):
+        if (
+            response.has_header("Content-Encoding")
+            or response.has_header("Content-Range")
+            or not is_compressible(response.get("Content-Type"))
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"), available_codecs())
+        if codec is None:
+            return response
+
+        if response.streaming:
+            compress_chunk, finish = codec.stream()
+
+            def stream(content):
+                for chunk in content:
+                    data = compress_chunk(chunk)
+                    if data:
+                        yield data
+                yield finish()
+
+            response.streaming_content = stream(response.streaming_content)
+            if response.has_header("Content-Length"):
+                del response["Content-Length"]
+        else:
+            if len(response.content) < getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+                return response
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        if response.has_header("ETag"):
+            response["ETag"] = _encoded_etag(response["ETag"], codec.name)
+        response["Content-Encoding"] = codec.name
+        return response
+
+
+def precompressed_file(request, fullpath, mtime):
+    """
+    원본보다 새로운 .br/.zst/.gz 중 협상한 코덱의 (코덱, 경로). 없으면 None.
+    """
+    fresh = [
+        codec
+        for codec in available_codecs()
+        if os.path.isfile(fullpath + codec.suffix)
+        and os.path.getmtime(fullpath + codec.suffix) >= mtime
+    ]
+    codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"), fresh)
+    if codec is None:
+        return None
+    return codec, fullpath + codec.suffix
+
+
+def precompress_file(path, codecs, min_ratio=0.95):
+    """
+    path 옆에 코덱별 압축 파일을 만듭니다. 원본보다 충분히 작아지지 않으면(이미 압축된
+    PNG 등) 만들지 않고, 이미 최신이면 건너뜁니다. (코덱 이름, 결과) 목록을 반환합니다.
+    """
+    results = []
+    with open(path, "rb") as handle:
+        data = None
+        mtime = os.path.getmtime(path)
+        for codec in codecs:
+            target = path + codec.suffix
+            if os.path.isfile(target) and os.path.getmtime(target) >= mtime:
+                results.append((codec.name, "fresh"))
+                continue
+            if data is None:
+                data = handle.read()
+            compressed = codec.compress(data, codec.max_level)
+            if len(compressed) > len(data) * min_ratio:
+                if os.path.isfile(target):
+                    os.remove(target)
+                results.append((codec.name, "skipped"))
+                continue
+            tmp = target + ".tmp"
+            with open(tmp, "wb") as out:
+                out.write(compressed)
+            os.replace(tmp, target)
+            os.utime(target, (mtime, mtime))
+            results.append((codec.name, len(compressed)))
+    return results
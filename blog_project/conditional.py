@@ -0,0 +1,191 @@
+"""
+HTTP 조건부 요청 (ETag / Last-Modified).
+
+ConditionalRequestMixin 은 updated_at 이 있는 모델의 retrieve/list 응답에 검증자를 붙이고,
+If-None-Match / If-Modified-Since 가 일치하면 본문을 직렬화하지 않고 304 를 반환합니다.
+PUT/PATCH 의 If-Match / If-Unmodified-Since 가 맞지 않으면 412 로 거절합니다.
+
+- 상세: 객체와 serializer 가 읽는 정방향 관계(예: 저자)의 updated_at
+- 목록: 필터가 적용된 QuerySet 의 COUNT 와 MAX(updated_at) 로 만든 ETag 만 (한 번의 집계 쿼리)
+  최신이 아닌 행을 삭제해도 MAX(updated_at) 은 그대로이므로 Last-Modified 는 붙이지 않고
+  If-Modified-Since 도 무시합니다. 관계 객체의 변경이나 다대다 변경은 반영하지 않습니다.
+"""
+import hashlib
+from calendar import timegm
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max, QuerySet, prefetch_related_objects
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .exceptions import PreconditionFailed
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def _timestamp(value):
+    return timegm(value.utctimetuple()) if value is not None else None
+
+
+def _relation_paths(columns, prefix=""):
+    paths = []
+    for name, relation in sorted(columns.relations.items()):
+        paths.append(prefix + name)
+        paths.extend(_relation_paths(relation, f"{prefix}{name}__"))
+    return paths
+
+
+class ConditionalRequestMixin:
+    """
+    retrieve 에 ETag, Last-Modified 를, list 에 ETag 를 붙이고 조건부 요청을 처리합니다.
+    conditional_requests = False 로 뷰마다 끌 수 있습니다.
+    """
+
+    conditional_requests = True
+    modified_field = "updated_at"
+
+    def conditional_enabled(self, model):
+        if not self.conditional_requests:
+            return False
+        try:
+            model._meta.get_field(self.modified_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def _variant(self):
+        # 같은 URL 이라도 렌더러(JSON/Browsable API)에 따라 본문이 다릅니다.
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return getattr(renderer, "media_type", "")
+
+    def _related_paths(self, model):
+        columns_for = getattr(self, "columns_for", None)
+        if columns_for is None:
+            return []
+        return [
+            path
+            for path in _relation_paths(columns_for(model))
+            if self.conditional_enabled(self._related_model(model, path))
+        ]
+
+    @staticmethod
+    def _related_model(model, path):
+        for name in path.split("__"):
+            model = model._meta.get_field(name).related_model
+        return model
+
+    def object_validators(self, instance):
+        stamps = [getattr(instance, self.modified_field)]
+        for path in self._related_paths(type(instance)):
+            related = instance
+            for name in path.split("__"):
+                related = getattr(related, name, None) if related is not None else None
+            stamps.append(getattr(related, self.modified_field, None))
+        etag = make_etag(instance._meta.label, instance.pk, stamps, self._variant())
+        return etag, max((_timestamp(stamp) for stamp in stamps if stamp), default=None)
+
+    def list_validators(self, queryset):
+        """
+        (ETag, None). 삭제는 MAX(updated_at) 에 드러나지 않으므로 Last-Modified 는 없습니다.
+        """
+        result = queryset.order_by().aggregate(
+            count=Count("pk"), modified=Max(self.modified_field)
+        )
+        self._reuse_count(result["count"])
+        etag = make_etag(
+            queryset.model._meta.label, result["count"], result["modified"], self._variant()
+        )
+        return etag, None
+
+    def _reuse_count(self, count):
+        # 페이지네이터가 같은 COUNT 를 다시 실행하지 않도록 집계 결과를 넘겨 줍니다.
+        paginator = self.paginator
+        factory = getattr(paginator, "django_paginator_class", None)
+        if factory is None:
+            return
+
+        def django_paginator(*args, **kwargs):
+            page_paginator = factory(*args, **kwargs)
+            page_paginator.count = count
+            return page_paginator
+
+        paginator.django_paginator_class = django_paginator
+
+    def evaluate_preconditions(self, etag, last_modified):
+        """
+        304 응답을 반환하거나, 전제 조건이 맞지 않으면 PreconditionFailed 를 발생시킵니다.
+        """
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            return None
+        if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+            raise PreconditionFailed()
+        return self.set_validators(response, etag, last_modified)
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "action", None) == "retrieve" and isinstance(queryset, QuerySet):
+            # 304 이면 관계를 읽을 필요가 없으므로 prefetch 는 검증 후에 실행합니다.
+            self._deferred_prefetches = queryset._prefetch_related_lookups
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if self.conditional_enabled(type(instance)):
+            validators = self.object_validators(instance)
+            not_modified = self.evaluate_preconditions(*validators)
+            if not_modified is not None:
+                return not_modified
+        else:
+            validators = None
+        prefetch_related_objects([instance], *getattr(self, "_deferred_prefetches", ()))
+        response = Response(self.get_serializer(instance).data)
+        return self.set_validators(response, *validators) if validators else response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.conditional_enabled(queryset.model):
+            return super().list(request, *args, **kwargs)
+        validators = self.list_validators(queryset)
+        not_modified = self.evaluate_preconditions(*validators)
+        if not_modified is not None:
+            return not_modified
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            response = Response(self.get_serializer(queryset, many=True).data)
+        return self.set_validators(response, *validators)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        enabled = self.conditional_enabled(type(instance))
+        if enabled:
+            # If-Match / If-Unmodified-Since 가 현재 버전과 다르면 412 (갱신 손실 방지)
+            self.evaluate_preconditions(*self.object_validators(instance))
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        if getattr(instance, "_prefetched_objects_cache", None):
+            instance._prefetched_objects_cache = {}
+
+        response = Response(serializer.data)
+        if enabled:
+            response = self.set_validators(response, *self.object_validators(serializer.instance))
+        return response
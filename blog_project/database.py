@@ -0,0 +1,112 @@
+"""
+DATABASE_PROFILE 환경 변수로 고르는 DATABASES 구성.
+
+- sqlite-basic: Django 기본 SQLite 설정 (기본값).
+- sqlite: WAL, synchronous=NORMAL, mmap, 페이지 캐시, busy_timeout, IMMEDIATE 트랜잭션,
+  영구 연결. 여러 워커가 같은 파일에 쓸 때 DATABASE_PROFILE=sqlite 로 켭니다.
+  IMMEDIATE 이면 모든 atomic() 블록이 시작할 때 쓰기 잠금을 잡으므로, 읽기만 하는 atomic()
+  도 다른 쓰기와 직렬화됩니다 (잠금 없는 읽기는 WAL 덕분에 쓰기와 동시에 진행).
+  SQLITE_TRANSACTION_MODE=DEFERRED 로 되돌릴 수 있습니다.
+- postgresql: 영구 연결 또는 (DB_POOL_MAX_SIZE > 0 이면) 프로세스 단위 커넥션 풀.
+
+읽기 복제본과 샤드 구성은 replica_profile()/shard_profile() 로 primary 구성에서 만듭니다.
+
+각 값은 아래 환경 변수로 조정합니다.
+"""
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+PROFILES = ("sqlite", "sqlite-basic", "postgresql")
+
+
+def _int(env, key, default):
+    value = env.get(key)
+    return default if value in (None, "") else int(value)
+
+
+def sqlite_pragmas(env=os.environ):
+    return {
+        "journal_mode": "WAL",
+        # WAL 에서는 NORMAL 이어도 손상되지 않으며, 커밋마다 fsync 하지 않습니다.
+        "synchronous": "NORMAL",
+        "mmap_size": _int(env, "SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+        # 음수는 KiB 단위 (기본 64MiB)
+        "cache_size": _int(env, "SQLITE_CACHE_SIZE", -64 * 1024),
+        "busy_timeout": _int(env, "SQLITE_BUSY_TIMEOUT", 5000),
+        "temp_store": "MEMORY",
+    }
+
+
+def database_profile(profile, name=None, env=os.environ):
+    """
+    profile 에 해당하는 DATABASES["default"] 사전을 반환합니다.
+    name 은 SQLite 파일 경로 또는 PostgreSQL DB 이름입니다.
+    """
+    if profile == "sqlite-basic":
+        return {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": name,
+        }
+    if profile == "sqlite":
+        return {
+            "ENGINE": "blog_project.backends.sqlite3",
+            "NAME": name,
+            "CONN_MAX_AGE": _int(env, "DB_CONN_MAX_AGE", 60),
+            "OPTIONS": {
+                "timeout": _int(env, "SQLITE_BUSY_TIMEOUT", 5000) / 1000,
+                "pragmas": sqlite_pragmas(env),
+                "transaction_mode": env.get("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+            },
+        }
+    if profile == "postgresql":
+        pool_size = _int(env, "DB_POOL_MAX_SIZE", 0)
+        config = {
+            "ENGINE": "blog_project.backends.postgresql",
+            "NAME": env.get("DB_NAME", name or "blog_project"),
+            "USER": env.get("DB_USER", ""),
+            "PASSWORD": env.get("DB_PASSWORD", ""),
+            "HOST": env.get("DB_HOST", "localhost"),
+            "PORT": env.get("DB_PORT", "5432"),
+            "CONN_MAX_AGE": 0 if pool_size else _int(env, "DB_CONN_MAX_AGE", 60),
+            "OPTIONS": {},
+        }
+        if pool_size:
+            config["OPTIONS"]["pool"] = {
+                "min_size": _int(env, "DB_POOL_MIN_SIZE", 1),
+                "max_size": pool_size,
+                "timeout": _int(env, "DB_POOL_TIMEOUT", 10),
+            }
+        return config
+    raise ImproperlyConfigured(
+        f"Unknown DATABASE_PROFILE {profile!r}. Choose one of: {', '.join(PROFILES)}"
+    )
+
+
+def replica_profile(primary, target):
+    """
+    primary 구성을 복사해 읽기 복제본 구성을 만듭니다.
+    target 은 SQLite 파일 경로 또는 PostgreSQL 호스트[:포트] 입니다.
+    테스트에서는 복제본이 primary 테스트 DB 를 그대로 사용합니다 (MIRROR).
+    """
+    config = copy.deepcopy(primary)
+    if config["ENGINE"].endswith("sqlite3"):
+        config["NAME"] = target
+    else:
+        host, _, port = target.partition(":")
+        config["HOST"] = host
+        config["PORT"] = port or config["PORT"]
+    config["TEST"] = {"MIRROR": DEFAULT_DB_ALIAS}
+    return config
+
+
+def shard_profile(primary, target):
+    """
+    primary 구성을 복사해 샤드 구성을 만듭니다.
+    target 은 SQLite 파일 경로 또는 (같은 서버의) PostgreSQL DB 이름입니다.
+    """
+    config = copy.deepcopy(primary)
+    config["NAME"] = target
+    return config
@@ -15,6 +15,11 @@ class CustomAPIException(APIException):
         else:
             self.detail = self.default_detail
 
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified since the given version.'
+    default_code = 'precondition_failed'
+
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
@@ -0,0 +1,310 @@
+"""
+직렬화에 필요한 컬럼만 읽도록 QuerySet 을 다듬습니다.
+
+ColumnPruningMixin 은 목록을 직렬화하는 GET 요청(list, 페이지네이션, many=True 로
+QuerySet 을 넘기는 커스텀 액션)에서 serializer 가 실제로 읽는 컬럼을 계산해 only() 를
+적용하고, 쓰이지 않는 select_related 조인을 제거합니다.
+
+- 모델 필드/점 경로(source="owner.username") 는 해당 컬럼과 관계만 읽습니다.
+- StringRelatedField 처럼 관계 객체 전체를 쓰는 필드와 컬럼을 알 수 없는
+  SerializerMethodField 는 큰 컬럼(TextField, FileField 등)을 제외한 전체를 읽습니다.
+  serializer Meta.method_field_columns = {"필드": ["컬럼", ...]} 로 메서드 필드가 읽는
+  컬럼을 선언하면 그 컬럼만 읽습니다.
+- serializer 가 읽는 정방향 관계는 조인하고, 읽지 않는 관계의 select_related/prefetch_related
+  는 뺍니다.
+
+SparseFieldsetMixin(serializer) 과 SparseFieldsetViewMixin(뷰) 은 GET 요청의
+?fields=id,title,author.name / ?expand=author 로 응답 필드를 고르며, 가지치기도 고른 필드
+기준으로 계산합니다.
+"""
+import threading
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from .sharding import is_sharded
+
+LARGE_FIELDS = (models.TextField, models.FileField, models.BinaryField, models.JSONField)
+
+
+class Columns:
+    """
+    모델 하나에서 읽어야 할 컬럼, 함께 읽어야 할 정방향 관계(relations)와 역방향/다대다
+    관계(prefetched). complete 이면 큰 컬럼을 제외한 모든 컬럼이 필요합니다.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.names = set()
+        self.relations = {}
+        self.prefetched = set()
+        self.complete = False
+
+    def relation(self, name):
+        related = self.model._meta.get_field(name).related_model
+        return self.relations.setdefault(name, Columns(related))
+
+    def resolve(self):
+        names = {self.model._meta.pk.name, *self.names}
+        if self.complete:
+            names.update(
+                field.name
+                for field in self.model._meta.concrete_fields
+                if not isinstance(field, LARGE_FIELDS)
+            )
+        return names
+
+
+def serializer_columns(serializer, model):
+    columns = Columns(model)
+    _collect(serializer, columns)
+    return columns
+
+
+def _collect(serializer, columns):
+    method_columns = getattr(getattr(serializer, "Meta", None), "method_field_columns", {})
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name in method_columns:
+                for path in method_columns[name]:
+                    _add_path(columns, path.split("__"), None)
+            else:
+                columns.complete = True
+        elif field.source == "*":
+            columns.complete = True
+        else:
+            _add_path(columns, field.source.split("."), field)
+
+
+def _add_path(columns, attrs, field):
+    name, rest = attrs[0], attrs[1:]
+    try:
+        model_field = columns.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # 프로퍼티/메서드는 어떤 컬럼을 읽는지 알 수 없습니다.
+        columns.complete = True
+        return
+    if not model_field.concrete or model_field.many_to_many:
+        # 역방향/다대다 관계는 별도 쿼리(prefetch)로 읽으므로 pk 만 있으면 됩니다.
+        columns.prefetched.add(name)
+        return
+    columns.names.add(name)
+    if not model_field.is_relation:
+        return
+    if rest:
+        _add_path(columns.relation(name), rest, field)
+    elif isinstance(field, serializers.BaseSerializer):
+        _collect(field, columns.relation(name))
+    elif not isinstance(field, (serializers.PrimaryKeyRelatedField, serializers.ManyRelatedField)):
+        columns.relation(name).complete = True
+
+
+def _select_related_tree(queryset):
+    tree = queryset.query.select_related
+    return tree if isinstance(tree, dict) else {}
+
+
+def _joinable(model, related):
+    # 샤딩된 모델은 다른 DB 에 있으므로 조인하지 않습니다.
+    return not is_sharded(model) and not is_sharded(related)
+
+
+def _only_paths(columns, tree, prefix=""):
+    paths = [prefix + name for name in sorted(columns.resolve())]
+    joins = []
+    for name, relation in sorted(columns.relations.items()):
+        if name in tree or _joinable(columns.model, relation.model):
+            joins.append(prefix + name)
+            sub_paths, sub_joins = _only_paths(relation, tree.get(name, {}), f"{prefix}{name}__")
+            paths.extend(sub_paths)
+            joins.extend(sub_joins)
+    return paths, joins
+
+
+def _reads(columns, parts):
+    if columns.complete:
+        # 메서드/프로퍼티가 무엇을 읽는지 모르므로 prefetch 를 남겨 둡니다.
+        return True
+    name, rest = parts[0], parts[1:]
+    if name in columns.relations:
+        return not rest or _reads(columns.relations[name], rest)
+    return name in columns.prefetched
+
+
+def _used_prefetches(queryset, columns):
+    lookups = []
+    for lookup in queryset._prefetch_related_lookups:
+        path = lookup.prefetch_through if isinstance(lookup, models.Prefetch) else lookup
+        if _reads(columns, path.split(LOOKUP_SEP)):
+            lookups.append(lookup)
+    return lookups
+
+
+def prune_columns(queryset, columns):
+    """
+    columns 에 필요한 컬럼만 읽도록 only() 를 적용하고, 읽는 정방향 관계만 조인하며
+    읽지 않는 prefetch_related 를 뺍니다.
+    이미 only()/defer()/values() 가 적용된 QuerySet 은 그대로 둡니다.
+    """
+    query = queryset.query
+    if (
+        queryset._iterable_class is not ModelIterable
+        or query.deferred_loading != (frozenset(), True)
+        or query.select_related is True
+        or queryset.model is not columns.model
+    ):
+        return queryset
+    paths, joins = _only_paths(columns, _select_related_tree(queryset))
+    queryset = queryset.select_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    prefetches = _used_prefetches(queryset, columns)
+    if len(prefetches) != len(queryset._prefetch_related_lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+    return queryset.only(*paths)
+
+
+class ColumnPruningMixin:
+    """
+    GET 요청에서 목록 직렬화에 쓰는 QuerySet 에 prune_columns 를 적용합니다.
+    column_pruning = False 로 뷰마다 끌 수 있습니다.
+    """
+
+    column_pruning = True
+    # ?fields= 조합마다 항목이 생기므로 크기를 제한합니다.
+    columns_cache_size = 1024
+    _columns_cache = {}
+    _columns_lock = threading.Lock()
+
+    def pruning_enabled(self):
+        request = getattr(self, "request", None)
+        return self.column_pruning and request is not None and request.method in SAFE_METHODS
+
+    def columns_cache_key(self, serializer_class, model):
+        return (serializer_class, model)
+
+    def columns_for(self, model, serializer=None):
+        """
+        serializer 클래스와 모델별로 계산한 Columns. serializer 인스턴스는 캐시에 없을
+        때만 만듭니다.
+        """
+        serializer_class = type(serializer) if serializer is not None else self.get_serializer_class()
+        key = self.columns_cache_key(serializer_class, model)
+        columns = self._columns_cache.get(key)
+        if columns is None:
+            if serializer is None:
+                serializer = serializer_class(context=self.get_serializer_context())
+            columns = serializer_columns(serializer, model)
+            with self._columns_lock:
+                if len(self._columns_cache) >= self.columns_cache_size:
+                    self._columns_cache.clear()
+                self._columns_cache[key] = columns
+        return columns
+
+    def prune_queryset(self, queryset, serializer=None):
+        if not self.pruning_enabled() or not isinstance(queryset, models.QuerySet):
+            return queryset
+        return prune_columns(queryset, self.columns_for(queryset.model, serializer))
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.prune_queryset(queryset))
+
+    def get_serializer(self, *args, **kwargs):
+        if args and kwargs.get("many") and isinstance(args[0], models.QuerySet):
+            queryset = args[0]
+            serializer = super().get_serializer(*args, **kwargs)
+            # many=True 이면 ListSerializer 이므로 항목 serializer(child) 로 계산합니다.
+            pruned = self.prune_queryset(queryset, serializer.child)
+            if pruned is not queryset:
+                serializer.instance = pruned
+            return serializer
+        return super().get_serializer(*args, **kwargs)
+
+
+def parse_selection(value):
+    """
+    "id,author.name" 또는 ["id", "author.name"] -> {"id": {}, "author": {"name": {}}}.
+    빈 dict 는 해당 필드의 모든 하위 필드를 뜻합니다.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    tree = {}
+    for path in value or ():
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """
+    context 의 fields / expand 로 직렬화할 필드를 고릅니다.
+
+    - fields: 남길 필드. 중첩 serializer 는 점 경로로 하위 필드를 고릅니다. 없는 이름은
+      무시합니다.
+    - expand: Meta.expandable_fields = {"필드": SerializerClass} 에 선언한 필드를 중첩
+      객체로 바꿉니다 (예: 저자 이름 -> 저자 객체).
+    중첩 serializer 에는 부모가 자기 몫의 선택을 넘겨 줍니다.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expand = self._field_selection()
+        for name, serializer_class in getattr(self.Meta, "expandable_fields", {}).items():
+            if name in expand and name in fields:
+                fields[name] = serializer_class(read_only=True)
+        if selected:
+            for name in list(fields):
+                if name not in selected:
+                    del fields[name]
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, SparseFieldsetMixin):
+                nested._selection = (selected.get(name, {}), expand.get(name, {}))
+        return fields
+
+    def _field_selection(self):
+        selection = getattr(self, "_selection", None)
+        if selection is not None:
+            return selection
+        parent = self.parent
+        if parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return parse_selection(self.context.get("fields")), parse_selection(self.context.get("expand"))
+        return {}, {}
+
+
+class SparseFieldsetViewMixin:
+    """
+    GET 요청의 ?fields= / ?expand= 를 serializer context 로 넘기고 컬럼 가지치기 캐시 키에
+    포함합니다. 쓰기 요청은 입력 필드가 줄지 않도록 무시합니다.
+    """
+
+    field_selection_params = ("fields", "expand")
+
+    def field_selection(self):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return {}
+        return {
+            param: request.query_params[param]
+            for param in self.field_selection_params
+            if request.query_params.get(param)
+        }
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(self.field_selection())
+        return context
+
+    def columns_cache_key(self, serializer_class, model):
+        selection = tuple(sorted(self.field_selection().items()))
+        return (*super().columns_cache_key(serializer_class, model), selection)
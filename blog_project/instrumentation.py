@@ -0,0 +1,314 @@
+"""
+요청 단위 성능 계측.
+
+PerformanceMiddleware 가 요청 전체의 실행 시간, DB 시간, 쿼리 수, 중복 쿼리
+지문(N+1 탐지)을 기록하고, InstrumentedViewMixin 이 DRF 뷰의 직렬화/렌더링 시간을
+더합니다. 결과는 프로세스 내부 히스토그램에 누적해 /api/metrics/ 에서 Prometheus 텍스트
+형식으로 제공하고, DEBUG 이거나 스태프 요청이면(또는 SERVER_TIMING_PUBLIC) Server-Timing
+헤더로도 내보냅니다. 익명 클라이언트에게 DB 시간과 쿼리 수를 보여 주지 않기 위해서입니다.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACES = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """
+    파라미터 값과 IN 목록 길이를 제거한 SQL. 같은 지문이 반복되면 N+1 후보입니다.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.view = None
+        self.action = None
+        self.query_budget = None
+        self.db_time = 0.0
+        self.query_count = 0
+        self.view_query_count = None
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.query_count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicate_queries(self):
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+    def budget_for(self, action):
+        budget = self.query_budget
+        if isinstance(budget, dict):
+            return budget.get(action)
+        return budget
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    (view, action) 별 히스토그램을 보관하는 프로세스 내부 레지스트리.
+    """
+
+    metrics = {
+        "http_request_duration_seconds": ("Request wall time", LATENCY_BUCKETS),
+        "http_request_db_duration_seconds": ("Time spent in database queries", LATENCY_BUCKETS),
+        "http_request_queries": ("Database queries per request", QUERY_BUCKETS),
+        "http_request_serializer_duration_seconds": ("Serializer time", LATENCY_BUCKETS),
+        "http_request_render_duration_seconds": ("Response render time", LATENCY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._duplicates = Counter()
+
+    def observe(self, view, action, wall, profile):
+        values = {
+            "http_request_duration_seconds": wall,
+            "http_request_db_duration_seconds": profile.db_time,
+            "http_request_queries": profile.query_count,
+            "http_request_serializer_duration_seconds": profile.serializer_time,
+            "http_request_render_duration_seconds": profile.render_time,
+        }
+        duplicates = sum(count - 1 for count in profile.duplicate_queries.values())
+        with self._lock:
+            for name, value in values.items():
+                key = (name, view, action)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.metrics[name][1])
+                histogram.observe(value)
+            if duplicates:
+                self._duplicates[(view, action)] += duplicates
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._duplicates.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (description, buckets) in self.metrics.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view, action), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    labels = f'view="{view}",action="{action}"'
+                    cumulative = 0
+                    for bound, count in zip(buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            name = "http_request_duplicate_queries_total"
+            lines.append(f"# HELP {name} Repeated query fingerprints (N+1 candidates)")
+            lines.append(f"# TYPE {name} counter")
+            for (view, action), count in sorted(self._duplicates.items()):
+                lines.append(f'{name}{{view="{view}",action="{action}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def get_profile(request):
+    """
+    Django/DRF 요청에서 현재 RequestProfile 을 찾습니다. 미들웨어가 없으면 None.
+    """
+    request = getattr(request, "_request", request)
+    return getattr(request, "_performance", None)
+
+
+class PerformanceMiddleware:
+    """
+    MIDDLEWARE 의 가장 바깥쪽에 두어 요청 전체를 측정합니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = request._performance = RequestProfile()
+        started = time.perf_counter()
+        # 복제본으로 보낸 쿼리도 함께 집계합니다.
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile))
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+
+        view = profile.view or "unresolved"
+        action = profile.action or request.method.lower()
+        if self.server_timing_allowed(request):
+            response["Server-Timing"] = self.server_timing(wall, profile)
+        registry.observe(view, action, wall, profile)
+
+        duplicates = profile.duplicate_queries
+        threshold = getattr(settings, "N_PLUS_ONE_THRESHOLD", 5)
+        repeated = {sql: count for sql, count in duplicates.items() if count >= threshold}
+        if repeated:
+            logger.warning(
+                "Possible N+1 queries in %s.%s: %s",
+                view,
+                action,
+                repeated,
+            )
+        self.check_budget(view, action, profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = get_profile(request)
+        if profile is None:
+            return None
+        view_class = getattr(view_func, "cls", None)
+        if view_class is None:
+            profile.view = getattr(view_func, "__name__", "unknown")
+            return None
+        profile.view = view_class.__name__
+        actions = getattr(view_func, "actions", None) or {}
+        profile.action = actions.get(request.method.lower())
+        profile.query_budget = getattr(view_class, "query_budget", None)
+        return None
+
+    def server_timing_allowed(self, request):
+        # metrics_view 와 같은 기준 (DRF 가 인증한 사용자는 request.user 에도 반영됩니다)
+        if settings.DEBUG or getattr(settings, "SERVER_TIMING_PUBLIC", False):
+            return True
+        user = getattr(request, "user", None)
+        return bool(user and user.is_staff)
+
+    def server_timing(self, wall, profile):
+        entries = [
+            f"total;dur={wall * 1000:.2f}",
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.query_count} queries"',
+        ]
+        if profile.serializer_time:
+            entries.append(f"serializer;dur={profile.serializer_time * 1000:.2f}")
+        if profile.render_time:
+            entries.append(f"render;dur={profile.render_time * 1000:.2f}")
+        return ", ".join(entries)
+
+    def check_budget(self, view, action, profile):
+        if not getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+            return
+        budget = profile.budget_for(action)
+        used = profile.view_query_count
+        if used is None:
+            used = profile.query_count
+        if budget is not None and used > budget:
+            raise QueryBudgetExceeded(
+                f"{view}.{action} executed {used} queries (budget {budget}): "
+                f"{dict(profile.fingerprints)}"
+            )
+
+
+class InstrumentedViewMixin:
+    """
+    DRF 뷰에서 뷰 내부 쿼리 수, 직렬화 시간, 렌더링 시간을 RequestProfile 에 기록합니다.
+
+    뷰 클래스에 query_budget (정수 또는 {action: 정수}) 을 선언하면
+    QUERY_BUDGET_ENFORCE 가 켜진 환경(테스트)에서 초과 시 예외가 발생합니다.
+    """
+
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        profile = get_profile(request)
+        if profile is None:
+            return super().dispatch(request, *args, **kwargs)
+        before = profile.query_count
+        response = super().dispatch(request, *args, **kwargs)
+        profile.view_query_count = profile.query_count - before
+        return response
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        profile = get_profile(self.request)
+        if profile is not None:
+            to_representation = serializer.to_representation
+
+            def timed_to_representation(instance):
+                started = time.perf_counter()
+                try:
+                    return to_representation(instance)
+                finally:
+                    profile.serializer_time += time.perf_counter() - started
+
+            serializer.to_representation = timed_to_representation
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        profile = get_profile(request)
+        if profile is not None and hasattr(response, "add_post_render_callback"):
+            render_started = time.perf_counter()
+
+            def record_render_time(rendered):
+                profile.render_time += time.perf_counter() - render_started
+
+            response.add_post_render_callback(record_render_time)
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus 텍스트 형식의 메트릭. METRICS_TOKEN 이 설정되어 있으면 Bearer 토큰이,
+    아니면 스태프 세션(또는 DEBUG) 이 필요합니다.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        allowed = request.META.get("HTTP_AUTHORIZATION") == f"Bearer {token}"
+    else:
+        user = getattr(request, "user", None)
+        allowed = settings.DEBUG or bool(user and user.is_staff)
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,304 @@
+"""
+요청 스레드를 막지 않는 로깅 구성 요소.
+
+- AsyncRotatingFileHandler: 레코드를 큐에 넣기만 하고, 별도 리스너 스레드가
+  쌓인 레코드를 묶어서 한 번에 파일에 씁니다. 리스너는 프로세스(pid)마다 첫 로그에서
+  시작하므로 설정 후 fork 하는 서버(gunicorn --preload 등)의 워커도 로그를 씁니다.
+- JSONFormatter: view, action, status, latency 등 구조화된 필드를 JSON 한 줄로 출력합니다.
+- SamplingFilter: 호출이 많은 엔드포인트의 성공 로그를 N 건 중 1 건만 남깁니다.
+- AccessLogMixin: 뷰셋 액션마다 접근 로그를 한 건씩 남깁니다.
+"""
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from .instrumentation import get_profile
+
+access_logger = logging.getLogger("blog_project.access")
+
+# JSONFormatter 가 레코드에서 꺼내 출력하는 구조화 필드
+STRUCTURED_FIELDS = (
+    "view",
+    "action",
+    "method",
+    "path",
+    "status",
+    "latency_ms",
+    "query_count",
+    "user_id",
+)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in STRUCTURED_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    rates: {"<View>.<action>": N} 형태. 해당 엔드포인트의 성공 로그를 N 건 중 1 건만 통과시킵니다.
+    오류 응답(status >= 400)과 WARNING 이상 레코드는 항상 통과합니다.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counters = {key: itertools.count() for key in self.rates}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or getattr(record, "status", 0) >= 400:
+            return True
+        key = f"{getattr(record, 'view', '')}.{getattr(record, 'action', '')}"
+        rate = self.rates.get(key)
+        if not rate or rate <= 1:
+            return True
+        return next(self._counters[key]) % rate == 0
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """
+    여러 레코드를 한 번의 write/flush 로 기록하는 RotatingFileHandler.
+    """
+
+    def emit_batch(self, records):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+
+        data = "".join(lines)
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0:
+                self.stream.seek(0, 2)
+                position = self.stream.tell()
+                if position and position + len(data) >= self.maxBytes:
+                    self.doRollover()
+            self.stream.write(data)
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+class BatchQueueListener(QueueListener):
+    """
+    큐에 쌓인 레코드를 최대 batch_size 개씩 꺼내 핸들러에 전달하는 리스너.
+    extra_records 는 배치마다 호출되어 앞에 붙일 레코드 목록을 반환합니다.
+    """
+
+    def __init__(
+        self, queue, *handlers, batch_size=256, respect_handler_level=True, extra_records=None
+    ):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+        self.extra_records = extra_records
+
+    def handle_batch(self, records):
+        for handler in self.handlers:
+            accepted = [
+                record
+                for record in records
+                if (not self.respect_handler_level or record.levelno >= handler.level)
+                and handler.filter(record)
+            ]
+            if not accepted:
+                continue
+            if hasattr(handler, "emit_batch"):
+                handler.emit_batch(accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        while True:
+            batch = [self.dequeue(True)]
+            while batch[-1] is not self._sentinel and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._sentinel
+            records = batch[:-1] if stop else batch
+            if self.extra_records is not None:
+                records = self.extra_records() + records
+            if records:
+                self.handle_batch(records)
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                break
+
+
+class AsyncRotatingFileHandler(QueueHandler):
+    """
+    RotatingFileHandler 를 리스너 스레드로 옮긴 핸들러.
+
+    요청 스레드에서는 메시지 인자 병합과 큐 삽입만 수행하고, 포맷팅과 파일 쓰기는
+    리스너 스레드가 배치 단위로 처리합니다. 큐가 가득 차면 레코드를 버리고
+    dropped 카운터만 증가시켜 요청이 로깅 때문에 대기하지 않도록 하며, 버린 건수는
+    다음 배치에 WARNING 레코드로 함께 기록합니다.
+
+    큐와 리스너는 현재 pid 에서 처음 enqueue 할 때 만듭니다. fork 된 자식은 부모의
+    리스너 스레드를 물려받지 못하므로 자기 큐와 리스너를 새로 시작합니다.
+    """
+
+    def __init__(
+        self,
+        filename,
+        maxBytes=0,
+        backupCount=0,
+        encoding=None,
+        queue_size=10000,
+        batch_size=256,
+    ):
+        self.target = BatchRotatingFileHandler(
+            filename,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            encoding=encoding,
+            delay=True,
+        )
+        super().__init__(None)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.reported = 0
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def start_listener(self):
+        """
+        현재 프로세스의 큐와 리스너를 준비합니다. 이미 시작했으면 아무것도 하지 않습니다.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # fork 이전 리스너는 부모 프로세스의 것이므로 멈추지 않고 버립니다.
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = BatchQueueListener(
+                self.queue,
+                self.target,
+                batch_size=self.batch_size,
+                extra_records=self.dropped_records,
+            )
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def dropped_records(self):
+        dropped = self.dropped - self.reported
+        if dropped <= 0:
+            return []
+        self.reported += dropped
+        record = logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "Dropped %d log records: queue full (queue_size=%d)",
+            (dropped, self.queue_size),
+            None,
+        )
+        return [self.prepare(record)]
+
+    def setFormatter(self, fmt):
+        # 포맷팅은 리스너 스레드에서 수행합니다.
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self.start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+        self.listener = None
+        self._pid = None
+        self.target.close()
+        super().close()
+
+
+class AccessLogMixin:
+    """
+    뷰셋의 모든 액션에 대해 구조화된 접근 로그를 한 건씩 남깁니다.
+
+    로거가 비활성화되어 있으면 측정도 하지 않습니다. 메시지는 %-인자로 전달되어
+    필터(샘플링)를 통과한 레코드만 문자열로 만들어집니다. 쿼리 수는 PerformanceMiddleware
+    의 RequestProfile(모든 DB 별칭)에서 읽으며, 미들웨어가 없으면 남기지 않습니다.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not access_logger.isEnabledFor(logging.INFO):
+            return super().dispatch(request, *args, **kwargs)
+
+        profile = get_profile(request)
+        queries_before = profile.query_count if profile is not None else None
+        started = time.perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        # 인증 중 예외가 난 경우 다시 인증을 시도하지 않도록 이미 확인된 사용자만 사용합니다.
+        user = getattr(getattr(self, "request", request), "_user", None)
+        access_logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "view": self.__class__.__name__,
+                "action": getattr(self, "action", None),
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "latency_ms": round(latency_ms, 3),
+                "query_count": (
+                    profile.query_count - queries_before if profile is not None else None
+                ),
+                "user_id": getattr(user, "pk", None),
+            },
+        )
+        return response
@@ -0,0 +1,348 @@
+"""
+미디어 파일 전송.
+
+serve_media 는 django.views.static.serve 대신 MEDIA_URL 을 처리합니다.
+
+- 내용 해시가 들어간 이름(cover.3f2a9c0d1b4e5f60.png)은 바뀌지 않으므로 1년
+  `Cache-Control: immutable`, 그 밖의 파일은 MEDIA_CACHE_MAX_AGE 초와 ETag/Last-Modified.
+- Range 요청(단일 구간) -> 206, 범위를 벗어나면 416.
+- 파일은 블록 단위로 스트리밍하며, WSGI 서버가 wsgi.file_wrapper 를 제공하면
+  (gunicorn 등) 서버가 os.sendfile 로 보냅니다.
+- MEDIA_DELIVERY 로 전송 방식을 고릅니다.
+  - "django" (기본): 위와 같이 직접 전송
+  - "x-accel": nginx 의 internal location(MEDIA_ACCEL_PREFIX)으로 X-Accel-Redirect
+  - "sendfile": Apache/lighttpd 의 X-Sendfile
+- 프록시 없이 ASGI 로 띄울 때는 MediaASGIHandler 가 Django 를 거치지 않고 보냅니다.
+- MEDIA_PUBLIC_DIRS 아래 파일만 공개합니다. 책 첨부파일(attachments/) 등 나머지는
+  권한을 확인하는 API(BookViewSet.download_attachment)로만 받을 수 있습니다.
+"""
+import asyncio
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+from .compression import is_compressible, precompressed_file
+
+# 파일 이름에 들어가는 내용 해시 (16자리 16진수)
+HASHED_NAME = re.compile(r"\.[0-9a-f]{16}\.[^./]+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def hashed_name(name, content):
+    """
+    "img/covers/7.png" + 내용 -> "img/covers/7.<sha256 앞 16자리>.png"
+    """
+    root, ext = posixpath.splitext(name)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:16]}{ext}"
+
+
+def is_hashed(name):
+    return bool(name and HASHED_NAME.search(name))
+
+
+def resolve(root, path):
+    path = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = safe_join(root, path)
+    except ValueError:
+        raise Http404("Invalid path")
+    if not os.path.isfile(fullpath):
+        raise Http404("File does not exist")
+    return path, fullpath
+
+
+def is_public(path):
+    """
+    정규화된 미디어 경로가 MEDIA_PUBLIC_DIRS 중 하나 아래에 있는지.
+    """
+    return any(path.startswith(folder) for folder in getattr(settings, "MEDIA_PUBLIC_DIRS", ()))
+
+
+def file_etag(stat):
+    return quote_etag(f"{int(stat.st_mtime):x}-{stat.st_size:x}")
+
+
+def media_headers(path, stat):
+    """
+    Content-Type 을 제외한 캐시/검증자 헤더.
+    """
+    if is_hashed(path):
+        cache_control = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+    return {
+        "Cache-Control": cache_control,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "ETag": file_etag(stat),
+        "Accept-Ranges": "bytes",
+    }
+
+
+def content_type_for(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding or not content_type:
+        return "application/octet-stream"
+    return content_type
+
+
+def parse_range(header, size, etag=None, last_modified=None, if_range=None):
+    """
+    "bytes=start-end" 하나만 지원합니다. 전체를 보내야 하면 None, 만족할 수 없으면
+    RangeNotSatisfiable. 여러 구간 요청은 전체 응답으로 대신합니다(RFC 7233 허용).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    if if_range and if_range != etag and if_range != last_modified:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # 마지막 N 바이트
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class RangeFile:
+    """
+    파일의 [start, start + length) 만 읽는 file-like. fileno() 를 노출하므로
+    wsgi.file_wrapper 가 sendfile 할 때도 현재 위치와 Content-Length 만큼만 보냅니다.
+    """
+
+    def __init__(self, path, start, length):
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def serve_media(request, path, document_root=None):
+    path, fullpath = resolve(document_root or settings.MEDIA_ROOT, path)
+    if not is_public(path):
+        raise Http404("File does not exist")
+    stat = os.stat(fullpath)
+    headers = media_headers(path, stat)
+    content_type = content_type_for(fullpath)
+
+    not_modified = get_conditional_response(
+        request, etag=headers["ETag"], last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None:
+        return _with_headers(not_modified, headers)
+
+    delivery = getattr(settings, "MEDIA_DELIVERY", "django")
+    if delivery == "x-accel":
+        # Range, sendfile, gzip_static 은 nginx 가 처리합니다.
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + path
+        return _with_headers(response, headers)
+    if delivery == "sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = fullpath
+        return _with_headers(response, headers)
+
+    try:
+        byte_range = parse_range(
+            request.META.get("HTTP_RANGE"),
+            stat.st_size,
+            headers["ETag"],
+            headers["Last-Modified"],
+            request.META.get("HTTP_IF_RANGE"),
+        )
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return _with_headers(response, headers)
+
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(RangeFile(fullpath, start, length), content_type=content_type)
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(length)
+        return _with_headers(response, headers)
+
+    encoded = precompressed_file(request, fullpath, stat.st_mtime)
+    if encoded is not None:
+        codec, encoded_path = encoded
+        response = FileResponse(open(encoded_path, "rb"), content_type=content_type)
+        response["Content-Encoding"] = codec.name
+    else:
+        response = FileResponse(open(fullpath, "rb"), content_type=content_type)
+    if is_compressible(content_type):
+        patch_vary_headers(response, ("Accept-Encoding",))
+    return _with_headers(response, headers)
+
+
+def _with_headers(response, headers):
+    for name, value in headers.items():
+        response[name] = value
+    # FileResponse 가 붙이는 Content-Disposition 은 미디어에 필요 없습니다.
+    if response.has_header("Content-Disposition"):
+        del response["Content-Disposition"]
+    return response
+
+
+class MediaASGIHandler:
+    """
+    ASGI 애플리케이션 앞에서 MEDIA_URL 의 GET/HEAD 를 직접 처리합니다
+    (MEDIA_DELIVERY 가 "django" 일 때만, 프록시가 없을 때 사용).
+
+    서버가 http.response.zerocopysend 확장을 지원하면 파일 디스크립터를 넘겨 서버가
+    os.sendfile 로 보내고, 아니면 스레드에서 블록 단위로 읽어 보냅니다. 경로 확인, stat,
+    open 도 느린 저장소에서 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    """
+
+    def __init__(self, application, prefix=None, root=None):
+        self.application = application
+        self.prefix = prefix or settings.MEDIA_URL
+        self.root = root or settings.MEDIA_ROOT
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefix)
+            or getattr(settings, "MEDIA_DELIVERY", "django") != "django"
+        ):
+            return await self.application(scope, receive, send)
+        request_headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", ())
+        }
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(None, self.lookup, scope["path"][len(self.prefix):])
+        if found is None:
+            return await self.application(scope, receive, send)
+        fullpath, stat, headers = found
+
+        if self.not_modified(request_headers, headers, stat):
+            return await self.start(send, 304, headers, body=b"")
+        try:
+            byte_range = parse_range(
+                request_headers.get("range"),
+                stat.st_size,
+                headers["ETag"],
+                headers["Last-Modified"],
+                request_headers.get("if-range"),
+            )
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{stat.st_size}"
+            return await self.start(send, 416, headers, body=b"")
+
+        status, start, length = 200, 0, stat.st_size
+        if byte_range is not None:
+            status, start = 206, byte_range[0]
+            length = byte_range[1] - start + 1
+            headers["Content-Range"] = f"bytes {start}-{byte_range[1]}/{stat.st_size}"
+        headers["Content-Length"] = str(length)
+        if scope["method"] == "HEAD":
+            return await self.start(send, status, headers, body=b"")
+
+        handle = await loop.run_in_executor(None, open, fullpath, "rb")
+        await self.start(send, status, headers)
+        with handle:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": handle,
+                        "offset": start,
+                        "count": length,
+                    }
+                )
+                return
+            await loop.run_in_executor(None, handle.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await loop.run_in_executor(None, handle.read, min(BLOCK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": remaining > 0}
+                )
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+
+    def lookup(self, relative):
+        """
+        (전체 경로, stat, 응답 헤더). 없는 파일이나 공개 폴더 밖이면 None 이고 Django 가
+        처리합니다 (serve_media 는 404). 파일 시스템에 접근하므로 스레드에서 호출합니다.
+        """
+        try:
+            path, fullpath = resolve(self.root, relative)
+        except Http404:
+            return None
+        if not is_public(path):
+            return None
+        stat = os.stat(fullpath)
+        headers = media_headers(path, stat)
+        headers["Content-Type"] = content_type_for(fullpath)
+        return fullpath, stat, headers
+
+    @staticmethod
+    def not_modified(request_headers, headers, stat):
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in etags or headers["ETag"] in etags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(stat.st_mtime) <= since
+        return False
+
+    @staticmethod
+    async def start(send, status, headers, body=None):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+                    for name, value in headers.items()
+                ],
+            }
+        )
+        if body is not None:
+            await send({"type": "http.response.body", "body": body})
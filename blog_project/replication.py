@@ -0,0 +1,75 @@
+"""
+로컬 개발/테스트용 복제 대역.
+
+SQLite 온라인 백업 API 로 primary DB 를 READ_REPLICAS 의 각 SQLite 파일에 주기적으로
+복사합니다. 복사 직전에 primary 의 replication_heartbeat 테이블에 현재 시각을
+기록하므로, 복제본에서 이 값을 읽으면 "그 시각까지의 커밋이 반영됨" 을 알 수
+있습니다 (blog_project.routers 의 지연 판단에 사용).
+
+    DATABASE_REPLICAS=replica.sqlite3 python -m blog_project.replication --interval 1
+
+운영 환경에서는 PostgreSQL 스트리밍 복제 등 실제 복제를 사용합니다.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog_project.routers import HEARTBEAT_TABLE
+
+
+def replicate(replicas, source=DEFAULT_DB_ALIAS):
+    """
+    source 의 현재 상태를 replicas(별칭 목록) 에 복사하고 기록한 복제 시각을 반환합니다.
+    """
+    primary = connections[source]
+    now = time.time()
+    with primary.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {HEARTBEAT_TABLE} "
+            "(id INTEGER PRIMARY KEY CHECK (id = 1), replicated_at REAL NOT NULL)"
+        )
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {HEARTBEAT_TABLE} (id, replicated_at) VALUES (1, %s)",
+            [now],
+        )
+    for alias in replicas:
+        settings_dict = connections[alias].settings_dict
+        target = sqlite3.connect(
+            settings_dict["NAME"], timeout=settings_dict["OPTIONS"].get("timeout", 5)
+        )
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+    return now
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interval", type=float, default=1.0, help="복제 주기(초)")
+    parser.add_argument("--once", action="store_true", help="한 번만 복제하고 종료")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    if not settings.READ_REPLICAS:
+        parser.error("DATABASE_REPLICAS 에 복제본 파일을 지정하세요.")
+    while True:
+        started = time.perf_counter()
+        replicate(settings.READ_REPLICAS)
+        elapsed = time.perf_counter() - started
+        print(f"replicated to {', '.join(settings.READ_REPLICAS)} in {elapsed * 1000:.0f}ms")
+        if args.once:
+            break
+        time.sleep(max(args.interval - elapsed, 0))
+
+
+if __name__ == "__main__":
+    main()
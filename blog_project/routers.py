@@ -0,0 +1,206 @@
+"""
+읽기 복제본 라우팅.
+
+ReplicaRoutingMiddleware 가 요청마다 라우팅 상태를 contextvar 에 두고,
+PrimaryReplicaRouter 가 그 상태를 보고 읽기 쿼리를 보낼 DB 를 고릅니다.
+
+- 요청 밖(관리 명령, 셸, 배치)의 쿼리와 안전하지 않은 메서드 요청은 모두 primary.
+- 안전한 메서드(GET/HEAD/OPTIONS) 요청은 요청마다 한 번 고른 복제본에서 읽습니다.
+- 쓰기 요청이 성공하면 쓰기 시각을 서명된 쿠키와 (Authorization 헤더 기준) 캐시에
+  남깁니다. REPLICA_STICKY_SECONDS 동안은 그 시각 이후까지 복제된 복제본에서만
+  읽고, 없으면 primary 에서 읽어 자신이 쓴 내용을 바로 볼 수 있게 합니다.
+- 복제 시각이 REPLICA_MAX_LAG 초보다 오래되었거나 확인할 수 없는 복제본은 건너뜁니다.
+
+복제본은 settings.READ_REPLICAS 에 별칭 목록으로 지정합니다. 별칭을 추가하는
+것만으로 읽기 용량을 늘릴 수 있습니다.
+"""
+import contextvars
+import hashlib
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_written_at"
+HEARTBEAT_TABLE = "replication_heartbeat"
+
+_state = contextvars.ContextVar("db_routing", default=None)
+
+
+def replicated_at(connection):
+    """
+    복제본에 반영된 primary 의 마지막 시각(UNIX 초). 확인할 수 없으면 None.
+    """
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # 수신한 WAL 을 모두 재생했으면 지연이 없는 것으로 봅니다.
+                cursor.execute(
+                    "SELECT EXTRACT(EPOCH FROM CASE "
+                    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN now() "
+                    "ELSE pg_last_xact_replay_timestamp() END)"
+                )
+            else:
+                cursor.execute(f"SELECT replicated_at FROM {HEARTBEAT_TABLE}")
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return float(row[0]) if row and row[0] is not None else None
+
+
+class ReplicaMonitor:
+    """
+    복제본별 복제 시각을 REPLICA_LAG_CHECK_INTERVAL 초 동안 프로세스 안에 캐시합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = {}
+
+    def replicated_at(self, alias, now):
+        interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 1.0)
+        with self._lock:
+            entry = self._checked.get(alias)
+        if entry is not None and now - entry[0] < interval:
+            return entry[1]
+        value = replicated_at(connections[alias])
+        with self._lock:
+            self._checked[alias] = (now, value)
+        return value
+
+    def reset(self):
+        with self._lock:
+            self._checked.clear()
+
+
+monitor = ReplicaMonitor()
+
+
+def choose_replica(written_at=None, now=None):
+    """
+    읽기에 쓸 복제본 별칭. 쓸 수 있는 복제본이 없으면 None (primary 사용).
+    """
+    now = time.time() if now is None else now
+    max_lag = getattr(settings, "REPLICA_MAX_LAG", 30)
+    candidates = []
+    for alias in getattr(settings, "READ_REPLICAS", ()):
+        replicated = monitor.replicated_at(alias, now)
+        if replicated is None or now - replicated > max_lag:
+            continue
+        if written_at is not None and replicated < written_at:
+            continue
+        candidates.append(alias)
+    return random.choice(candidates) if candidates else None
+
+
+class RoutingState:
+    def __init__(self, use_replicas, written_at=None):
+        self.use_replicas = use_replicas
+        self.written_at = written_at
+        self._alias = None
+
+    def read_alias(self):
+        if not self.use_replicas:
+            return DEFAULT_DB_ALIAS
+        # 한 요청 안의 읽기는 모두 같은 복제본을 사용합니다.
+        if self._alias is None:
+            self._alias = choose_replica(self.written_at) or DEFAULT_DB_ALIAS
+        return self._alias
+
+
+class PrimaryReplicaRouter:
+    """
+    쓰기는 항상 primary, 읽기는 현재 요청의 RoutingState 에 따릅니다.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *getattr(settings, "READ_REPLICAS", ())}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본의 스키마는 복제로만 바뀝니다.
+        return db not in getattr(settings, "READ_REPLICAS", ())
+
+
+def _token_key(request):
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+    if not authorization:
+        return None
+    return "db-written:" + hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    PerformanceMiddleware 바로 다음에 두어 요청 전체의 쿼리에 라우팅 상태를 적용합니다.
+    READ_REPLICAS 가 비어 있으면 아무것도 하지 않습니다.
+
+    토큰 기준 기록은 기본 캐시에 저장하므로, 워커가 여러 개면 공유 캐시를 써야
+    다른 워커에서도 유지됩니다. 쿠키 기준 기록은 워커와 무관하게 동작합니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "READ_REPLICAS", ()):
+            return self.get_response(request)
+        safe = request.method in SAFE_METHODS
+        state = RoutingState(safe, self.written_at(request) if safe else None)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if not safe and response.status_code < 400:
+            self.mark_written(request, response, time.time())
+        return response
+
+    def written_at(self, request):
+        sticky = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        stamps = []
+        cookie = request.get_signed_cookie(STICKY_COOKIE, default=None, max_age=sticky)
+        if cookie is not None:
+            stamps.append(float(cookie))
+        key = _token_key(request)
+        if key is not None:
+            value = cache.get(key)
+            if value is not None:
+                stamps.append(value)
+        return max(stamps) if stamps else None
+
+    def mark_written(self, request, response, now):
+        sticky = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        response.set_signed_cookie(
+            STICKY_COOKIE,
+            repr(now),
+            max_age=sticky,
+            httponly=True,
+            samesite="Lax",
+        )
+        key = _token_key(request)
+        if key is not None:
+            cache.set(key, now, sticky)
+
+
+def _reset_monitor(*, setting, **kwargs):
+    if setting in ("READ_REPLICAS", "REPLICA_LAG_CHECK_INTERVAL", "DATABASES"):
+        monitor.reset()
+
+
+setting_changed.connect(_reset_monitor)
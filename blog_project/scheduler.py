@@ -0,0 +1,110 @@
+"""
+브로커 없이 프로세스 안에서 도는 작은 스케줄러.
+
+예정 시각(epoch 초)과 작업 이름을 힙에 넣어 두고, 가장 이른 시각까지 기다렸다가 그때까지
+도래한 항목을 모두 꺼내 작업별로 한 번씩 실행합니다. 같은 작업의 경계가 여러 개 한꺼번에
+도래해도 작업은 한 번(도래한 시각 목록을 인자로)만 실행되므로 처리를 배치로 묶을 수 있습니다.
+다른 스레드가 더 이른 시각을 schedule() 하면 기다리던 스레드가 바로 깨어납니다.
+
+    scheduler = Scheduler()
+    scheduler.register("experiments", lambda due: apply_due_transitions())
+    scheduler.schedule(time.time() + 60, "experiments")
+    scheduler.start()  # 또는 scheduler.run_forever()
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# 예정된 항목이 없을 때도 깨어나는 최대 간격 (초)
+MAX_WAIT = 60
+
+
+class Scheduler:
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._heap = []
+        self._pending = set()
+        self._jobs = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def register(self, name, func):
+        """
+        func(due_times) 를 작업 name 으로 등록합니다.
+        """
+        self._jobs[name] = func
+
+    def schedule(self, when, name):
+        """
+        when(epoch 초)에 작업 name 을 실행하도록 예약합니다. 같은 (시각, 작업) 은 한 번만 들어갑니다.
+        """
+        with self._condition:
+            if (when, name) in self._pending:
+                return
+            self._pending.add((when, name))
+            heapq.heappush(self._heap, (when, next(self._counter), name))
+            if self._heap[0][0] == when:
+                self._condition.notify()
+
+    def next_due(self):
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def run_pending(self, now=None):
+        """
+        now 까지 도래한 항목을 꺼내 작업별로 한 번씩 실행하고 {작업: [시각, ...]} 을 반환합니다.
+        """
+        now = self.clock() if now is None else now
+        due = {}
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                when, _, name = heapq.heappop(self._heap)
+                self._pending.discard((when, name))
+                due.setdefault(name, []).append(when)
+        for name, times in due.items():
+            try:
+                self._jobs[name](times)
+            except Exception:
+                logger.exception("scheduled job %s failed", name)
+        return due
+
+    def run_forever(self, max_wait=MAX_WAIT):
+        while not self._stopped:
+            close_old_connections()
+            self.run_pending()
+            close_old_connections()
+            with self._condition:
+                if self._stopped:
+                    break
+                due = self._heap[0][0] if self._heap else None
+                timeout = max_wait if due is None else min(max_wait, max(0.0, due - self.clock()))
+                self._condition.wait(timeout)
+
+    def start(self, max_wait=MAX_WAIT):
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self.run_forever, args=(max_wait,), name="scheduler", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
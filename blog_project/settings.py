@@ -15,6 +15,8 @@ from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
+from blog_project.database import database_profile, replica_profile, shard_profile
+
 # .env 파일 로드
 load_dotenv()
 
@@ -58,8 +60,12 @@ INSTALLED_APPS = [
     "lab",
     "people",
     "user",
+    "outbox",
 ]
 MIDDLEWARE = [
+    "blog_project.instrumentation.PerformanceMiddleware",
+    "blog_project.routers.ReplicaRoutingMiddleware",
+    "blog_project.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -93,13 +99,55 @@ WSGI_APPLICATION = "blog_project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# DATABASE_PROFILE: sqlite-basic (Django 기본 SQLite, 기본값), sqlite (WAL/pragma 튜닝,
+# IMMEDIATE 트랜잭션과 영구 연결 - 읽기만 하는 atomic() 도 쓰기 잠금을 잡음), postgresql
+# 세부 값은 blog_project/database.py 의 환경 변수로 조정합니다.
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "sqlite-basic")
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_profile(
+        DATABASE_PROFILE, os.getenv("DB_NAME", str(BASE_DIR / "db.sqlite3"))
+    )
 }
 
+# 읽기 복제본 (쉼표 구분: SQLite 파일 경로 또는 PostgreSQL 호스트[:포트])
+# 안전한 메서드 요청의 읽기는 복제본으로, 쓰기와 쓰기 직후의 읽기는 primary 로 보냅니다.
+# 로컬에서는 python -m blog_project.replication 으로 SQLite 복제본을 갱신합니다.
+DATABASE_REPLICAS = [
+    target.strip() for target in os.getenv("DATABASE_REPLICAS", "").split(",") if target.strip()
+]
+READ_REPLICAS = []
+for index, target in enumerate(DATABASE_REPLICAS):
+    DATABASES[f"replica_{index}"] = replica_profile(DATABASES["default"], target)
+    READ_REPLICAS.append(f"replica_{index}")
+# 쓰기 후 이 시간(초) 동안은 그 쓰기까지 복제된 복제본이나 primary 에서만 읽습니다.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+# 복제 시각이 이보다(초) 오래된 복제본은 사용하지 않습니다.
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "30"))
+# 복제본별 복제 시각을 다시 확인하는 주기(초)
+REPLICA_LAG_CHECK_INTERVAL = 1.0
+
+# 사용자 단위 샤드 (쉼표 구분: SQLite 파일 경로 또는 PostgreSQL DB 이름)
+# ReadingHistory, BookRecommendation 을 user id 로 나누어 저장합니다 (blog_project/sharding.py).
+# 샤드를 추가/제거한 뒤에는 python manage.py rebalance_shards 로 데이터를 옮깁니다.
+DATABASE_SHARDS = [
+    target.strip() for target in os.getenv("DATABASE_SHARDS", "").split(",") if target.strip()
+]
+SHARDS = []
+for index, target in enumerate(DATABASE_SHARDS):
+    DATABASES[f"shard_{index}"] = shard_profile(DATABASES["default"], target)
+    SHARDS.append(f"shard_{index}")
+# 사용자 id 를 나누는 버킷 수 (데이터가 생긴 뒤에는 바꾸지 않습니다)
+SHARD_BUCKETS = 1024
+# 버킷 -> 샤드 배치를 프로세스에 캐시하는 시간(초)
+SHARD_MAP_TTL = int(os.getenv("SHARD_MAP_TTL", "30"))
+
+DATABASE_ROUTERS = []
+if SHARDS:
+    DATABASE_ROUTERS.append("blog_project.sharding.ShardRouter")
+if READ_REPLICAS:
+    DATABASE_ROUTERS.append("blog_project.routers.PrimaryReplicaRouter")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -134,12 +182,21 @@ USE_L10N = True
 USE_TZ = True
 
 
+# 인증 클래스 별칭. API_AUTHENTICATION 환경 변수로 순서와 사용 여부를 지정합니다.
+# 예) 프로덕션에서 요청마다 PBKDF2 해시를 계산하는 basic 을 빼려면 "jwt,session"
+AUTHENTICATION_CLASS_ALIASES = {
+    "session": "rest_framework.authentication.SessionAuthentication",
+    "basic": "rest_framework.authentication.BasicAuthentication",
+    "jwt": "blog_project.authentication.CachedJWTAuthentication",
+}
+API_AUTHENTICATION = os.getenv("API_AUTHENTICATION", "session,basic,jwt")
+
 REST_FRAMEWORK = {
     # 인증 클래스 설정
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        AUTHENTICATION_CLASS_ALIASES[name.strip()]
+        for name in API_AUTHENTICATION.split(",")
+        if name.strip()
     ],
     # 권한 클래스 설정
     "DEFAULT_PERMISSION_CLASSES": [
@@ -150,9 +207,9 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
     # 쓰로틀링 설정
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.ScopedRateThrottle",
+        "blog_project.throttling.AnonRateThrottle",
+        "blog_project.throttling.UserRateThrottle",
+        "blog_project.throttling.ScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
@@ -186,6 +243,32 @@ REST_FRAMEWORK = {
     ],
 }
 
+# 쓰로틀 저장소 설정 (GCRA, 키당 상태 하나, 워커 간 공유)
+THROTTLE_STORE = {
+    "BACKEND": os.getenv(
+        "THROTTLE_STORE_BACKEND", "blog_project.throttling.SQLiteThrottleStore"
+    ),
+    "OPTIONS": {
+        "path": os.getenv("THROTTLE_STORE_PATH", str(BASE_DIR / "throttle.sqlite3")),
+    },
+}
+
+# 캐시 설정 (blog_project/cache.py)
+# default: 프로세스 내부 LRU(L1, 최대 L1_TIMEOUT 초) + 워커가 공유하는 L2("shared")
+# Redis 를 쓸 수 있으면 CACHE_L2_BACKEND=django_redis.cache.RedisCache, CACHE_L2_LOCATION=redis://...
+CACHES = {
+    "default": {
+        "BACKEND": "blog_project.cache.TieredCache",
+        "OPTIONS": {"L2": "shared", "L1_MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+    },
+    "shared": {
+        "BACKEND": os.getenv("CACHE_L2_BACKEND", "blog_project.cache.SQLiteCache"),
+        "LOCATION": os.getenv("CACHE_L2_LOCATION", str(BASE_DIR / "cache.sqlite3")),
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
 # 로그인/로그아웃 후 리다이렉트 URL 설정
 LOGIN_REDIRECT_URL = "/api/"
 LOGOUT_REDIRECT_URL = "/api/"
@@ -214,6 +297,23 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
 }
 
+# 검증된 JWT -> 사용자 스냅샷 캐시 설정
+# 다른 워커의 무효화는 전달되지 않으므로 TIMEOUT(초)으로 최대 지연을 제한합니다.
+JWT_USER_CACHE = {
+    "MAX_ENTRIES": 10000,
+    "TIMEOUT": 300,
+}
+
+# 성능 계측 설정
+# 뷰에 선언된 query_budget 초과 시 예외 발생 (테스트 환경에서 사용)
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "False") == "True"
+# 같은 쿼리 지문이 이 횟수 이상 반복되면 N+1 경고 로그
+N_PLUS_ONE_THRESHOLD = 5
+# /api/metrics/ 접근 토큰 (미설정 시 스태프 세션 필요)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# 모든 응답에 Server-Timing 헤더 (기본은 DEBUG 이거나 스태프 요청에만)
+SERVER_TIMING_PUBLIC = os.getenv("SERVER_TIMING_PUBLIC", "False") == "True"
+
 # CORS 설정
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = [
@@ -267,6 +367,12 @@ SECURE_HSTS_PRELOAD = True
 # SESSION_COOKIE_SECURE = True
 # CSRF_COOKIE_SECURE = True
 
+# 응답 압축 설정 (blog_project/compression.py)
+# 서버 선호 순서, brotli/zstd 는 패키지가 설치된 경우에만 사용
+COMPRESSION_ENCODINGS = ["br", "zstd", "gzip"]
+# 이보다 작은 응답은 압축하지 않음 (바이트)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
 # 파일 업로드 설정
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
@@ -279,6 +385,12 @@ LOG_DIR = BASE_DIR / "logs"
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
+# 호출이 많은 엔드포인트의 접근 로그 샘플링 비율 ("<View>.<action>": N 건 중 1 건 기록)
+ACCESS_LOG_SAMPLING = {
+    "BookViewSet.list": 10,
+    "BookViewSet.retrieve": 10,
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -291,11 +403,18 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "blog_project.log.JSONFormatter",
+        },
     },
     "filters": {
         "require_debug_true": {
             "()": "django.utils.log.RequireDebugTrue",
         },
+        "sample_hot_endpoints": {
+            "()": "blog_project.log.SamplingFilter",
+            "rates": ACCESS_LOG_SAMPLING,
+        },
     },
     "handlers": {
         "console": {
@@ -304,14 +423,24 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
+        # 파일 쓰기는 리스너 스레드에서 배치로 처리 (요청 스레드는 큐 삽입만 수행)
         "file": {
             "level": "INFO",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "blog_project.log.AsyncRotatingFileHandler",
             "filename": os.path.join(LOG_DIR, "django.log"),
             "maxBytes": 1024 * 1024 * 5,  # 5 MB
             "backupCount": 5,
             "formatter": "verbose",
         },
+        "access_file": {
+            "level": "INFO",
+            "class": "blog_project.log.AsyncRotatingFileHandler",
+            "filename": os.path.join(LOG_DIR, "access.log"),
+            "maxBytes": 1024 * 1024 * 5,  # 5 MB
+            "backupCount": 5,
+            "formatter": "json",
+            "filters": ["sample_hot_endpoints"],
+        },
     },
     "loggers": {
         "django": {
@@ -322,12 +451,27 @@ LOGGING = {
             "handlers": ["console", "file"],
             "level": "INFO",
         },
+        "blog_project.access": {
+            "handlers": ["access_file"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
 # 미디어 파일 설정
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# 미디어 전송 방식 (blog_project/media.py)
+# "django": 앱이 직접 전송 (Range 지원, gunicorn/ASGI 에서 sendfile)
+# "x-accel": nginx 의 internal location 으로 X-Accel-Redirect, "sendfile": X-Sendfile
+MEDIA_DELIVERY = os.getenv("MEDIA_DELIVERY", "django")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+# MEDIA_URL 로 누구나 받을 수 있는 폴더 (책 이미지/표지, 프로필 이미지).
+# 그 밖의 파일(attachments/ 등)은 권한을 확인하는 API 로만 전송
+MEDIA_PUBLIC_DIRS = ("img/", "profile_images/")
+# 해시가 없는 미디어의 Cache-Control max-age (초). 해시된 이름은 1년 immutable
+MEDIA_CACHE_MAX_AGE = 3600
 
 # 정적 파일 설정
 STATIC_URL = "/static/"
@@ -353,6 +497,18 @@ ALLOWED_EXTENSIONS = [
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# 실험 상태 자동 전이(lab/lifecycle.py)를 웹 프로세스 안의 스레드로 실행할지 여부.
+# 보통은 python manage.py run_scheduler 를 별도 프로세스로 하나 띄웁니다.
+LIFECYCLE_SCHEDULER_THREAD = os.getenv("LIFECYCLE_SCHEDULER_THREAD", "False") == "True"
+
+# 목록 변경 피드 (outbox/feeds.py, ASGI 의 /api/feeds/<리소스>/): 리소스 이름 -> 목록 뷰셋
+CHANGE_FEEDS = {
+    "books": "book.views.BookViewSet",
+    "experiments": "lab.views.ExperimentViewSet",
+}
+# 피드 델타를 구독자에게 나눠 주는 브로커 (기본: 프로세스 안 메모리)
+CHANGE_FEED_BROKER = "outbox.feeds.InMemoryBroker"
+
 # 로그인/로그아웃 후 리다이렉트 URL 설정
 LOGIN_REDIRECT_URL = "/api/"
 LOGOUT_REDIRECT_URL = "/api/"
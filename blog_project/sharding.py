@@ -0,0 +1,295 @@
+"""
+사용자 단위 샤딩.
+
+shard_key (예: "user_id") 를 선언한 모델은 DATABASE_SHARDS 로 지정한 여러 DB 별칭에
+나누어 저장합니다. 사용자 id 를 SHARD_BUCKETS 개의 버킷으로 나누고(user_id % N),
+버킷 -> 샤드 배치는 default DB 의 shard_bucket 테이블에 둡니다. 배치는 처음 사용할 때
+샤드에 고르게 채워지고, 이후에는 rebalance_shards 명령으로만 바뀝니다. 프로세스는
+배치를 SHARD_MAP_TTL 초 동안 캐시하므로 사용자별 샤드 조회는 O(1) 입니다.
+
+- 사용자별 조회/쓰기: Model.objects.for_user(user), profile.<related>.all(),
+  Model.objects.create(user=...), bulk_create(), instance.save()
+- 전체 샤드 조회(관리/분석): Model.objects.fan_out(callback), count_all()
+
+샤드를 설정하지 않으면 모든 행이 default 에 저장되고 동작은 그대로입니다.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, models, router, transaction
+from django.db.models import F
+
+
+def shard_aliases():
+    return list(getattr(settings, "SHARDS", ())) or [DEFAULT_DB_ALIAS]
+
+
+def bucket_for(key):
+    return int(key) % getattr(settings, "SHARD_BUCKETS", 1024)
+
+
+def is_sharded(model):
+    return getattr(model, "shard_key", None) is not None
+
+
+class ShardMap:
+    """
+    버킷 -> 샤드 별칭 배치. default DB 의 shard_bucket 테이블을 SHARD_MAP_TTL 초 동안 캐시합니다.
+    """
+
+    table = "shard_bucket"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = None
+        self._loaded_at = 0.0
+
+    def ensure_table(self):
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(bucket INTEGER PRIMARY KEY, alias VARCHAR(100) NOT NULL)"
+            )
+
+    def load(self):
+        """
+        저장된 배치를 읽습니다. 비어 있으면 현재 샤드에 고르게 배치해 저장합니다.
+        """
+        self.ensure_table()
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(f"SELECT bucket, alias FROM {self.table}")
+            buckets = dict(cursor.fetchall())
+            count = getattr(settings, "SHARD_BUCKETS", 1024)
+            if len(buckets) != count:
+                aliases = shard_aliases()
+                missing = [b for b in range(count) if b not in buckets]
+                rows = [(b, aliases[b % len(aliases)]) for b in missing]
+                cursor.executemany(
+                    f"INSERT INTO {self.table} (bucket, alias) VALUES (%s, %s)", rows
+                )
+                buckets.update(rows)
+        return buckets
+
+    def buckets(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._buckets is None or now - self._loaded_at >= getattr(
+                settings, "SHARD_MAP_TTL", 30
+            ):
+                self._buckets = self.load()
+                self._loaded_at = now
+            return self._buckets
+
+    def assign(self, bucket, alias):
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self.table} SET alias = %s WHERE bucket = %s", [alias, bucket]
+            )
+        with self._lock:
+            if self._buckets is not None:
+                self._buckets[bucket] = alias
+
+    def reset(self):
+        with self._lock:
+            self._buckets = None
+
+
+shard_map = ShardMap()
+
+
+def shard_for(key):
+    """
+    샤드 키(사용자 id) 가 저장된 DB 별칭.
+    """
+    if not getattr(settings, "SHARDS", ()):
+        return DEFAULT_DB_ALIAS
+    return shard_map.buckets()[bucket_for(key)]
+
+
+def sharded_models():
+    return [model for model in apps.get_models() if is_sharded(model)]
+
+
+def plan_rebalance(buckets, aliases):
+    """
+    버킷 배치를 aliases 에 고르게 맞추기 위해 옮길 (버킷, 원래 별칭, 새 별칭) 목록.
+    이미 제자리에 있는 버킷은 그대로 두어 옮기는 양을 최소로 합니다.
+    """
+    owned = {alias: [] for alias in aliases}
+    surplus = []
+    for bucket, alias in sorted(buckets.items()):
+        (owned[alias] if alias in owned else surplus).append(bucket)
+    base, extra = divmod(len(buckets), len(aliases))
+    # 나머지 버킷은 이미 많이 가진 별칭에 남겨 둡니다.
+    ranked = sorted(aliases, key=lambda alias: -len(owned[alias]))
+    capacity = {alias: base + (rank < extra) for rank, alias in enumerate(ranked)}
+    for alias in aliases:
+        surplus.extend(owned[alias][capacity[alias]:])
+        del owned[alias][capacity[alias]:]
+    moves = []
+    for alias in aliases:
+        while len(owned[alias]) < capacity[alias]:
+            bucket = surplus.pop()
+            owned[alias].append(bucket)
+            moves.append((bucket, buckets[bucket], alias))
+    return moves
+
+
+def move_bucket(bucket, source, target, batch_size=1000):
+    """
+    버킷의 행을 source 에서 target 으로 복사하고 배치를 바꾼 뒤 source 에서 지웁니다.
+    source 트랜잭션이 끝날 때까지 source 의 쓰기는 대기합니다. 다른 프로세스는
+    SHARD_MAP_TTL 이 지나야 새 배치를 읽으므로 그동안의 쓰기는 옛 샤드로 갈 수 있습니다.
+    행의 pk 는 target 에서 새로 발급됩니다. 옮긴 행 수를 반환합니다.
+    """
+    count = getattr(settings, "SHARD_BUCKETS", 1024)
+    connection = connections[target]
+    moved = 0
+    with transaction.atomic(using=source), transaction.atomic(using=target):
+        querysets = []
+        for model in sharded_models():
+            queryset = (
+                model.objects.using(source)
+                .alias(shard_bucket=F(model.shard_key) % count)
+                .filter(shard_bucket=bucket)
+            )
+            querysets.append(queryset)
+            # auto_now_add 등이 값을 바꾸지 않도록 save/bulk_create 대신 그대로 INSERT 합니다.
+            fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+            quote = connection.ops.quote_name
+            sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                quote(model._meta.db_table),
+                ", ".join(quote(field.column) for field in fields),
+                ", ".join(["%s"] * len(fields)),
+            )
+            rows = queryset.order_by("pk").values_list(*(field.attname for field in fields))
+            batch = []
+            with connection.cursor() as cursor:
+                for row in rows.iterator(chunk_size=batch_size):
+                    batch.append(
+                        [f.get_db_prep_save(value, connection) for f, value in zip(fields, row)]
+                    )
+                    if len(batch) >= batch_size:
+                        cursor.executemany(sql, batch)
+                        moved += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(sql, batch)
+                    moved += len(batch)
+        shard_map.assign(bucket, target)
+        for queryset in querysets:
+            # 옮긴 행은 변경이 아니므로 삭제 시그널(outbox 이벤트) 없이 지웁니다.
+            queryset._raw_delete(source)
+    return moved
+
+
+def _key_value(value):
+    return value.pk if isinstance(value, models.Model) else value
+
+
+class ShardedQuerySet(models.QuerySet):
+    def _shard_field(self):
+        return self.model.shard_key[: -len("_id")]
+
+    def for_user(self, user):
+        key = _key_value(user)
+        return self.using(shard_for(key)).filter(**{self.model.shard_key: key})
+
+    def create(self, **kwargs):
+        if self._db is None:
+            key = kwargs.get(self.model.shard_key, kwargs.get(self._shard_field()))
+            if key is not None:
+                return super(ShardedQuerySet, self.using(shard_for(_key_value(key)))).create(
+                    **kwargs
+                )
+        return super().create(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if self._db is not None:
+            return super().bulk_create(objs, *args, **kwargs)
+        groups = {}
+        for obj in objs:
+            alias = shard_for(getattr(obj, self.model.shard_key))
+            groups.setdefault(alias, []).append(obj)
+        created = []
+        for alias, group in groups.items():
+            created.extend(
+                super(ShardedQuerySet, self.using(alias)).bulk_create(group, *args, **kwargs)
+            )
+        return created
+
+    def fan_out(self, callback):
+        """
+        각 샤드의 QuerySet 에 callback 을 실행하고 {별칭: 결과} 를 반환합니다.
+        """
+        return {alias: callback(self.using(alias)) for alias in shard_aliases()}
+
+    def count_all(self):
+        return sum(self.fan_out(lambda queryset: queryset.count()).values())
+
+
+ShardedManager = models.Manager.from_queryset(ShardedQuerySet)
+
+
+class ShardRouter:
+    """
+    샤드 모델의 읽기/쓰기를 힌트(instance)의 샤드 키로 라우팅합니다.
+    힌트가 없으면 None 을 반환하므로 for_user()/fan_out() 으로 샤드를 지정해야 합니다.
+    """
+
+    def _shard_from_hints(self, model, hints):
+        instance = hints.get("instance")
+        if instance is None:
+            return None
+        if isinstance(instance, model):
+            key = getattr(instance, model.shard_key)
+        elif isinstance(instance, model._meta.get_field(model.shard_key).related_model):
+            key = instance.pk
+        else:
+            return None
+        return shard_for(key) if key is not None else None
+
+    def _route(self, model, hints, fallback):
+        if is_sharded(model):
+            return self._shard_from_hints(model, hints)
+        instance = hints.get("instance")
+        if instance is not None and is_sharded(type(instance)):
+            # 샤드 행의 외래 키(book, user) 대상은 샤드가 아닌 곳에 있습니다.
+            return fallback(model)
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints, router.db_for_read)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints, router.db_for_write)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_sharded(type(obj1)) or is_sharded(type(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        shards = getattr(settings, "SHARDS", ())
+        if not shards:
+            return None
+        model = hints.get("model")
+        if model is not None and is_sharded(model):
+            return db in shards
+        # 샤드 쓰기와 같은 트랜잭션에 들어가야 하는 테이블 (outbox.ChangeEvent)
+        if model is not None and getattr(model, "on_every_shard", False) and db in shards:
+            return True
+        if db in shards:
+            return False
+        return None
+
+
+def _reset_shard_map(*, setting, **kwargs):
+    if setting in ("SHARDS", "SHARD_BUCKETS", "DATABASES"):
+        shard_map.reset()
+
+
+setting_changed.connect(_reset_shard_map)
@@ -0,0 +1,138 @@
+"""
+updated_at 기준 증분 동기화 (GET /api/<resource>/sync/).
+
+목록을 매번 처음부터 다시 받지 않고, 마지막으로 받은 위치(워터마크) 이후에 바뀐 행만
+(updated_at, pk) 순서로 받습니다. 소프트 삭제된 행은 all_with_deleted() 로 읽어
+tombstone({"id", "deleted_at"}) 으로 내려 주므로 클라이언트도 삭제를 반영할 수 있습니다.
+
+    GET /api/books/sync/                 → 첫 동기화 (삭제되지 않은 행만)
+    GET /api/books/sync/?since=<next>    → 그 뒤 바뀐 행과 tombstone
+
+응답은 {"results": [...], "deleted": [...], "next": <워터마크>, "has_more": bool} 이고,
+has_more 가 false 가 될 때까지 next 로 이어 받은 뒤 next 를 보관해 두었다가 다음 동기화에
+씁니다. 워터마크는 불투명한 문자열이며 (updated_at, pk) 복합 인덱스로 범위 조회합니다.
+
+updated_at 은 커밋이 아니라 저장 시각이므로, 막 저장된 행은 SETTLE_SECONDS 가 지난 뒤에
+내려 줘 늦게 커밋된 트랜잭션의 행을 워터마크가 건너뛰지 않게 합니다.
+"""
+import base64
+import binascii
+import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+SETTLE_SECONDS = 5
+
+
+def encode_watermark(updated_at, pk):
+    raw = f"{updated_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_watermark(token):
+    """
+    워터마크를 (updated_at, pk) 로 바꿉니다. 형식이 틀리면 ValueError.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid watermark: {token!r}")
+    stamp, _, pk = raw.rpartition("|")
+    updated_at = parse_datetime(stamp) if stamp else None
+    if updated_at is None or not pk.isdigit():
+        raise ValueError(f"Invalid watermark: {token!r}")
+    return updated_at, int(pk)
+
+
+def changed_since(queryset, watermark, field="updated_at"):
+    """
+    (field, pk) 가 watermark 보다 뒤인 행을 그 순서로. 앞의 조건은 인덱스 범위 조회,
+    뒤의 조건은 같은 시각의 행만 거릅니다.
+    """
+    queryset = queryset.order_by(field, "pk")
+    if watermark is None:
+        return queryset
+    updated_at, pk = watermark
+    return queryset.filter(Q(**{f"{field}__gt": updated_at}) | Q(pk__gt=pk), **{f"{field}__gte": updated_at})
+
+
+def sync_page(queryset, watermark=None, limit=DEFAULT_LIMIT, now=None, field="updated_at"):
+    """
+    watermark 다음의 행을 최대 limit 건 읽어 (행 목록, 다음 워터마크, 더 있는지) 를 반환합니다.
+    """
+    settled = (now or timezone.now()) - datetime.timedelta(seconds=SETTLE_SECONDS)
+    rows = list(changed_since(queryset.filter(**{f"{field}__lte": settled}), watermark, field)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        last = rows[-1]
+        next_watermark = encode_watermark(getattr(last, field), last.pk)
+    elif watermark is not None:
+        next_watermark = encode_watermark(*watermark)
+    else:
+        next_watermark = None
+    return rows, next_watermark, has_more
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_LIMIT, default=DEFAULT_LIMIT)
+
+    def validate_since(self, value):
+        if not value:
+            return None
+        try:
+            return decode_watermark(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid watermark.")
+
+
+class SyncViewMixin:
+    """
+    ModelViewSet 에 증분 동기화 액션(sync)을 더합니다. sync_queryset 은 소프트 삭제된 행을
+    포함해야 합니다 (예: Book.objects.all_with_deleted()). 필터/검색/정렬은 적용하지 않습니다.
+    다른 모델에서 집계한 값처럼 바뀌어도 updated_at 이 바뀌지 않는 필드는
+    sync_exclude_fields 에 두어 응답에서 뺍니다.
+    """
+
+    sync_queryset = None
+    sync_exclude_fields = ()
+
+    def get_sync_queryset(self):
+        return self.sync_queryset.all()
+
+    def get_sync_serializer(self, rows):
+        serializer = self.get_serializer(rows, many=True)
+        for name in self.sync_exclude_fields:
+            serializer.child.fields.pop(name, None)
+        return serializer
+
+    def tombstone(self, instance):
+        return {"id": instance.pk, "deleted_at": instance.deleted_at}
+
+    @action(detail=False, methods=["get"])
+    def sync(self, request):
+        params = SyncQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            raise ValidationError(params.errors)
+        watermark = params.validated_data.get("since")
+        rows, next_watermark, has_more = sync_page(
+            self.get_sync_queryset(), watermark, params.validated_data["limit"]
+        )
+        live = [row for row in rows if not row.deleted]
+        # 처음 받는 클라이언트에게는 지울 행이 없습니다 (워터마크는 삭제된 행도 지나감).
+        deleted = [self.tombstone(row) for row in rows if row.deleted] if watermark else []
+        return Response({
+            "results": self.get_sync_serializer(live).data,
+            "deleted": deleted,
+            "next": next_watermark,
+            "has_more": has_more,
+        })
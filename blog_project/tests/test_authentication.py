@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from blog_project.authentication import CachedJWTAuthentication, token_user_cache
+from book.views import BookViewSet
+from user.tests.factories import UserFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_user_cache.clear()
+    yield
+    token_user_cache.clear()
+
+
+def make_request(user):
+    token = AccessToken.for_user(user)
+    return APIRequestFactory().get('/api/books/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_second_request_skips_user_lookup(self):
+        user = UserFactory()
+        request = make_request(user)
+        auth = CachedJWTAuthentication()
+        assert auth.authenticate(request)[0] == user
+
+        with CaptureQueriesContext(connection) as queries:
+            cached_user, token = auth.authenticate(request)
+        assert len(queries) == 0
+        assert cached_user == user
+        assert cached_user.username == user.username
+        assert cached_user is not auth.authenticate(request)[0]
+
+    def test_soft_delete_invalidates_cache(self):
+        user = UserFactory()
+        request = make_request(user)
+        auth = CachedJWTAuthentication()
+        auth.authenticate(request)
+        assert len(token_user_cache) == 1
+
+        user.soft_delete()
+        assert len(token_user_cache) == 0
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(request)
+
+    @pytest.mark.parametrize('delete', [
+        lambda user: user.delete(),
+        lambda user: type(user).objects.filter(pk=user.pk).delete(),
+    ])
+    def test_hard_delete_invalidates_cache(self, delete):
+        # JWT 를 첫 인증 클래스로 두어야 인증 실패가 401 입니다 (session 이 먼저면 403).
+        view = BookViewSet.as_view({'get': 'list'}, authentication_classes=[CachedJWTAuthentication])
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+
+        def get():
+            return view(APIRequestFactory().get('/api/books/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+        assert get().status_code == 200
+        assert len(token_user_cache) == 1
+
+        delete(user)
+        assert len(token_user_cache) == 0
+        response = get()
+        assert response.status_code == 401
+        assert response.data['code'] == 'user_not_found'
+
+    def test_restore_allows_authentication_again(self):
+        user = UserFactory()
+        request = make_request(user)
+        user.soft_delete()
+        auth = CachedJWTAuthentication()
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(request)
+
+        user.restore()
+        assert auth.authenticate(request)[0] == user
+
+    def test_inactive_user_rejected(self):
+        user = UserFactory(is_active=False)
+        with pytest.raises(AuthenticationFailed):
+            CachedJWTAuthentication().authenticate(make_request(user))
+        assert len(token_user_cache) == 0
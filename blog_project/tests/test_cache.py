@@ -0,0 +1,143 @@
+import io
+import sqlite3
+import threading
+import time
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from blog_project.cache import SQLiteCache, get_or_compute, refresh
+from book.tests.factories import BookFactory, UserFactory
+
+
+class TestTieredCache:
+    def test_l1_serves_until_l1_timeout(self):
+        cache = caches["default"]
+        cache.set("answer", 42)
+        assert caches["shared"].get("answer") == 42
+
+        # 다른 워커가 L2 에서 지워도 L1_TIMEOUT 동안은 L1 값이 남습니다.
+        caches["shared"].delete("answer")
+        assert cache.get("answer") == 42
+        cache.l1.clear()
+        assert cache.get("answer") is None
+
+    def test_l1_is_shared_by_threads(self):
+        cache = caches["default"]
+        cache.set("answer", 42)
+        caches["shared"].delete("answer")
+        seen = []
+
+        def read():
+            other = caches["default"]
+            seen.append((other is cache, other.l1 is cache.l1, other.get("answer")))
+            # 다른 스레드의 삭제도 L1 에서 바로 지워집니다.
+            other.delete("answer")
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        assert seen == [(False, True, 42)]
+        assert cache.get("answer") is None
+
+    def test_add_is_decided_by_l2(self):
+        cache = caches["default"]
+        caches["shared"].set("lock", 1)
+        assert not cache.add("lock", 2)
+        assert cache.add("other", 2)
+
+
+def test_sqlite_cache_expiry_add_and_cull(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), {"OPTIONS": {"MAX_ENTRIES": 10}})
+    cache.set("a", {"x": 1})
+    assert cache.get("a") == {"x": 1}
+    assert not cache.add("a", 2)
+    cache.set("expired", 1, timeout=-1)
+    assert cache.get("expired") is None
+    assert cache.add("expired", 2)
+    assert cache.delete("a") and not cache.has_key("a")
+
+    for i in range(30):
+        cache.set(f"k{i}", i)
+    count = cache._connection().execute("SELECT COUNT(*) FROM cache_entry").fetchone()[0]
+    assert count <= 10
+    assert cache.get("k29") == 29
+
+
+def test_sqlite_cache_creates_table_once_per_path(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path, {}).set("a", 1)
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE cache_entry")
+    # 같은 경로의 새 캐시 객체(다른 스레드)는 CREATE TABLE 을 다시 실행하지 않습니다.
+    cache = SQLiteCache(path, {})
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        cache.get("a")
+
+
+class TestGetOrCompute:
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute("slow", compute, 60)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_stale_value_served_while_another_worker_refreshes(self):
+        refresh("key", lambda: "old", timeout=-1, stale=60)
+        # 다른 워커가 락을 잡고 다시 계산하는 중
+        caches["default"].add("key:lock", 1, 30)
+        assert get_or_compute("key", lambda: "new", 60) == "old"
+
+        caches["default"].delete("key:lock")
+        assert get_or_compute("key", lambda: "new", 60) == "new"
+
+    def test_missing_value_computed_when_lock_holder_stalls(self):
+        caches["default"].add("key:lock", 1, 30)
+        assert get_or_compute("key", lambda: "value", 60, lock_timeout=0.1) == "value"
+
+
+@pytest.mark.django_db
+class TestBookCaches:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+        self.book = BookFactory(rating=4.5, average_rating=4.5)
+
+    def test_popular_is_cached_and_invalidated_on_write(self):
+        url = reverse("book-popular")
+        assert len(self.client.get(url).data) == 1
+        with CaptureQueriesContext(connection) as ctx:
+            assert len(self.client.get(url).data) == 1
+        assert len(ctx.captured_queries) == 0
+
+        BookFactory(rating=5.0)
+        assert len(self.client.get(url).data) == 2
+
+    def test_warm_caches(self):
+        out = io.StringIO()
+        call_command("warm_caches", stdout=out)
+        assert "popular: 200" in out.getvalue()
+        assert "top_rated: 200" in out.getvalue()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("book-top-rated"))
+            self.client.get(reverse("complex_book_analysis"))
+        assert len(ctx.captured_queries) == 0
@@ -0,0 +1,110 @@
+import gzip
+import io
+import os
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+from blog_project.compression import CompressionMiddleware, negotiate
+from blog_project.media import serve_media
+from book.tests.factories import BookFactory, UserFactory
+
+
+class FakeCodec:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_negotiate_uses_q_values_then_server_order():
+    codecs = [FakeCodec("br"), FakeCodec("zstd"), FakeCodec("gzip")]
+    assert negotiate("gzip, br", codecs).name == "br"
+    assert negotiate("br;q=0.5, gzip", codecs).name == "gzip"
+    assert negotiate("*;q=0.1, zstd;q=0", codecs).name == "br"
+    assert negotiate("identity", codecs) is None
+    assert negotiate("", codecs) is None
+
+
+def gzip_only(settings):
+    settings.COMPRESSION_ENCODINGS = ["gzip"]
+
+
+class TestCompressionMiddleware:
+    def run(self, response, **headers):
+        request = RequestFactory().get("/", **headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_large_json(self, settings):
+        gzip_only(settings)
+        body = b'{"results": [' + b'{"title": "book"},' * 200 + b"{}]}"
+        response = self.run(
+            HttpResponse(body, content_type="application/json"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.content) == body
+
+    def test_skips_small_and_binary_responses(self, settings):
+        gzip_only(settings)
+        small = self.run(
+            HttpResponse(b"{}", content_type="application/json"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert not small.has_header("Content-Encoding")
+        image = self.run(
+            HttpResponse(b"x" * 4096, content_type="image/png"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert not image.has_header("Content-Encoding")
+
+    def test_streaming_response_is_compressed_incrementally(self, settings):
+        gzip_only(settings)
+        rows = [f"{i},title {i}\n".encode() for i in range(500)]
+        response = self.run(
+            StreamingHttpResponse(iter(rows), content_type="text/csv"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 1
+        assert gzip.decompress(b"".join(chunks)) == b"".join(rows)
+
+
+@pytest.mark.django_db
+def test_compressed_etag_round_trips_to_304(settings):
+    gzip_only(settings)
+    settings.COMPRESSION_MIN_SIZE = 10
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    url = reverse("book-detail", args=[BookFactory().pk])
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert response["ETag"].endswith('-gzip"')
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+    assert response["ETag"].endswith('-gzip"')
+
+
+def test_compress_assets_and_serve_media(tmp_path, settings):
+    gzip_only(settings)
+    (tmp_path / "img").mkdir()
+    css = tmp_path / "img" / "site.css"
+    css.write_text("body { color: black; }\n" * 200)
+    (tmp_path / "img" / "cover.png").write_bytes(os.urandom(4096))
+
+    out = io.StringIO()
+    call_command("compress_assets", path=[str(tmp_path)], include_binary=True, stdout=out)
+    assert (tmp_path / "img" / "site.css.gz").exists()
+    # 압축되지 않는 파일은 만들지 않습니다.
+    assert not (tmp_path / "img" / "cover.png.gz").exists()
+
+    request = RequestFactory().get("/media/img/site.css", HTTP_ACCEPT_ENCODING="gzip")
+    response = serve_media(request, "img/site.css", document_root=str(tmp_path))
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"].startswith("text/css")
+    assert gzip.decompress(b"".join(response.streaming_content)) == css.read_bytes()
+
+    plain = serve_media(
+        RequestFactory().get("/media/img/site.css"), "img/site.css", document_root=str(tmp_path)
+    )
+    assert not plain.has_header("Content-Encoding")
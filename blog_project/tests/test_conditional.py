@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from book.models import Book
+from book.tests.factories import BookFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+        self.book = BookFactory()
+        self.url = reverse("book-detail", args=[self.book.pk])
+
+    def test_detail_returns_304_without_serializing(self):
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+        # 객체 조회만, 장르 prefetch 없음
+        assert len(ctx.captured_queries) == 1
+
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=self.client.get(self.url)["Last-Modified"]
+        )
+        assert response.status_code == 304
+
+    def test_related_change_changes_detail_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.book.author.name = "Renamed"
+        self.book.author.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["author"] == "Renamed"
+
+    def test_list_etag_tracks_filtered_rows(self):
+        url = reverse("book-list")
+        etag = self.client.get(url)["ETag"]
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        BookFactory()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["count"] == 2
+        assert response["ETag"] != etag
+
+    @pytest.mark.parametrize("hard", [False, True])
+    def test_list_ignores_if_modified_since_after_delete(self, hard):
+        url = reverse("book-list")
+        older = BookFactory()
+        self.book.save()  # self.book 이 가장 최근에 수정된 행
+        response = self.client.get(url)
+        assert "Last-Modified" not in response
+        since = http_date(time.time() + 60)
+
+        if hard:
+            Book.objects.all_with_deleted().filter(pk=older.pk).delete()
+        else:
+            older.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+
+    def test_if_match_prevents_lost_update(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(
+            self.url, {"title": "First"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+        response = self.client.patch(
+            self.url, {"title": "Second"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 412
+        self.book.refresh_from_db()
+        assert self.book.title == "First"
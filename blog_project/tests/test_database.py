@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from blog_project.database import database_profile
+
+
+@pytest.fixture
+def profile_connection(django_db_blocker):
+    aliases = []
+    created = []
+
+    def connect(config):
+        alias = f"profile_{len(aliases)}"
+        aliases.append(alias)
+        connections.databases[alias] = config
+        connections.ensure_defaults(alias)
+        connections.prepare_test_settings(alias)
+        connection = connections[alias]
+        created.append(connection)
+        return connection
+
+    with django_db_blocker.unblock():
+        yield connect
+        for connection in created:
+            connection.close()
+            del connections[connection.alias]
+        for alias in aliases:
+            del connections.databases[alias]
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_unknown_profile():
+    with pytest.raises(ImproperlyConfigured):
+        database_profile("mysql")
+
+
+def test_postgresql_pool_profile_disables_persistent_connections():
+    config = database_profile("postgresql", env={"DB_POOL_MAX_SIZE": "20"})
+    assert config["CONN_MAX_AGE"] == 0
+    assert config["OPTIONS"]["pool"]["max_size"] == 20
+    assert database_profile("postgresql", env={})["CONN_MAX_AGE"] == 60
+
+
+class FakeConnection:
+    closed = 0
+
+    def __init__(self):
+        self.info = SimpleNamespace(transaction_status=0)  # IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class TestBlockingConnectionPool:
+    @pytest.fixture
+    def pool_class(self, monkeypatch):
+        psycopg2 = pytest.importorskip("psycopg2")
+        monkeypatch.setattr(psycopg2, "connect", lambda *args, **kwargs: FakeConnection())
+        from blog_project.backends.postgresql.base import BlockingConnectionPool
+
+        return BlockingConnectionPool
+
+    def test_getconn_waits_then_times_out(self, pool_class):
+        from psycopg2.pool import PoolError
+
+        pool = pool_class(1, 1, timeout=0.05)
+        conn = pool.getconn()
+        with pytest.raises(PoolError, match="within 0.05 seconds"):
+            pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+
+    def test_waiting_getconn_gets_returned_connection(self, pool_class):
+        pool = pool_class(1, 1, timeout=5)
+        conn = pool.getconn()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+        waiter.start()
+        waiter.join(0.05)
+        assert waiter.is_alive() and received == []
+        pool.putconn(conn)
+        waiter.join(5)
+        assert received == [conn]
+
+
+class TestSQLiteProfile:
+    def test_pragmas_applied_on_connect(self, tmp_path, profile_connection):
+        connection = profile_connection(
+            database_profile("sqlite", str(tmp_path / "db.sqlite3"), env={})
+        )
+        assert pragma(connection, "journal_mode") == "wal"
+        assert pragma(connection, "synchronous") == 1  # NORMAL
+        assert pragma(connection, "busy_timeout") == 5000
+        assert pragma(connection, "cache_size") == -65536
+        # Django 가 기본으로 켜는 설정은 그대로 유지됩니다.
+        assert pragma(connection, "foreign_keys") == 1
+
+    def test_env_overrides(self, tmp_path, profile_connection):
+        env = {"SQLITE_BUSY_TIMEOUT": "250", "SQLITE_CACHE_SIZE": "-1024"}
+        connection = profile_connection(
+            database_profile("sqlite", str(tmp_path / "db.sqlite3"), env=env)
+        )
+        assert pragma(connection, "busy_timeout") == 250
+        assert pragma(connection, "cache_size") == -1024
+
+    def test_atomic_takes_write_lock_immediately(self, tmp_path, profile_connection):
+        path = tmp_path / "db.sqlite3"
+        connection = profile_connection(database_profile("sqlite", str(path), env={}))
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+
+        other = sqlite3.connect(path, timeout=0, isolation_level=None)
+        with transaction.atomic(using=connection.alias):
+            # 아직 아무것도 쓰지 않았지만 다른 쓰기 트랜잭션은 시작할 수 없습니다.
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+        other.execute("BEGIN IMMEDIATE")
+        other.execute("ROLLBACK")
+        other.close()
+
+    def test_readers_do_not_wait_for_open_write(self, tmp_path, profile_connection):
+        path = tmp_path / "db.sqlite3"
+        connection = profile_connection(database_profile("sqlite", str(path), env={}))
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+            cursor.execute("INSERT INTO item VALUES (1)")
+
+        readers = [sqlite3.connect(path, timeout=0, isolation_level=None) for _ in range(3)]
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO item VALUES (2)")
+            # WAL 이므로 커밋 전에도 다른 연결은 기다리지 않고 커밋된 값만 읽습니다.
+            for reader in readers:
+                assert reader.execute("SELECT COUNT(*) FROM item").fetchone() == (1,)
+        for reader in readers:
+            assert reader.execute("SELECT COUNT(*) FROM item").fetchone() == (2,)
+            reader.close()
+
+    def test_invalid_options(self, tmp_path, profile_connection):
+        config = database_profile("sqlite", str(tmp_path / "db.sqlite3"), env={})
+        config["OPTIONS"]["pragmas"]["journal_mode"] = "WAL; DROP TABLE x"
+        with pytest.raises(ImproperlyConfigured):
+            profile_connection(config)
+
+        config = database_profile("sqlite", str(tmp_path / "db.sqlite3"), env={})
+        config["OPTIONS"]["transaction_mode"] = "LAZY"
+        with pytest.raises(ImproperlyConfigured):
+            profile_connection(config)
@@ -0,0 +1,131 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from blog_project.fieldsets import parse_selection, prune_columns, serializer_columns
+from book.models import Author, Book
+from book.serializers import BookSerializer
+from book.tests.factories import BookFactory, UserFactory
+
+
+def selected_columns(sql, table):
+    select = sql.split(" FROM ", 1)[0]
+    return re.findall(rf'"{table}"\."(\w+)"', select)
+
+
+def test_parse_selection():
+    assert parse_selection("id, author.name,author.id,") == {
+        "id": {}, "author": {"name": {}, "id": {}},
+    }
+    assert parse_selection(["id", "title"]) == {"id": {}, "title": {}}
+    assert parse_selection(None) == {}
+
+
+class TestSerializerColumns:
+    def test_book_serializer_columns(self):
+        columns = serializer_columns(BookSerializer(), Book)
+        assert columns.resolve() == {
+            "id", "title", "author", "publication_date", "isbn", "price", "average_rating",
+        }
+        # StringRelatedField 는 큰 컬럼(bio)을 제외한 저자 컬럼을 읽습니다.
+        assert "name" in columns.relations["author"].resolve()
+        assert "bio" not in columns.relations["author"].resolve()
+
+    def test_undeclared_method_field_loads_all_but_large_columns(self):
+        class AuthorSummarySerializer(serializers.ModelSerializer):
+            initials = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Author
+                fields = ["id", "initials"]
+
+            def get_initials(self, obj):
+                return obj.name[:1]
+
+        names = serializer_columns(AuthorSummarySerializer(), Author).resolve()
+        assert "name" in names
+        assert "bio" not in names
+
+    def test_unused_join_is_dropped(self):
+        class TitleSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = Book
+                fields = ["id", "title"]
+
+        queryset = prune_columns(
+            Book.objects.select_related("author"), serializer_columns(TitleSerializer(), Book)
+        )
+        sql = str(queryset.query)
+        assert "book_author" not in sql
+        assert selected_columns(sql, "book_book") == ["id", "title"]
+
+
+@pytest.mark.django_db
+class TestColumnPruning:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+        BookFactory.create_batch(3)
+
+    def book_select(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return next(
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].startswith('SELECT "book_book"."id"')
+        )
+
+    def test_book_list_selects_only_rendered_columns(self):
+        sql = self.book_select(reverse("book-list"))
+        assert selected_columns(sql, "book_book") == [
+            "id", "title", "author_id", "publication_date", "isbn", "price", "average_rating",
+        ]
+        author_columns = selected_columns(sql, "book_author")
+        assert "name" in author_columns
+        assert "bio" not in author_columns
+
+    def test_custom_list_actions_are_pruned(self):
+        sql = self.book_select(reverse("book-top-rated"))
+        assert "description" not in selected_columns(sql, "book_book")
+
+    def test_retrieve_loads_full_row(self):
+        book = Book.objects.first()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("book-detail", args=[book.pk]))
+        assert '"book_book"."description"' in ctx.captured_queries[0]["sql"]
+
+    def test_fields_param_skips_unrequested_joins_and_prefetches(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("book-list"), {"fields": "id,title"})
+        assert set(response.data["results"][0]) == {"id", "title"}
+        # count + 목록, 저자 조인과 장르 prefetch 없음
+        assert len(ctx.captured_queries) == 2
+        assert selected_columns(ctx.captured_queries[1]["sql"], "book_book") == ["id", "title"]
+
+    def test_expand_replaces_relation_with_nested_object(self):
+        book = Book.objects.select_related("author").first()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse("book-detail", args=[book.pk]),
+                {"expand": "author", "fields": "id,author.id,author.name"},
+            )
+        assert response.data == {
+            "id": book.pk, "author": {"id": book.author.pk, "name": book.author.name},
+        }
+        # 선택하지 않은 books_count/average_book_rating 은 계산하지 않습니다.
+        assert not any("AVG" in query["sql"] for query in ctx.captured_queries)
+
+    def test_write_requests_ignore_fields_param(self):
+        book = Book.objects.first()
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+        response = self.client.patch(
+            reverse("book-detail", args=[book.pk]) + "?fields=id", {"title": "New"}, format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["title"] == "New"
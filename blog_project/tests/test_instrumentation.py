@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from blog_project.instrumentation import (
+    QueryBudgetExceeded,
+    RequestProfile,
+    fingerprint,
+    registry,
+)
+from book.tests.factories import BookFactory, UserFactory
+from book.views import BookViewSet
+
+
+def test_fingerprint_ignores_parameters_and_in_list_length():
+    assert fingerprint('SELECT * FROM "book_book" WHERE "id" IN (%s, %s, %s)') == fingerprint(
+        'SELECT  * FROM "book_book"\nWHERE "id" IN (%s)'
+    )
+    assert fingerprint("SELECT 1 LIMIT 21") == "SELECT ? LIMIT ?"
+
+
+def test_duplicate_queries_are_reported():
+    profile = RequestProfile()
+    execute = lambda sql, params, many, context: None
+    for _ in range(3):
+        profile(execute, 'SELECT * FROM "book_author" WHERE "id" = %s', (1,), False, {})
+    profile(execute, 'SELECT * FROM "book_book"', (), False, {})
+    assert profile.query_count == 4
+    assert list(profile.duplicate_queries.values()) == [3]
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    def setup_method(self):
+        registry.reset()
+        self.client = APIClient()
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header(self):
+        BookFactory.create_batch(3)
+        response = self.client.get(reverse('book-list'))
+        assert response.status_code == 200
+        timing = response['Server-Timing']
+        assert timing.startswith('total;dur=')
+        assert 'db;dur=' in timing
+        assert 'serializer;dur=' in timing
+        assert 'render;dur=' in timing
+
+    def test_server_timing_hidden_from_other_users(self, settings):
+        settings.DEBUG = False
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        assert 'Server-Timing' not in client.get(reverse('book-list'))
+        assert 'Server-Timing' not in APIClient().get(reverse('book-list'))
+        settings.SERVER_TIMING_PUBLIC = True
+        assert 'Server-Timing' in client.get(reverse('book-list'))
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.client.get(reverse('book-list'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('metrics'))
+        body = response.content.decode()
+        assert response.status_code == 200
+        assert 'http_request_queries_bucket{view="BookViewSet",action="list",le="+Inf"} 1' in body
+        assert 'http_request_duration_seconds_count{view="BookViewSet",action="list"} 1' in body
+
+    def test_metrics_endpoint_requires_staff(self, settings):
+        settings.DEBUG = False
+        client = APIClient()
+        client.force_login(UserFactory())
+        assert client.get(reverse('metrics')).status_code == 403
+
+    def test_book_list_stays_within_query_budget(self):
+        BookFactory.create_batch(10)
+        response = self.client.get(reverse('book-list'))
+        assert response.status_code == 200
+
+    def test_query_budget_exceeded_fails(self, monkeypatch):
+        monkeypatch.setattr(BookViewSet, 'query_budget', {'list': 1})
+        BookFactory.create_batch(2)
+        with pytest.raises(QueryBudgetExceeded):
+            self.client.get(reverse('book-list'))
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import pytest
+from rest_framework.test import APIClient
+from django.urls import reverse
+from blog_project.log import (
+    AsyncRotatingFileHandler,
+    JSONFormatter,
+    SamplingFilter,
+    access_logger,
+)
+from book.tests.factories import BookFactory, UserFactory
+
+
+def make_record(msg='hello %s', args=('world',), **extra):
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestJSONFormatter:
+    def test_structured_fields(self):
+        line = JSONFormatter().format(make_record(view='BookViewSet', action='list', status=200))
+        data = json.loads(line)
+        assert data['message'] == 'hello world'
+        assert data['view'] == 'BookViewSet'
+        assert data['status'] == 200
+        assert 'query_count' not in data
+
+
+class TestSamplingFilter:
+    def test_keeps_one_in_n(self):
+        sampler = SamplingFilter({'BookViewSet.list': 3})
+        kept = [sampler.filter(make_record(view='BookViewSet', action='list', status=200)) for _ in range(6)]
+        assert kept.count(True) == 2
+
+    def test_errors_are_never_sampled(self):
+        sampler = SamplingFilter({'BookViewSet.list': 100})
+        sampler.filter(make_record(view='BookViewSet', action='list', status=200))
+        assert sampler.filter(make_record(view='BookViewSet', action='list', status=500))
+
+
+class TestAsyncRotatingFileHandler:
+    def test_writes_batched_records_on_close(self, tmp_path):
+        path = tmp_path / 'access.log'
+        handler = AsyncRotatingFileHandler(str(path), batch_size=10)
+        handler.setFormatter(JSONFormatter())
+        for i in range(25):
+            handler.handle(make_record(args=(i,)))
+        handler.close()
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)['message'] for line in lines] == [f'hello {i}' for i in range(25)]
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        path = tmp_path / 'access.log'
+        handler = AsyncRotatingFileHandler(str(path), queue_size=1)
+        handler.setFormatter(JSONFormatter())
+        handler.start_listener()
+        handler.listener.stop()
+        handler.handle(make_record())
+        handler.handle(make_record())
+        assert handler.dropped == 1
+        # 다시 시작한 리스너가 버린 건수를 다음 배치에 WARNING 으로 남깁니다.
+        handler.listener.start()
+        handler.close()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(line['level'], line['message']) for line in lines] == [
+            ('WARNING', 'Dropped 1 log records: queue full (queue_size=1)'),
+            ('INFO', 'hello world'),
+        ]
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_forked_child_starts_its_own_listener(self, tmp_path):
+        path = tmp_path / 'access.log'
+        handler = AsyncRotatingFileHandler(str(path))
+        handler.setFormatter(JSONFormatter())
+        handler.handle(make_record(args=('parent',)))
+        pid = os.fork()
+        if pid == 0:
+            try:
+                handler.handle(make_record(args=('child',)))
+                handler.close()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        handler.close()
+        messages = sorted(json.loads(line)['message'] for line in path.read_text().splitlines())
+        assert messages == ['hello child', 'hello parent']
+
+
+@pytest.mark.django_db
+class TestAccessLogMixin:
+    def test_logs_one_structured_record_per_request(self):
+        handler = ListHandler()
+        access_logger.addHandler(handler)
+        try:
+            client = APIClient()
+            user = UserFactory(is_staff=True)
+            client.force_authenticate(user=user)
+            BookFactory.create_batch(2)
+            response = client.get(reverse('book-list'))
+        finally:
+            access_logger.removeHandler(handler)
+
+        assert response.status_code == 200
+        assert len(handler.records) == 1
+        record = handler.records[0]
+        assert record.view == 'BookViewSet'
+        assert record.action == 'list'
+        assert record.status == 200
+        assert record.user_id == user.pk
+        assert record.query_count > 0
+        # PerformanceMiddleware 와 같은 집계(모든 DB 별칭)를 사용합니다.
+        assert f'"{record.query_count} queries"' in response['Server-Timing']
@@ -0,0 +1,147 @@
+import asyncio
+import io
+import re
+import threading
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import RequestFactory
+from PIL import Image
+from rest_framework.test import APIClient
+from blog_project import media
+from blog_project.media import MediaASGIHandler, serve_media
+from book.tests.factories import BookFactory
+
+
+@pytest.fixture
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_DELIVERY = "django"
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "report.txt").write_bytes(b"0123456789" * 100)
+    (tmp_path / "attachments").mkdir()
+    (tmp_path / "attachments" / "secret.pdf").write_bytes(b"secret")
+    return tmp_path
+
+
+def get(path, **headers):
+    return serve_media(RequestFactory().get("/media/" + path, **headers), path)
+
+
+class TestServeMedia:
+    def test_range_requests(self, media_root):
+        response = get("img/report.txt", HTTP_RANGE="bytes=10-19")
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 10-19/1000"
+        assert response["Content-Length"] == "10"
+        assert b"".join(response.streaming_content) == b"0123456789"
+
+        suffix = get("img/report.txt", HTTP_RANGE="bytes=-5")
+        assert b"".join(suffix.streaming_content) == b"56789"
+
+        unsatisfiable = get("img/report.txt", HTTP_RANGE="bytes=5000-")
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable["Content-Range"] == "bytes */1000"
+
+        # If-Range 가 맞지 않으면 전체를 보냅니다.
+        full = get("img/report.txt", HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"stale"')
+        assert full.status_code == 200
+        assert full["Content-Length"] == "1000"
+
+    def test_cache_headers_and_304(self, media_root):
+        (media_root / "img" / "cover.0123456789abcdef.png").write_bytes(b"png")
+        hashed = get("img/cover.0123456789abcdef.png")
+        assert hashed["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert not hashed.has_header("Content-Disposition")
+
+        plain = get("img/report.txt")
+        assert plain["Cache-Control"] == "public, max-age=3600"
+        assert plain["Accept-Ranges"] == "bytes"
+        assert get("img/report.txt", HTTP_IF_NONE_MATCH=plain["ETag"]).status_code == 304
+
+    def test_offload_modes(self, media_root, settings):
+        settings.MEDIA_DELIVERY = "x-accel"
+        response = get("img/report.txt")
+        assert response["X-Accel-Redirect"] == "/protected-media/img/report.txt"
+        assert not response.content
+
+        settings.MEDIA_DELIVERY = "sendfile"
+        assert get("img/report.txt")["X-Sendfile"] == str(media_root / "img" / "report.txt")
+
+
+def run_asgi(scope):
+    messages = []
+
+    async def app(scope, receive, send):
+        messages.append("django")
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "headers": [], **scope}
+    asyncio.run(MediaASGIHandler(app)(scope, None, send))
+    return messages
+
+
+def test_asgi_handler_serves_media_directly(media_root):
+    messages = run_asgi({"path": "/media/img/report.txt", "headers": [(b"range", b"bytes=0-9")]})
+    assert messages[0]["status"] == 206
+    assert (b"content-length", b"10") in messages[0]["headers"]
+    assert b"".join(message["body"] for message in messages[1:]) == b"0123456789"
+
+    messages = run_asgi({"path": "/media/img/report.txt", "extensions": {"http.response.zerocopysend": {}}})
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["count"] == 1000
+
+    assert run_asgi({"path": "/api/books/"}) == ["django"]
+    assert run_asgi({"path": "/media/missing.txt"}) == ["django"]
+
+
+def test_asgi_handler_keeps_file_access_off_the_event_loop(media_root, monkeypatch):
+    threads = []
+    original = media.resolve
+
+    def resolve(root, path):
+        threads.append(threading.current_thread())
+        return original(root, path)
+
+    monkeypatch.setattr(media, "resolve", resolve)
+    messages = run_asgi({"path": "/media/img/report.txt"})
+    assert messages[0]["status"] == 200
+    assert threads and threading.main_thread() not in threads
+
+
+def test_only_public_folders_are_served(media_root, settings):
+    with pytest.raises(Http404):
+        get("attachments/secret.pdf")
+    with pytest.raises(Http404):
+        get("img/../attachments/secret.pdf")
+    assert run_asgi({"path": "/media/attachments/secret.pdf"}) == ["django"]
+    settings.MEDIA_DELIVERY = "x-accel"
+    with pytest.raises(Http404):
+        get("attachments/secret.pdf")
+
+
+@pytest.mark.django_db
+def test_book_cover_is_processed_once_under_hashed_name(media_root):
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), "red").save(buffer, "JPEG")
+    book = BookFactory(cover_image=SimpleUploadedFile("cover.jpg", buffer.getvalue()))
+
+    name = book.cover_image.name
+    assert re.fullmatch(rf"img/covers/{book.pk}\.[0-9a-f]{{16}}\.png", name)
+    book.refresh_from_db()
+    assert book.cover_image.name == name
+    with Image.open(book.cover_image.path) as img:
+        assert img.format == "PNG"
+        assert max(img.size) == 500
+
+    # 다시 저장해도 변환하지 않습니다.
+    book.title = "Renamed"
+    book.save()
+    assert book.cover_image.name == name
+
+    response = APIClient().get("/media/" + name)
+    assert response.status_code == 200
+    assert "immutable" in response["Cache-Control"]
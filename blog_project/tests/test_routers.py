@@ -0,0 +1,95 @@
+import pytest
+from django.db import connections
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from blog_project.database import database_profile
+from blog_project.replication import replicate
+from blog_project.routers import STICKY_COOKIE, PrimaryReplicaRouter, choose_replica
+from book.models import Author
+from book.tests.factories import AuthorFactory, UserFactory
+
+REPLICA = "replica_test"
+
+
+@pytest.fixture
+def replica(transactional_db, tmp_path, settings):
+    connections.databases[REPLICA] = database_profile(
+        "sqlite", str(tmp_path / "replica.sqlite3"), env={}
+    )
+    connections.ensure_defaults(REPLICA)
+    connections.prepare_test_settings(REPLICA)
+    settings.READ_REPLICAS = [REPLICA]
+    settings.DATABASE_ROUTERS = ["blog_project.routers.PrimaryReplicaRouter"]
+    settings.REPLICA_LAG_CHECK_INTERVAL = 0
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def test_queries_outside_requests_use_primary(settings):
+    settings.READ_REPLICAS = [REPLICA]
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Author) == "default"
+    assert router.db_for_write(Author) == "default"
+    assert router.allow_migrate(REPLICA, "book") is False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+    def setup_method(self):
+        self.user = UserFactory()
+
+    def client(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        return client
+
+    def test_reads_go_to_replica(self, replica):
+        replicate([replica])
+        author = AuthorFactory()
+        url = reverse("author-detail", args=[author.pk])
+        # 복제 전이므로 복제본에는 아직 없습니다.
+        assert self.client().get(url).status_code == 404
+        replicate([replica])
+        assert self.client().get(url).status_code == 200
+
+    def test_own_write_sticks_to_primary_until_replicated(self, replica):
+        replicate([replica])
+        client = self.client()
+        response = client.post(reverse("author-list"), {"name": "Replica", "bio": "bio"})
+        assert response.status_code == 201
+        assert STICKY_COOKIE in response.cookies
+        url = reverse("author-detail", args=[response.data["id"]])
+
+        assert client.get(url).status_code == 200
+        assert self.client().get(url).status_code == 404
+
+        replicate([replica])
+        assert self.client().get(url).status_code == 200
+
+    def test_token_flag_sticks_without_cookies(self, replica):
+        user = UserFactory()
+        replicate([replica])
+        authorization = f"Bearer {AccessToken.for_user(user)}"
+        writer = APIClient()
+        writer.credentials(HTTP_AUTHORIZATION=authorization)
+        response = writer.post(reverse("author-list"), {"name": "Token", "bio": "bio"})
+        assert response.status_code == 201
+        url = reverse("author-detail", args=[response.data["id"]])
+
+        reader = APIClient()
+        reader.credentials(HTTP_AUTHORIZATION=authorization)
+        assert reader.get(url).status_code == 200
+        other = APIClient()
+        other.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        assert other.get(url).status_code == 404
+
+    def test_lagging_replica_is_skipped(self, replica, settings):
+        replicate([replica])
+        url = reverse("author-detail", args=[AuthorFactory().pk])
+        assert self.client().get(url).status_code == 404
+        settings.REPLICA_MAX_LAG = -1
+        assert choose_replica() is None
+        assert self.client().get(url).status_code == 200
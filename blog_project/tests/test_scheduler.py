@@ -0,0 +1,42 @@
+import threading
+import time
+
+from blog_project.scheduler import Scheduler
+
+
+def test_due_entries_run_once_per_job_in_time_order():
+    calls = []
+    scheduler = Scheduler(clock=lambda: 100)
+    scheduler.register("a", lambda due: calls.append(("a", due)))
+    scheduler.register("b", lambda due: calls.append(("b", due)))
+    for when, name in [(30, "a"), (10, "a"), (20, "b"), (10, "a"), (200, "a")]:
+        scheduler.schedule(when, name)
+
+    assert scheduler.next_due() == 10
+    assert scheduler.run_pending() == {"a": [10, 30], "b": [20]}
+    assert calls == [("a", [10, 30]), ("b", [20])]
+    assert len(scheduler) == 1 and scheduler.next_due() == 200
+
+
+def test_failing_job_does_not_stop_others():
+    calls = []
+    scheduler = Scheduler(clock=lambda: 10)
+    scheduler.register("broken", lambda due: 1 / 0)
+    scheduler.register("ok", lambda due: calls.append(due))
+    scheduler.schedule(1, "broken")
+    scheduler.schedule(2, "ok")
+    scheduler.run_pending()
+    assert calls == [[2]]
+
+
+def test_background_thread_wakes_for_earlier_entry():
+    ran = threading.Event()
+    scheduler = Scheduler()
+    scheduler.register("job", lambda due: ran.set())
+    scheduler.schedule(time.time() + 3600, "job")
+    scheduler.start(max_wait=3600)
+    try:
+        scheduler.schedule(time.time() + 0.05, "job")
+        assert ran.wait(2)
+    finally:
+        scheduler.stop(timeout=2)
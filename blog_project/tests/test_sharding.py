@@ -0,0 +1,132 @@
+import datetime
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from blog_project.database import database_profile
+from blog_project.sharding import plan_rebalance, shard_for, shard_map
+from book.models import BookRecommendation, ReadingHistory, UserProfile
+from book.serializers import UserProfileSerializer
+from book.tests.factories import BookFactory, UserFactory
+from outbox.models import ChangeEvent
+
+
+def test_plan_rebalance_moves_only_surplus_buckets():
+    buckets = {bucket: "a" if bucket % 2 else "b" for bucket in range(8)}
+    moves = plan_rebalance(buckets, ["a", "b", "c"])
+    assert len(moves) == 2
+    assert {target for _, _, target in moves} == {"c"}
+
+    drained = plan_rebalance(buckets, ["a"])
+    assert sorted(bucket for bucket, _, _ in drained) == [0, 2, 4, 6]
+    assert plan_rebalance(buckets, ["a", "b"]) == []
+
+
+@pytest.fixture
+def shards(db, tmp_path, settings):
+    created = []
+
+    def add(alias):
+        connections.databases[alias] = database_profile(
+            "sqlite", str(tmp_path / f"{alias}.sqlite3"), env={}
+        )
+        connections.ensure_defaults(alias)
+        connections.prepare_test_settings(alias)
+        with connections[alias].schema_editor() as editor:
+            editor.create_model(ReadingHistory)
+            editor.create_model(BookRecommendation)
+            editor.create_model(ChangeEvent)
+        created.append(alias)
+        settings.SHARDS = list(created)
+
+    settings.SHARD_BUCKETS = 8
+    settings.DATABASE_ROUTERS = ["blog_project.sharding.ShardRouter"]
+    add("shard_a")
+    add("shard_b")
+    yield add
+    for alias in created:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+
+
+def make_profiles(count):
+    return [UserProfile.objects.create(user=UserFactory()) for _ in range(count)]
+
+
+def rows_on(alias, model=ReadingHistory):
+    return model.objects.using(alias).count()
+
+
+class TestShardedModels:
+    def test_rows_are_stored_on_the_users_shard(self, shards):
+        book = BookFactory()
+        for profile in make_profiles(4):
+            ReadingHistory.objects.create(
+                user=profile, book=book, date_read=datetime.date(2024, 1, 1), rating=5
+            )
+            alias = shard_for(profile.pk)
+            assert ReadingHistory.objects.for_user(profile).count() == 1
+            assert ReadingHistory.objects.for_user(profile).db == alias
+        assert rows_on("shard_a") == 2
+        assert rows_on("shard_b") == 2
+        assert ReadingHistory.objects.count_all() == 4
+
+    def test_related_manager_and_bulk_create_route_by_user(self, shards):
+        book = BookFactory()
+        profiles = make_profiles(4)
+        BookRecommendation.objects.bulk_create(
+            BookRecommendation(user=profile, book=book, score=score)
+            for score, profile in enumerate(profiles)
+        )
+        assert BookRecommendation.objects.count_all() == 4
+        for profile in profiles:
+            recommendations = list(profile.recommendations.all())
+            assert len(recommendations) == 1
+            assert recommendations[0]._state.db == shard_for(profile.pk)
+            # 책은 샤드가 아닌 default 에서 읽습니다.
+            assert recommendations[0].book == book
+
+    def test_profile_serializer_reads_history_across_databases(self, shards):
+        profile = make_profiles(1)[0]
+        books = BookFactory.create_batch(2)
+        for day, book in enumerate(books, start=1):
+            ReadingHistory.objects.create(
+                user=profile, book=book, date_read=datetime.date(2024, 1, day), rating=4
+            )
+        history = UserProfileSerializer(profile).data["reading_history"]
+        assert [entry["book"]["id"] for entry in history] == [books[1].id, books[0].id]
+        assert history[0]["book"]["author"] == books[1].author.name
+
+    def test_deleting_profile_removes_shard_rows(self, shards):
+        profile = make_profiles(1)[0]
+        ReadingHistory.objects.create(
+            user=profile, book=BookFactory(), date_read=datetime.date(2024, 1, 1), rating=3
+        )
+        profile.delete()
+        assert ReadingHistory.objects.count_all() == 0
+
+    def test_rebalance_moves_rows_to_new_shard(self, shards):
+        book = BookFactory()
+        profiles = make_profiles(8)
+        for profile in profiles:
+            BookRecommendation.objects.create(user=profile, book=book, score=1.0)
+        created_at = {
+            row.user_id: row.created_at
+            for rows in BookRecommendation.objects.fan_out(list).values()
+            for row in rows
+        }
+
+        shards("shard_c")
+        out = io.StringIO()
+        call_command("rebalance_shards", stdout=out)
+        assert "2 buckets moved" in out.getvalue()
+
+        assert BookRecommendation.objects.count_all() == 8
+        assert rows_on("shard_c", BookRecommendation) > 0
+        for profile in profiles:
+            rows = list(BookRecommendation.objects.for_user(profile))
+            assert len(rows) == 1
+            assert rows[0].created_at == created_at[profile.pk]
+        assert sorted(shard_map.load().values()).count("shard_c") == 2
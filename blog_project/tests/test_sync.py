@@ -0,0 +1,40 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from blog_project import sync
+from book.models import Book
+from book.tests.factories import BookFactory
+
+
+def test_watermark_round_trip():
+    stamp = datetime.datetime(2024, 3, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+    token = sync.encode_watermark(stamp, 42)
+    assert sync.decode_watermark(token) == (stamp, 42)
+    for bad in ("", "not-base64!", sync.encode_watermark(stamp, 42)[:-4]):
+        with pytest.raises(ValueError):
+            sync.decode_watermark(bad)
+
+
+@pytest.mark.django_db
+class TestSyncPage:
+    def test_keyset_pages_split_rows_with_the_same_timestamp(self):
+        books = BookFactory.create_batch(5)
+        stamp = timezone.now() - datetime.timedelta(minutes=1)
+        Book._base_manager.update(updated_at=stamp)
+        queryset = Book.objects.all_with_deleted()
+        seen, watermark, has_more = [], None, True
+        while has_more:
+            rows, token, has_more = sync.sync_page(queryset, watermark, limit=2)
+            seen.extend(row.pk for row in rows)
+            watermark = sync.decode_watermark(token)
+        assert seen == sorted(book.pk for book in books)
+        assert sync.sync_page(queryset, watermark)[0] == []
+
+    def test_unsettled_rows_wait(self):
+        BookFactory()
+        rows, token, has_more = sync.sync_page(Book.objects.all_with_deleted())
+        assert (rows, token, has_more) == ([], None, False)
+        later = timezone.now() + datetime.timedelta(seconds=sync.SETTLE_SECONDS + 1)
+        assert len(sync.sync_page(Book.objects.all_with_deleted(), now=later)[0]) == 1
@@ -0,0 +1,75 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from blog_project.throttling import (
+    MemoryThrottleStore,
+    SQLiteThrottleStore,
+    UserRateThrottle,
+    get_store,
+)
+
+
+class FakeUser:
+    pk = 1
+    is_authenticated = True
+
+
+def make_request():
+    request = Request(APIRequestFactory().get('/api/books/'))
+    request.user = FakeUser()
+    return request
+
+
+class TestMemoryThrottleStore:
+    def test_allows_burst_up_to_limit(self):
+        store = MemoryThrottleStore()
+        results = [store.acquire('k', 0.0, 1.0, 3.0)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    def test_recovers_after_interval(self):
+        store = MemoryThrottleStore()
+        for _ in range(3):
+            store.acquire('k', 0.0, 1.0, 3.0)
+        allowed, wait = store.acquire('k', 0.0, 1.0, 3.0)
+        assert not allowed
+        assert wait == 1.0
+        assert store.acquire('k', 1.0, 1.0, 3.0)[0]
+
+
+class TestSQLiteThrottleStore:
+    def test_limit_is_shared_between_store_instances(self, tmp_path):
+        path = tmp_path / 'throttle.sqlite3'
+        first = SQLiteThrottleStore(path)
+        second = SQLiteThrottleStore(path)
+        assert first.acquire('k', 0.0, 1.0, 2.0)[0]
+        assert second.acquire('k', 0.0, 1.0, 2.0)[0]
+        assert not first.acquire('k', 0.0, 1.0, 2.0)[0]
+        assert not second.acquire('k', 0.0, 1.0, 2.0)[0]
+
+
+class TestGCRAThrottle:
+    def test_duplicate_evaluations_consume_once(self):
+        class TwoPerMinute(UserRateThrottle):
+            rate = '2/min'
+
+        request = make_request()
+        assert TwoPerMinute().allow_request(request, None)
+        assert TwoPerMinute().allow_request(request, None)
+        assert TwoPerMinute().allow_request(make_request(), None)
+        assert not TwoPerMinute().allow_request(make_request(), None)
+
+    def test_wait_reported_when_throttled(self):
+        class OnePerMinute(UserRateThrottle):
+            rate = '1/min'
+
+        assert OnePerMinute().allow_request(make_request(), None)
+        throttle = OnePerMinute()
+        assert not throttle.allow_request(make_request(), None)
+        assert throttle.wait() == pytest.approx(60, abs=1)
+
+    def test_store_follows_settings(self, settings, tmp_path):
+        settings.THROTTLE_STORE = {
+            'BACKEND': 'blog_project.throttling.SQLiteThrottleStore',
+            'OPTIONS': {'path': str(tmp_path / 'throttle.sqlite3')},
+        }
+        assert isinstance(get_store(), SQLiteThrottleStore)
@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blog_project import timewindows
+from book.models import Book
+from book.tests.factories import BookFactory, UserFactory
+from study.models import Study
+from study.tests.factories import StudyFactory
+
+
+@override_settings(TIME_ZONE="Asia/Seoul")
+def test_seconds_until_tomorrow_uses_local_midnight():
+    # 2024-03-01 23:59:30 KST
+    now = datetime.datetime(2024, 3, 1, 14, 59, 30, tzinfo=datetime.timezone.utc)
+    assert timewindows.seconds_until_tomorrow(now) == 30
+
+
+def test_cached_for_today_keys_by_date(monkeypatch):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert timewindows.cached_for_today("answer", compute) == 1
+    assert timewindows.cached_for_today("answer", compute) == 1
+
+    tomorrow = timezone.now() + datetime.timedelta(days=1)
+    monkeypatch.setattr(timezone, "now", lambda: tomorrow)
+    assert timewindows.cached_for_today("answer", compute) == 2
+
+
+@pytest.mark.django_db
+class TestWindowQueries:
+    def test_recent_and_ongoing_boundaries(self):
+        today = timewindows.today()
+        inside = BookFactory(publication_date=today - datetime.timedelta(days=30))
+        BookFactory(publication_date=today - datetime.timedelta(days=31))
+        recent = timewindows.recent(Book.objects.all(), "publication_date", 30)
+        assert list(recent) == [inside]
+
+        current = StudyFactory(start_date=today, end_date=today)
+        StudyFactory(start_date=today + datetime.timedelta(days=1), end_date=today + datetime.timedelta(days=5))
+        StudyFactory(start_date=today - datetime.timedelta(days=5), end_date=today - datetime.timedelta(days=1))
+        assert list(timewindows.ongoing(Study.objects.all())) == [current]
+
+    def test_study_ongoing_is_cached_until_a_study_changes(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        today = timewindows.today()
+        study = StudyFactory(start_date=today - datetime.timedelta(days=1), end_date=today)
+        assert [item["id"] for item in client.get(reverse("study-ongoing")).data] == [study.pk]
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("study-active"))
+        assert [item["id"] for item in response.data] == [study.pk]
+        assert not any("study_study" in query["sql"] for query in ctx.captured_queries)
+
+        study.delete()
+        assert client.get(reverse("study-active")).status_code == 404
+        assert client.get(reverse("study-ongoing")).data == []
+
+    def test_recent_books_cached_for_the_day(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        BookFactory(publication_date=timewindows.today())
+        assert client.get(reverse("book-recent")).data["count"] == 1
+        with CaptureQueriesContext(connection) as ctx:
+            assert client.get(reverse("book-recent")).data["count"] == 1
+        assert not any("book_book" in query["sql"] for query in ctx.captured_queries)
+        BookFactory(publication_date=timewindows.today())
+        assert client.get(reverse("book-recent")).data["count"] == 2
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_recent_books_links_follow_each_request(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        BookFactory.create_batch(3, publication_date=timewindows.today())
+        url = reverse("book-recent")
+        first = client.get(url, {"page_size": 1}, HTTP_HOST="a.example.com")
+        assert first.data["next"].startswith("http://a.example.com/")
+        with CaptureQueriesContext(connection) as ctx:
+            second = client.get(url, {"page": 2, "page_size": 1}, HTTP_HOST="b.example.com")
+        assert not any("book_book" in query["sql"] for query in ctx.captured_queries)
+        assert second.data["count"] == 3
+        assert second.data["next"].startswith("http://b.example.com/")
+        assert second.data["previous"].startswith("http://b.example.com/")
+        assert second.data["results"][0]["id"] not in [row["id"] for row in first.data["results"]]
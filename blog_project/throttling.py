@@ -0,0 +1,199 @@
+"""
+GCRA(Generic Cell Rate Algorithm) 기반 쓰로틀 엔진.
+
+DRF 기본 쓰로틀은 키마다 요청 타임스탬프 리스트를 캐시에 저장하므로 요청 수에
+비례해 메모리가 늘어나고, LocMemCache 를 쓰면 워커 프로세스마다 한도가 따로
+계산됩니다. 여기서는 키마다 TAT(theoretical arrival time) 실수 하나만 저장하고,
+저장소를 SQLite 파일로 공유해 여러 워커에서도 한도가 유지되도록 합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+# 만료된 키를 정리하는 주기 (acquire 호출 횟수 기준)
+PURGE_EVERY = 10000
+
+
+class MemoryThrottleStore:
+    """
+    프로세스 내부 저장소. 단일 워커 환경이나 테스트에서 사용합니다.
+    """
+
+    def __init__(self, **options):
+        self._tats = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def acquire(self, key, now, interval, limit):
+        """
+        요청 하나를 소비합니다. (허용 여부, 권장 대기 시간) 을 반환합니다.
+
+        interval 은 요청 사이의 이론적 간격(duration / num_requests),
+        limit 은 허용되는 최대 누적 지연(duration) 입니다.
+        """
+        with self._lock:
+            self._calls += 1
+            if self._calls % PURGE_EVERY == 0:
+                self._purge(now)
+            new_tat = max(self._tats.get(key, now), now) + interval
+            if new_tat - now > limit:
+                return False, new_tat - now - limit
+            self._tats[key] = new_tat
+            return True, 0.0
+
+    def _purge(self, now):
+        expired = [key for key, tat in self._tats.items() if tat <= now]
+        for key in expired:
+            del self._tats[key]
+
+    def clear(self):
+        with self._lock:
+            self._tats.clear()
+
+
+class SQLiteThrottleStore:
+    """
+    여러 워커 프로세스가 공유하는 SQLite 저장소.
+
+    읽기-계산-쓰기를 BEGIN IMMEDIATE 트랜잭션 하나로 묶어 프로세스 간 경합에도
+    카운트가 어긋나지 않습니다. 커넥션은 스레드별로, fork 이후에는 새로 엽니다.
+    """
+
+    def __init__(self, path, timeout=5.0, **options):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._calls = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS throttle_tat "
+            "(key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def acquire(self, key, now, interval, limit):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tat FROM throttle_tat WHERE key = ?", (key,)
+            ).fetchone()
+            new_tat = max(row[0] if row else now, now) + interval
+            allowed = new_tat - now <= limit
+            if allowed:
+                conn.execute(
+                    "INSERT INTO throttle_tat (key, tat) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                    (key, new_tat),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._calls += 1
+        if self._calls % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM throttle_tat WHERE tat <= ?", (now,))
+        if allowed:
+            return True, 0.0
+        return False, new_tat - now - limit
+
+    def clear(self):
+        self._connection().execute("DELETE FROM throttle_tat")
+
+
+_stores = {}
+
+
+def get_store():
+    """
+    settings.THROTTLE_STORE 설정에 맞는 저장소 인스턴스를 반환합니다.
+    """
+    config = getattr(settings, "THROTTLE_STORE", None) or {
+        "BACKEND": "blog_project.throttling.MemoryThrottleStore",
+    }
+    cache_key = repr(sorted(config.items()))
+    store = _stores.get(cache_key)
+    if store is None:
+        try:
+            backend = import_string(config["BACKEND"])
+        except ImportError as e:
+            raise ImproperlyConfigured(f"Could not import throttle store: {e}")
+        store = _stores[cache_key] = backend(**config.get("OPTIONS", {}))
+    return store
+
+
+def _reset_stores(*, setting, **kwargs):
+    if setting == "THROTTLE_STORE":
+        _stores.clear()
+
+
+setting_changed.connect(_reset_stores)
+
+
+class GCRAThrottleMixin:
+    """
+    SimpleRateThrottle 의 allow_request 를 GCRA 저장소로 대체합니다.
+
+    같은 요청 안에서 (키, 한도) 가 같은 쓰로틀이 여러 번 평가되면
+    처음 결정만 저장소에 반영하고 나머지는 그 결과를 재사용합니다.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        decisions = request.__dict__.setdefault("_throttle_decisions", {})
+        memo_key = (self.key, self.num_requests, self.duration)
+        decision = decisions.get(memo_key)
+        if decision is None:
+            decision = decisions[memo_key] = get_store().acquire(
+                self.key,
+                self.timer(),
+                self.duration / self.num_requests,
+                self.duration,
+            )
+        allowed, self._wait = decision
+        return allowed
+
+    def wait(self):
+        return getattr(self, "_wait", None) or None
+
+
+class AnonRateThrottle(GCRAThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(GCRAThrottleMixin, throttling.UserRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(GCRAThrottleMixin, throttling.ScopedRateThrottle):
+    def allow_request(self, request, view):
+        # DRF 구현은 스코프를 정한 뒤 SimpleRateThrottle 로 넘기므로 같은 과정을 여기서 반복합니다.
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
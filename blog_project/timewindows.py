@@ -0,0 +1,54 @@
+"""
+날짜 구간 조회와 하루 단위 캐시.
+
+"최근 N일", "오늘 진행 중" 같은 조건은 요청마다 timezone.now() 로 datetime 을 만들지 않고
+현지 날짜(today)를 경계로 DateField 와 날짜끼리 비교합니다. 같은 날에는 결과가 바뀌지
+않으므로 cached_for_today 는 캐시 키에 날짜를 넣고 다음 자정까지 보관합니다
+(데이터가 바뀌면 호출하는 쪽의 캐시 세대로 무효화).
+
+    recent(Book.objects.all(), "publication_date", days=30)
+    ongoing(Study.objects.all(), "start_date", "end_date")
+"""
+import datetime
+import math
+
+from django.utils import timezone
+
+from .cache import get_or_compute
+
+
+def today():
+    return timezone.localdate()
+
+
+def recent(queryset, field, days, day=None):
+    """
+    field 가 day(기본 오늘) 기준 최근 days 일 안인 행.
+    """
+    day = day or today()
+    return queryset.filter(**{f"{field}__gte": day - datetime.timedelta(days=days)})
+
+
+def ongoing(queryset, start_field="start_date", end_field="end_date", day=None):
+    """
+    [start_field, end_field] 구간이 day(기본 오늘)를 포함하는 행.
+    """
+    day = day or today()
+    return queryset.filter(**{f"{start_field}__lte": day, f"{end_field}__gte": day})
+
+
+def seconds_until_tomorrow(now=None):
+    now = timezone.localtime(now)
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    midnight = timezone.make_aware(midnight, timezone.get_current_timezone())
+    return max(1, math.ceil((midnight - now).total_seconds()))
+
+
+def cached_for_today(key, compute, cache=None):
+    """
+    get_or_compute 와 같되 오늘 날짜별로 캐시하고 다음 자정에 만료합니다.
+    """
+    now = timezone.localtime()
+    return get_or_compute(
+        f"{key}:{now.date().isoformat()}", compute, seconds_until_tomorrow(now), cache=cache
+    )
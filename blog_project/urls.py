@@ -1,26 +1,29 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
 from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
 from rest_framework.documentation import include_docs_urls
+from blog_project.media import serve_media
+from blog_project.instrumentation import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/metrics/", metrics_view, name="metrics"),
     path("api/", include("book.urls")),
     path("api/", include("study.urls")),
     path("api/", include("lab.urls")),
     path("api/", include("people.urls")),
     path("api/", include("user.urls")),
+    path("api/", include("outbox.urls")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger-ui/",
@@ -39,4 +42,10 @@ urlpatterns = [
     path(
         "api/docs/", include_docs_urls(title="API Documentation")
     ),  # API 문서화 추가 (선택사항)
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # 미디어 파일 (DEBUG 와 무관, 전송 방식은 MEDIA_DELIVERY)
+    re_path(
+        r"^%s(?P<path>.*)$" % settings.MEDIA_URL.lstrip("/"),
+        serve_media,
+        name="media",
+    ),
+]
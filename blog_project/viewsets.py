@@ -0,0 +1,19 @@
+from rest_framework import viewsets
+from .conditional import ConditionalRequestMixin
+from .fieldsets import ColumnPruningMixin, SparseFieldsetViewMixin
+from .instrumentation import InstrumentedViewMixin
+from .log import AccessLogMixin
+
+
+class BaseModelViewSet(
+    AccessLogMixin,
+    InstrumentedViewMixin,
+    ConditionalRequestMixin,
+    SparseFieldsetViewMixin,
+    ColumnPruningMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    프로젝트 공통 ModelViewSet. 접근 로그, 요청 단위 성능 계측, ETag/조건부 요청,
+    ?fields=/?expand= 필드 선택, 목록 조회 시 컬럼 가지치기를 포함합니다.
+    """
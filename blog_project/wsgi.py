@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
 
 application = get_wsgi_application()
+
+# 별도 스케줄러 프로세스 없이 실험 상태 자동 전이를 실행
+from django.conf import settings  # noqa: E402
+
+if settings.LIFECYCLE_SCHEDULER_THREAD:
+    from lab.lifecycle import ExperimentLifecycle
+
+    ExperimentLifecycle().start()
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.http import HttpResponse
 from django.utils import timezone
-from .models import Author, Book
+from .models import Author, Book, recount_author_books
 import csv
 
 class BookInline(admin.TabularInline):
@@ -18,7 +18,8 @@ class AuthorAdmin(admin.ModelAdmin):
 
     # 소프트 삭제 액션
     def soft_delete(self, request, queryset):
-        queryset.update(deleted=True, deleted_at=timezone.now())
+        now = timezone.now()
+        queryset.update(deleted=True, deleted_at=now, updated_at=now)
     soft_delete.short_description = "Soft delete selected authors"
 
     # 하드 삭제 액션
@@ -28,7 +29,7 @@ class AuthorAdmin(admin.ModelAdmin):
 
     # 삭제 취소 액션
     def undelete(self, request, queryset):
-        queryset.update(deleted=False, deleted_at=None)
+        queryset.update(deleted=False, deleted_at=None, updated_at=timezone.now())
     undelete.short_description = "Undelete selected authors"
 
     # CSV 내보내기 액션
@@ -55,9 +56,12 @@ class BookAdmin(admin.ModelAdmin):
     date_hierarchy = 'publication_date'
     actions = ['soft_delete', 'hard_delete', 'undelete', 'export_as_csv', 'duplicate_books']
 
-    # 소프트 삭제 액션
+    # 소프트 삭제 액션 (update() 는 save() 를 거치지 않으므로 저자의 책 수를 다시 셈)
     def soft_delete(self, request, queryset):
-        queryset.update(deleted=True, deleted_at=timezone.now())
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        now = timezone.now()
+        queryset.update(deleted=True, deleted_at=now, updated_at=now)
+        recount_author_books(author_ids)
     soft_delete.short_description = "Soft delete selected books"
 
     # 하드 삭제 액션
@@ -67,7 +71,9 @@ class BookAdmin(admin.ModelAdmin):
 
     # 삭제 취소 액션
     def undelete(self, request, queryset):
-        queryset.update(deleted=False, deleted_at=None)
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        queryset.update(deleted=False, deleted_at=None, updated_at=timezone.now())
+        recount_author_books(author_ids)
     undelete.short_description = "Undelete selected books"
 
     # CSV 내보내기 액션
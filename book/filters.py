@@ -1,15 +1,56 @@
+import datetime
+
 import django_filters
+from django import forms
+from django_filters.constants import EMPTY_VALUES
 from .models import Book, Author
-from django.db.models import Count
+
+
+class YearFilter(django_filters.Filter):
+    """
+    field__year=Y 대신 [Y-01-01, Y+1-01-01) 범위로 걸러 컬럼 인덱스를 그대로 씁니다.
+    연도는 정수로 검증합니다 (범위를 벗어나면 400).
+    """
+    field_class = forms.IntegerField
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('min_value', datetime.MINYEAR)
+        kwargs.setdefault('max_value', datetime.MAXYEAR - 1)
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return self.get_method(qs)(**{
+            f'{self.field_name}__gte': datetime.date(value, 1, 1),
+            f'{self.field_name}__lt': datetime.date(value + 1, 1, 1),
+        })
+
+
+class BookFilterForm(forms.Form):
+    def clean(self):
+        cleaned_data = super().clean()
+        low, high = cleaned_data.get('min_price'), cleaned_data.get('max_price')
+        if low is not None and high is not None and low > high:
+            raise forms.ValidationError(
+                {'max_price': 'max_price must be greater than or equal to min_price'}
+            )
+        return cleaned_data
+
 
 class BookFilter(django_filters.FilterSet):
+    """
+    목록과 by_price_range 액션이 함께 사용합니다. 가격/출판일 조건은 모두 컬럼 범위
+    비교이므로 book_price_idx, book_pubdate_idx 인덱스를 탑니다.
+    """
     min_price = django_filters.NumberFilter(field_name="price", lookup_expr='gte')
     max_price = django_filters.NumberFilter(field_name="price", lookup_expr='lte')
-    publication_year = django_filters.NumberFilter(field_name="publication_date", lookup_expr='year')
-    
+    publication_year = YearFilter(field_name="publication_date")
+
     class Meta:
         model = Book
         fields = ['author', 'publication_year', 'min_price', 'max_price']
+        form = BookFilterForm
 
 class AuthorFilter(django_filters.FilterSet):
     min_books = django_filters.NumberFilter(method='filter_min_books')
@@ -18,5 +59,6 @@ class AuthorFilter(django_filters.FilterSet):
         model = Author
         fields = ['name']
     
+    # Author.book_count 인덱스 범위 조회
     def filter_min_books(self, queryset, name, value):
-        return queryset.annotate(book_count=Count('books')).filter(book_count__gte=value)
+        return queryset.filter(book_count__gte=value)
@@ -0,0 +1,157 @@
+"""
+장르 조회와 Book.genres 일괄 저장.
+
+Genre 는 작고 거의 바뀌지 않는 테이블이므로 id <-> 이름 매핑을 프로세스 메모리에
+보관합니다(genre_registry). Genre 가 저장/삭제되면 캐시의 "genres" 세대가 바뀌고,
+각 프로세스는 다음 조회 때 세대를 비교해 다시 읽습니다. 책의 through 행에서 아직 모르는
+id 를 만나면 한 번 다시 읽지만, 클라이언트가 보낸 모르는 이름은 세대가 그대로면 다시
+읽지 않고 None 입니다 (잘못된 이름을 반복해 보내도 테이블을 매번 읽지 않도록).
+
+BookSerializer 는 장르를 through 테이블의 (book_id, genre_id) 로만 읽고(페이지당 쿼리 1개)
+이름은 레지스트리에서 채웁니다.
+"""
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from blog_project.cache import bump_generation, generation
+
+from .models import BOOK_CACHE_NAMESPACE, GENRE_CACHE_NAMESPACE, Book, Genre
+
+BookGenre = Book.genres.through
+
+
+class GenreRegistry:
+    def __init__(self):
+        self._version = None
+        self._names = {}
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def load(self, version=None):
+        version = generation(GENRE_CACHE_NAMESPACE) if version is None else version
+        names = dict(Genre.objects.values_list("id", "name"))
+        with self._lock:
+            self._names = names
+            self._ids = {name: pk for pk, name in names.items()}
+            self._version = version
+        return names
+
+    def names(self):
+        """
+        {id: 이름}. 세대가 바뀌었으면 다시 읽습니다.
+        """
+        version = generation(GENRE_CACHE_NAMESPACE)
+        if version != self._version:
+            return self.load(version)
+        return self._names
+
+    def names_for(self, ids):
+        names = self.names()
+        if any(pk not in names for pk in ids):
+            names = self.load()
+        return names
+
+    def id_for(self, name):
+        """
+        이름에 해당하는 id, 없으면 None. 세대가 바뀌었을 때만 다시 읽습니다.
+        """
+        self.names()
+        return self._ids.get(name)
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._names = {}
+            self._ids = {}
+
+
+genre_registry = GenreRegistry()
+
+
+def genre_ids_by_book(book_ids):
+    """
+    {book_id: [genre_id, ...]} 를 through 테이블 쿼리 한 번으로 읽습니다.
+    """
+    result = defaultdict(list)
+    rows = (
+        BookGenre.objects.filter(book_id__in=book_ids)
+        .order_by("book_id", "genre_id")
+        .values_list("book_id", "genre_id")
+    )
+    for book_id, genre_id in rows:
+        result[book_id].append(genre_id)
+    return result
+
+
+def attach_genre_ids(books):
+    """
+    책 목록에 _genre_ids 를 채웁니다. 이미 장르를 prefetch 한 책은 건너뜁니다.
+    """
+    missing = [
+        book
+        for book in books
+        if "genres" not in getattr(book, "_prefetched_objects_cache", {})
+        and not hasattr(book, "_genre_ids")
+    ]
+    if not missing:
+        return
+    ids = genre_ids_by_book([book.pk for book in missing])
+    for book in missing:
+        book._genre_ids = ids.get(book.pk, [])
+
+
+def genre_ids_for(book):
+    prefetched = getattr(book, "_prefetched_objects_cache", {}).get("genres")
+    if prefetched is not None:
+        return sorted(genre.pk for genre in prefetched)
+    if not hasattr(book, "_genre_ids"):
+        attach_genre_ids([book])
+    return book._genre_ids
+
+
+def bulk_set_genres(assignments, batch_size=1000):
+    """
+    임포트용 Book.genres.set() 일괄 버전. assignments 는 {book_id: [장르 id 또는 이름]}.
+
+    기존 through 행을 한 번에 읽어 차이만 bulk_create/delete 합니다. m2m_changed 시그널은
+    보내지 않는 대신 바뀐 책의 updated_at 과 책 캐시 세대를 한 번만 갱신합니다.
+    바뀐 책 수를 반환합니다.
+    """
+    wanted = {}
+    for book_id, genres in assignments.items():
+        ids = set()
+        for genre in genres:
+            genre_id = genre_registry.id_for(genre) if isinstance(genre, str) else genre
+            if genre_id is None:
+                raise Genre.DoesNotExist(f"Unknown genre: {genre}")
+            ids.add(genre_id)
+        wanted[book_id] = ids
+
+    with transaction.atomic():
+        rows = BookGenre.objects.filter(book_id__in=list(wanted)).values_list(
+            "id", "book_id", "genre_id"
+        )
+        existing = defaultdict(dict)
+        for row_id, book_id, genre_id in rows:
+            existing[book_id][genre_id] = row_id
+        to_create, to_delete, changed = [], [], set()
+        for book_id, ids in wanted.items():
+            current = existing.get(book_id, {})
+            to_create.extend(
+                BookGenre(book_id=book_id, genre_id=genre_id) for genre_id in ids - current.keys()
+            )
+            to_delete.extend(row_id for genre_id, row_id in current.items() if genre_id not in ids)
+            if ids != current.keys():
+                changed.add(book_id)
+        BookGenre.objects.bulk_create(to_create, batch_size=batch_size, ignore_conflicts=True)
+        for start in range(0, len(to_delete), batch_size):
+            BookGenre.objects.filter(id__in=to_delete[start:start + batch_size]).delete()
+        if changed:
+            # 상세 ETag 가 바뀌도록 (blog_project.conditional)
+            Book.objects.filter(pk__in=changed).update(updated_at=timezone.now())
+    if changed:
+        bump_generation(BOOK_CACHE_NAMESPACE)
+    return len(changed)
@@ -0,0 +1,71 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_project.compression import available_codecs, is_compressible, precompress_file
+
+COMPRESSED_SUFFIXES = (".gz", ".br", ".zst", ".tmp")
+
+
+class Command(BaseCommand):
+    help = (
+        "STATIC_ROOT/MEDIA_ROOT 의 파일 옆에 .br/.zst/.gz 를 미리 만들어 런타임 압축을 없앱니다. "
+        "collectstatic 다음에 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            default=[],
+            help="압축할 디렉터리 (기본: STATIC_ROOT, MEDIA_ROOT, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--include-binary",
+            action="store_true",
+            help="텍스트가 아닌 파일(이미지, PDF 등)도 시도 (충분히 작아질 때만 저장)",
+        )
+        parser.add_argument(
+            "--min-ratio",
+            type=float,
+            default=0.95,
+            help="압축 결과가 원본의 이 비율 이하일 때만 저장",
+        )
+
+    def handle(self, *args, **options):
+        roots = options["path"] or [
+            root for root in (settings.STATIC_ROOT, settings.MEDIA_ROOT) if root
+        ]
+        missing = [root for root in options["path"] if not os.path.isdir(root)]
+        if missing:
+            raise CommandError(f"디렉터리가 없습니다: {', '.join(missing)}")
+        codecs = available_codecs()
+        self.stdout.write(f"codecs: {', '.join(codec.name for codec in codecs)}")
+
+        scanned = [0, 0]
+        written = {codec.name: [0, 0] for codec in codecs}
+        for path in self.files(roots, options["include_binary"]):
+            scanned[0] += 1
+            scanned[1] += os.path.getsize(path)
+            for name, result in precompress_file(path, codecs, options["min_ratio"]):
+                if isinstance(result, int):
+                    written[name][0] += 1
+                    written[name][1] += result
+        self.stdout.write(f"scanned: {scanned[0]} files, {scanned[1]} bytes")
+        for name, (count, size) in written.items():
+            self.stdout.write(f"{name}: {count} files written, {size} bytes")
+        self.stdout.write(self.style.SUCCESS("done"))
+
+    def files(self, roots, include_binary):
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            for dirpath, _, filenames in os.walk(root):
+                for filename in sorted(filenames):
+                    if filename.endswith(COMPRESSED_SUFFIXES):
+                        continue
+                    content_type, _ = mimetypes.guess_type(filename)
+                    if include_binary or is_compressible(content_type):
+                        yield os.path.join(dirpath, filename)
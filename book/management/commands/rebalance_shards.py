@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_project.sharding import move_bucket, plan_rebalance, shard_map
+
+
+class Command(BaseCommand):
+    help = "버킷 -> 샤드 배치를 SHARDS 에 고르게 맞추고 옮겨야 할 행을 이동합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--drain",
+            action="append",
+            default=[],
+            help="모든 버킷을 옮겨 비울 샤드 별칭 (설정에서 제거하기 전에 사용, 여러 번 지정 가능)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="옮길 버킷만 출력")
+
+    def handle(self, *args, **options):
+        if not settings.SHARDS:
+            raise CommandError("DATABASE_SHARDS 가 설정되어 있지 않습니다.")
+        unknown = set(options["drain"]) - set(settings.SHARDS)
+        if unknown:
+            raise CommandError(f"알 수 없는 샤드: {', '.join(sorted(unknown))}")
+        targets = [alias for alias in settings.SHARDS if alias not in options["drain"]]
+        if not targets:
+            raise CommandError("남는 샤드가 없습니다.")
+
+        moves = plan_rebalance(shard_map.load(), targets)
+        if not moves:
+            self.stdout.write("이미 고르게 배치되어 있습니다.")
+            return
+        for bucket, source, target in moves:
+            if options["dry_run"]:
+                self.stdout.write(f"bucket {bucket}: {source} -> {target}")
+                continue
+            moved = move_bucket(bucket, source, target, options["batch_size"])
+            self.stdout.write(f"bucket {bucket}: {source} -> {target} ({moved} rows)")
+        if not options["dry_run"]:
+            shard_map.reset()
+            self.stdout.write(self.style.SUCCESS(f"{len(moves)} buckets moved."))
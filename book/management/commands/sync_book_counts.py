@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from book.models import recount_author_books
+
+
+class Command(BaseCommand):
+    help = (
+        "Author.book_count 를 실제 (삭제되지 않은) 책 수로 다시 맞춥니다. "
+        "queryset.update() 나 직접 넣은 데이터처럼 save() 를 거치지 않은 변경을 바로잡습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        fixed = recount_author_books(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"{fixed} authors fixed."))
@@ -0,0 +1,54 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+
+class Command(BaseCommand):
+    help = (
+        "모델의 컬럼과 Meta.indexes 중 DB 에 없는 것을 만듭니다. 앱에 마이그레이션이 없어 "
+        "migrate --run-syncdb 가 기존 테이블에는 컬럼/인덱스를 추가하지 않기 때문입니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--dry-run", action="store_true", help="만들 컬럼/인덱스만 출력")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        tables = set(connection.introspection.table_names())
+        created = 0
+        for model in apps.get_models():
+            table = model._meta.db_table
+            if (
+                table not in tables
+                or not model._meta.managed
+                or not router.allow_migrate_model(connection.alias, model)
+            ):
+                continue
+            with connection.cursor() as cursor:
+                columns = {
+                    column.name
+                    for column in connection.introspection.get_table_description(cursor, table)
+                }
+                existing = set(connection.introspection.get_constraints(cursor, table))
+            for field in model._meta.local_concrete_fields:
+                if field.column in columns:
+                    continue
+                self.stdout.write(f"{table}: column {field.column}")
+                if not options["dry_run"]:
+                    with connection.schema_editor() as editor:
+                        editor.add_field(model, field)
+                created += 1
+            if not options["dry_run"]:
+                # SQLite 는 컬럼을 추가할 때 테이블을 다시 만들며 Meta.indexes 도 함께 만듭니다.
+                with connection.cursor() as cursor:
+                    existing = set(connection.introspection.get_constraints(cursor, table))
+            for index in model._meta.indexes:
+                if index.name in existing:
+                    continue
+                self.stdout.write(f"{table}: {index.name} ({', '.join(index.fields)})")
+                if not options["dry_run"]:
+                    with connection.schema_editor() as editor:
+                        editor.add_index(model, index)
+                created += 1
+        self.stdout.write(self.style.SUCCESS(f"{created} changes {'missing' if options['dry_run'] else 'applied'}."))
@@ -0,0 +1,52 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from blog_project.cache import bump_generation
+from book.models import BOOK_CACHE_NAMESPACE, Genre
+from book.views import BookViewSet, cached_book_analysis
+
+
+class Command(BaseCommand):
+    help = (
+        "popular, top_rated, 장르별 목록, 책 분석 결과를 미리 계산해 캐시에 넣습니다. "
+        "배포 직후 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="기존 캐시를 무효화하지 않고 비어 있는 항목만 채움",
+        )
+
+    def handle(self, *args, **options):
+        if not options["keep"]:
+            # 새 코드의 직렬화 결과로 채우도록 이전 세대를 버립니다.
+            bump_generation(BOOK_CACHE_NAMESPACE)
+
+        targets = [("popular", {}), ("top_rated", {})]
+        targets += [
+            ("by_genre", {"genre": name})
+            for name in Genre.objects.order_by("name").values_list("name", flat=True)
+        ]
+        # 실제 요청과 같은 키/직렬화 결과가 되도록 뷰를 그대로 호출합니다.
+        factory = APIRequestFactory()
+        user = get_user_model()(username="cache-warmer", is_staff=True)
+        for action, params in targets:
+            view = BookViewSet.as_view({"get": action}, throttle_classes=[])
+            request = factory.get(f"/api/books/{action}/", params)
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            label = action + "".join(f" {key}={value}" for key, value in params.items())
+            self.stdout.write(
+                f"{label}: {response.status_code} ({(time.perf_counter() - started) * 1000:.1f} ms)"
+            )
+
+        started = time.perf_counter()
+        cached_book_analysis()
+        self.stdout.write(f"analysis: ok ({(time.perf_counter() - started) * 1000:.1f} ms)")
+        self.stdout.write(self.style.SUCCESS(f"{len(targets) + 1} entries warmed."))
@@ -1,13 +1,23 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.text import slugify
 from django.utils import timezone
 from .validators import validate_future_date, validate_isbn, title_validator, price_validator, rating_validator, YearValidator
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
+import io
 import os
 from datetime import date
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from blog_project.cache import bump_generation
+from blog_project.media import hashed_name, is_hashed
+from blog_project.sharding import ShardedManager, ShardedQuerySet
+from outbox.capture import ChangeTrackingManager, ChangeTrackingMixin, ChangeTrackingQuerySet
 
 User = get_user_model()
 
@@ -23,7 +33,12 @@ def validate_file_size(value):
 def image_upload_path(instance, filename):
     return f'img/{date.today().strftime("%Y/%m/%d")}/{filename}'
 
-class SoftDeleteManager(models.Manager):
+COVER_DIR = 'img/covers'
+
+# from_db 때 author_id/deleted 를 읽지 않아(only/defer) 저장 전 상태를 모르는 경우
+DEFERRED_COUNT = object()
+
+class SoftDeleteManager(ChangeTrackingManager):
     # 삭제되지 않은 객체만 반환하는 커스텀 매니저
     def get_queryset(self):
         return super().get_queryset().filter(deleted=False)
@@ -54,24 +69,68 @@ class BaseModel(models.Model):
         self.deleted_at = timezone.now()
         self.save()
 
+    # 소프트 삭제 취소
+    def restore(self):
+        self.deleted = False
+        self.deleted_at = None
+        self.save()
+
     # 실제 데이터베이스에서 삭제
     def hard_delete(self):
         super().delete()
 
-class Author(BaseModel):
+class Author(ChangeTrackingMixin, BaseModel):
     name = models.CharField(max_length=100)
     bio = models.TextField(blank=True)
+    # 삭제되지 않은 책 수. Book 저장/삭제 때 갱신하고 sync_book_counts 로 다시 맞춥니다.
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # "책 N 권 이상" 조회(prolific, AuthorFilter.min_books)
+            models.Index(fields=['book_count'], name='author_book_count_idx'),
+            # 증분 동기화의 (updated_at, pk) 범위 조회 (blog_project.sync)
+            models.Index(fields=['updated_at', 'id'], name='author_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
-class Genre(models.Model):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        loaded = getattr(self, '_loaded_name', None)
+        if loaded is not None and loaded != self.name:
+            # 책 응답에 저자 이름이 들어가므로 증분 동기화가 그 책들을 다시 보내도록
+            # 변경 이벤트도 남도록 추적 QuerySet 으로 (outbox)
+            Book.objects.db_manager(self._state.db).all_with_deleted().filter(author=self).update(
+                updated_at=timezone.now()
+            )
+        self._loaded_name = self.name
+
+def add_book_count(author_id, delta, using=None):
+    if author_id is None or not delta:
+        return
+    authors = Author.objects.db_manager(using).all_with_deleted().filter(pk=author_id)
+    if delta < 0:
+        authors = authors.filter(book_count__gte=-delta)
+    # 응답의 books_count 가 바뀌므로 ETag(blog_project.conditional) 도 바뀌도록
+    authors.update(book_count=F('book_count') + delta, updated_at=timezone.now())
+
+class Genre(ChangeTrackingMixin, models.Model):
     name = models.CharField(max_length=100, unique=True)
 
+    objects = ChangeTrackingManager()
+
     def __str__(self):
         return self.name
 
-class Book(BaseModel):
+class Book(ChangeTrackingMixin, BaseModel):
     title = models.CharField(max_length=100, validators=[title_validator])
     slug = models.SlugField(unique=True, blank=True)  # URL에 사용될 슬러그
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
@@ -90,23 +149,88 @@ class Book(BaseModel):
         ordering = ['-publication_date']  # 출판일 기준 내림차순 정렬
         verbose_name = 'Book'
         verbose_name_plural = 'Books'
+        indexes = [
+            # 가격/출판 연도 범위 필터(BookFilter)와 기본 정렬
+            models.Index(fields=['price'], name='book_price_idx'),
+            models.Index(fields=['publication_date'], name='book_pubdate_idx'),
+            # 삭제되지 않은 최근 출판 책 (recent, 분석의 recent_books). deleted=False 는
+            # SQLite 에서 NOT deleted 로 컴파일되므로 복합 인덱스 대신 부분 인덱스로 둡니다.
+            models.Index(
+                fields=['publication_date'],
+                name='book_live_pubdate_idx',
+                condition=models.Q(deleted=False),
+            ),
+            # 증분 동기화의 (updated_at, pk) 범위 조회 (blog_project.sync)
+            models.Index(fields=['updated_at', 'id'], name='book_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted_author_id = instance._loaded_counted_author_id()
+        return instance
+
+    # 이 책이 세어지는 저자 id (삭제된 책이면 None)
+    def counted_author_id(self):
+        return None if self.deleted else self.author_id
+
+    def _loaded_counted_author_id(self):
+        if 'deleted' in self.__dict__ and 'author_id' in self.__dict__:
+            return self.counted_author_id()
+        return DEFERRED_COUNT
+
     # 저장 시 자동으로 슬러그 생성
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-        if self.cover_image:
-            img = Image.open(self.cover_image.path)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {'deleted', 'author', 'author_id'} & set(update_fields):
+            super().save(*args, **kwargs)
+        else:
+            # 생성/소프트 삭제/복구/저자 변경에 맞춰 Author.book_count 를 함께 갱신
+            using = kwargs.get('using') or router.db_for_write(Book, instance=self)
+            with transaction.atomic(using=using):
+                previous = None if self._state.adding else getattr(self, '_counted_author_id', DEFERRED_COUNT)
+                if previous is DEFERRED_COUNT:
+                    row = Book._base_manager.using(using).filter(pk=self.pk).values_list('author_id', 'deleted').first()
+                    previous = None if row is None or row[1] else row[0]
+                super().save(*args, **kwargs)
+                current = self.counted_author_id()
+                if previous != current:
+                    add_book_count(previous, -1, using)
+                    add_book_count(current, 1, using)
+                self._counted_author_id = current
+        if self.cover_image and not self.has_processed_cover:
+            self.process_cover_image()
+            # 원본 파일은 django_cleanup 이 정리
+            super().save(update_fields=['cover_image', 'updated_at'], using=kwargs.get('using'))
+
+    @property
+    def has_processed_cover(self):
+        name = self.cover_image.name
+        return name.startswith(COVER_DIR + '/') and is_hashed(name)
+
+    # 표지를 한 번만 500x500 이하 PNG 로 변환해 내용 해시가 들어간 이름으로 저장합니다.
+    # 이름이 내용과 함께 바뀌므로 blog_project.media 가 immutable 로 캐시시킬 수 있습니다.
+    def process_cover_image(self):
+        storage = self.cover_image.storage
+        with self.cover_image.open('rb') as handle:
+            img = Image.open(handle)
+            fmt = img.format
             if img.height > 500 or img.width > 500:
-                output_size = (500, 500)
-                img.thumbnail(output_size)
-            if img.format != 'PNG':
+                img.thumbnail((500, 500))
+            if fmt != 'PNG':
                 img = img.convert('RGB')
-            img.save(self.cover_image.path, 'PNG')
+            buffer = io.BytesIO()
+            img.save(buffer, 'PNG', optimize=True)
+        content = buffer.getvalue()
+        name = hashed_name(f'{COVER_DIR}/{self.pk}.png', content)
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(content))
+        self.cover_image.name = name
 
     # 새 출시 여부 확인 (30일 이내)
     @property
@@ -118,19 +242,116 @@ class Book(BaseModel):
     def author_name(self):
         return self.author.name
 
+def recount_author_books(author_ids=None, using=None):
+    """
+    Author.book_count 를 실제 (삭제되지 않은) 책 수로 맞추고 고친 저자 수를 반환합니다.
+    queryset.update() 나 직접 넣은 행처럼 save() 를 거치지 않은 변경을 바로잡습니다.
+    """
+    actual = Coalesce(
+        Subquery(
+            Book.objects.filter(author=OuterRef('pk'))
+            .order_by()
+            .values('author')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0,
+    )
+    authors = Author.objects.db_manager(using).all_with_deleted()
+    if author_ids is not None:
+        authors = authors.filter(pk__in=author_ids)
+    return authors.exclude(book_count=actual).update(book_count=actual, updated_at=timezone.now())
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     favorite_genres = models.ManyToManyField(Genre, related_name='users')
     read_books = models.ManyToManyField(Book, related_name='readers', through='ReadingHistory')
 
-class ReadingHistory(models.Model):
-    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
-    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+# 샤드를 고른 뒤(ShardedQuerySet) 그 샤드에 변경 이벤트를 남깁니다.
+class ChangeTrackingShardedQuerySet(ShardedQuerySet, ChangeTrackingQuerySet):
+    pass
+
+ChangeTrackingShardedManager = models.Manager.from_queryset(ChangeTrackingShardedQuerySet)
+
+# 사용자 단위로 샤딩되는 모델 (blog_project.sharding).
+# user/book 은 다른 DB 에 있을 수 있으므로 FK 제약을 두지 않고 삭제는 시그널로 정리합니다.
+class ReadingHistory(ChangeTrackingMixin, models.Model):
+    user = models.ForeignKey(UserProfile, on_delete=models.DO_NOTHING, db_constraint=False)
+    book = models.ForeignKey(Book, on_delete=models.DO_NOTHING, db_constraint=False)
     date_read = models.DateField()
     rating = models.IntegerField(choices=[(i, i) for i in range(1, 6)])
 
+    shard_key = 'user_id'
+    objects = ChangeTrackingShardedManager()
+
 class BookRecommendation(models.Model):
-    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='recommendations')
-    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    user = models.ForeignKey(UserProfile, on_delete=models.DO_NOTHING, db_constraint=False, related_name='recommendations')
+    book = models.ForeignKey(Book, on_delete=models.DO_NOTHING, db_constraint=False)
     score = models.FloatField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    shard_key = 'user_id'
+    objects = ShardedManager()
+
+SHARDED_MODELS = (ReadingHistory, BookRecommendation)
+
+# 삭제된 사용자 프로필의 샤드 행 정리
+@receiver(pre_delete, sender=UserProfile)
+def delete_user_shard_rows(sender, instance, **kwargs):
+    for model in SHARDED_MODELS:
+        model.objects.for_user(instance).delete()
+
+# 실제 삭제(hard_delete)된 책을 참조하는 행을 모든 샤드에서 정리
+@receiver(pre_delete, sender=Book)
+def delete_book_shard_rows(sender, instance, **kwargs):
+    for model in SHARDED_MODELS:
+        model.objects.fan_out(lambda queryset: queryset.filter(book=instance).delete())
+
+# 실제 삭제된 책을 저자의 책 수에서 뺌 (저자 삭제로 함께 지워진 경우 포함)
+@receiver(post_delete, sender=Book)
+def decrement_author_book_count(sender, instance, using, **kwargs):
+    counted = getattr(instance, '_counted_author_id', DEFERRED_COUNT)
+    if counted is DEFERRED_COUNT:
+        counted = instance.counted_author_id()
+    add_book_count(counted, -1, using)
+
+# 책 목록 캐시(popular, top_rated, by_genre, 분석) 무효화
+BOOK_CACHE_NAMESPACE = 'books'
+# 장르 레지스트리(book/genres.py) 무효화
+GENRE_CACHE_NAMESPACE = 'genres'
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre_registry(sender, **kwargs):
+    bump_generation(GENRE_CACHE_NAMESPACE)
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Genre)
+@receiver(m2m_changed, sender=Book.genres.through)
+def invalidate_book_caches(sender, **kwargs):
+    bump_generation(BOOK_CACHE_NAMESPACE)
+    # 같은 인스턴스를 다시 직렬화할 때 이전 장르 id(book/genres.py)를 쓰지 않도록
+    instance = kwargs.get('instance')
+    if sender is Book.genres.through and isinstance(instance, Book):
+        instance.__dict__.pop('_genre_ids', None)
+
+# 장르가 바뀐 책의 updated_at 갱신 (상세 ETag, 증분 동기화, 변경 이벤트)
+@receiver(m2m_changed, sender=Book.genres.through)
+def touch_books_on_genre_change(sender, instance, action, reverse, pk_set, using, **kwargs):
+    manager = Book.objects.db_manager(using).all_with_deleted()
+    if action in ('post_add', 'post_remove') and pk_set:
+        books = manager.filter(pk__in=pk_set) if reverse else manager.filter(pk=instance.pk)
+    elif action == 'post_clear' and not reverse:
+        books = manager.filter(pk=instance.pk)
+    elif action == 'pre_clear' and reverse:
+        books = manager.filter(genres=instance)
+    else:
+        return
+    now = timezone.now()
+    books.update(updated_at=now)
+    if not reverse:
+        instance.updated_at = now
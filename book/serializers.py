@@ -1,37 +1,32 @@
 from rest_framework import serializers
+from django.db.models import Avg
+from drf_spectacular.utils import extend_schema_field
+from blog_project.fieldsets import SparseFieldsetMixin
+from user.serializers import CustomUserSerializer
+from .genres import attach_genre_ids, genre_ids_for, genre_registry
 from .models import Book, Author, Genre, UserProfile, ReadingHistory, BookRecommendation
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Author 모델을 위한 ModelSerializer
+    context 의 fields 로 필드를 제한할 수 있습니다 (SparseFieldsetMixin).
     """
-    books_count = serializers.SerializerMethodField()
+    books_count = serializers.IntegerField(source='book_count', read_only=True)
     average_book_rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
         fields = ['id', 'name', 'bio', 'created_at', 'updated_at', 'deleted', 'books_count', 'average_book_rating']
         read_only_fields = ['created_at', 'updated_at', 'deleted']
-
-    def get_books_count(self, obj):
-        return obj.books.count()
+        # 메서드 필드가 읽는 컬럼 (목록 조회 시 컬럼 가지치기에 사용)
+        method_field_columns = {'average_book_rating': []}
 
     def get_average_book_rating(self, obj):
+        # 목록 뷰가 미리 계산해 둔 값 (AuthorViewSet.prolific)
+        if hasattr(obj, 'book_rating_avg'):
+            return obj.book_rating_avg
         return obj.books.aggregate(Avg('rating'))['rating__avg']
 
-    def __init__(self, *args, **kwargs):
-        """
-        초기화 메서드: fields 매개변수를 통해 필드를 동적으로 제한할 수 있습니다.
-        """
-        super(AuthorSerializer, self).__init__(*args, **kwargs)
-
-        fields = self.context.get('fields')
-        if fields:
-            allowed = set(fields)
-            existing = set(self.fields)
-            for field_name in existing - allowed:
-                self.fields.pop(field_name)
-
     def validate_name(self, value):
         """
         name 필드에 대한 사용자 정의 유효성 검사
@@ -55,52 +50,98 @@ class AuthorSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ['id', 'name']
 
-class BookSerializer(serializers.ModelSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
+@extend_schema_field(GenreSerializer(many=True))
+class BookGenresField(serializers.Field):
+    """
+    GenreSerializer(many=True) 와 같은 [{id, name}] 을 내보내되, 장르는 through 테이블의
+    id 로만 읽고 이름은 genre_registry 에서 채웁니다.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return genre_ids_for(instance)
+
+    def to_representation(self, ids):
+        names = genre_registry.names_for(ids)
+        return [{'id': pk, 'name': names.get(pk)} for pk in ids]
+
+class BookListSerializer(serializers.ListSerializer):
+    """
+    목록의 장르 id 를 through 테이블 쿼리 한 번으로 읽어 둡니다.
+    """
+
+    def to_representation(self, data):
+        books = data.all() if hasattr(data, 'all') else data
+        if 'genres' in self.child.fields:
+            books = list(books)
+            attach_genre_ids(books)
+        return super().to_representation(books)
+
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    genres = BookGenresField()
     author = serializers.StringRelatedField()
 
     class Meta:
         model = Book
         fields = ['id', 'title', 'author', 'genres', 'publication_date', 'isbn', 'price', 'average_rating']
+        list_serializer_class = BookListSerializer
+        # ?expand=author 로 저자 이름 대신 저자 객체를 반환
+        expandable_fields = {'author': AuthorSerializer}
 
-class ReadingHistorySerializer(serializers.ModelSerializer):
+class ReadingHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     book = BookSerializer()
 
     class Meta:
         model = ReadingHistory
         fields = ['book', 'date_read', 'rating']
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     favorite_genres = GenreSerializer(many=True)
     reading_history = serializers.SerializerMethodField()
 
     class Meta:
         model = UserProfile
         fields = ['id', 'user', 'favorite_genres', 'reading_history']
+        expandable_fields = {'user': CustomUserSerializer}
 
     def get_reading_history(self, obj):
-        history = ReadingHistory.objects.filter(user=obj).order_by('-date_read')[:10]
+        # 사용자의 샤드에서 읽고, 책 정보는 default 에서 한 번에 불러옵니다.
+        history = list(
+            ReadingHistory.objects.for_user(obj)
+            .prefetch_related('book__author')
+            .order_by('-date_read')[:10]
+        )
+        attach_genre_ids([entry.book for entry in history])
         return ReadingHistorySerializer(history, many=True).data
 
-class BookRecommendationSerializer(serializers.ModelSerializer):
+class BookRecommendationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     book = BookSerializer()
 
     class Meta:
         model = BookRecommendation
         fields = ['book', 'score', 'created_at']
 
-class UserRecommendationsSerializer(serializers.ModelSerializer):
+class UserRecommendationsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     recommendations = serializers.SerializerMethodField()
 
     class Meta:
         model = UserProfile
         fields = ['id', 'user', 'recommendations']
+        expandable_fields = {'user': CustomUserSerializer}
 
     def get_recommendations(self, obj):
-        recommendations = BookRecommendation.objects.filter(user=obj).order_by('-score')[:5]
+        recommendations = list(
+            BookRecommendation.objects.for_user(obj)
+            .prefetch_related('book__author')
+            .order_by('-score')[:5]
+        )
+        attach_genre_ids([recommendation.book for recommendation in recommendations])
         return BookRecommendationSerializer(recommendations, many=True).data
@@ -1,6 +1,6 @@
 import factory
 from faker import Faker
-from book.models import Author, Book
+from book.models import Author, Book, Genre
 from user.models import CustomUser
 
 fake = Faker()
@@ -32,3 +32,9 @@ class BookFactory(factory.django.DjangoModelFactory):
     pages = factory.Faker('random_int', min=50, max=1000)
     rating = factory.Faker('pyfloat', left_digits=1, right_digits=1, min_value=0, max_value=5)
     description = factory.Faker('text')
+
+class GenreFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Genre
+
+    name = factory.Sequence(lambda n: f'Genre {n}')
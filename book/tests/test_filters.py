@@ -0,0 +1,70 @@
+import datetime
+import io
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .factories import BookFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBookRangeFilters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+
+    def test_publication_year_matches_whole_year(self):
+        BookFactory(publication_date=datetime.date(2014, 12, 31))
+        first = BookFactory(publication_date=datetime.date(2015, 1, 1))
+        last = BookFactory(publication_date=datetime.date(2015, 12, 31))
+        BookFactory(publication_date=datetime.date(2016, 1, 1))
+        response = self.client.get(reverse('book-list'), {'publication_year': 2015})
+        assert response.status_code == status.HTTP_200_OK
+        assert {book['id'] for book in response.data['results']} == {first.pk, last.pk}
+
+    @pytest.mark.parametrize('params', [
+        {'publication_year': '99999'},
+        {'publication_year': 'abc'},
+        {'min_price': 'abc'},
+        {'min_price': '20', 'max_price': '10'},
+    ])
+    def test_invalid_params_return_400(self, params):
+        response = self.client.get(reverse('book-list'), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_by_price_range_is_paginated(self):
+        BookFactory(price=10.00)
+        BookFactory(price=11.50)
+        BookFactory(price=30.00)
+        url = reverse('book-by-price-range')
+        response = self.client.get(url, {'min_price': 10, 'max_price': 12})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert len(response.data['results']) == 2
+
+        response = self.client.get(url, {'min_price': 12, 'max_price': 10})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# SQLite 스키마 변경은 트랜잭션 밖에서만 가능합니다.
+@pytest.mark.django_db(transaction=True)
+def test_sync_indexes_creates_missing_columns_and_indexes():
+    from django.db import connection
+
+    from book.models import Author, Book
+
+    index = next(index for index in Book._meta.indexes if index.name == 'book_price_idx')
+    with connection.schema_editor() as editor:
+        editor.remove_index(Book, index)
+        editor.remove_field(Author, Author._meta.get_field('book_count'))
+    out = io.StringIO()
+    call_command('sync_indexes', stdout=out)
+    assert 'book_price_idx' in out.getvalue()
+    assert 'column book_count' in out.getvalue()
+
+    out = io.StringIO()
+    call_command('sync_indexes', '--dry-run', stdout=out)
+    assert '0 changes missing' in out.getvalue()
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from book.genres import bulk_set_genres, genre_registry
+from .factories import UserFactory, BookFactory, GenreFactory
+
+@pytest.mark.django_db
+class TestGenres:
+    def setup_method(self):
+        genre_registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+        self.fantasy = GenreFactory(name='Fantasy')
+        self.poetry = GenreFactory(name='Poetry')
+        self.book = BookFactory()
+        self.book.genres.set([self.fantasy, self.poetry])
+
+    def test_list_reads_genre_ids_once_per_page(self):
+        BookFactory.create_batch(3)[0].genres.set([self.poetry])
+        url = reverse('book-list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        # count, 목록, through 테이블 (장르 이름은 레지스트리)
+        assert len(ctx.captured_queries) == 3
+        book = next(item for item in response.data['results'] if item['id'] == self.book.pk)
+        assert book['genres'] == [
+            {'id': self.fantasy.pk, 'name': 'Fantasy'},
+            {'id': self.poetry.pk, 'name': 'Poetry'},
+        ]
+
+    def test_registry_is_invalidated_on_genre_write(self):
+        assert genre_registry.id_for('Fantasy') == self.fantasy.pk
+        self.fantasy.name = 'Epic Fantasy'
+        self.fantasy.save()
+        assert genre_registry.id_for('Fantasy') is None
+        response = self.client.get(reverse('book-detail', args=[self.book.pk]))
+        assert response.data['genres'][0]['name'] == 'Epic Fantasy'
+
+    def test_unknown_name_does_not_reload_registry(self):
+        genre_registry.load()
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                assert genre_registry.id_for('Unknown') is None
+        assert not any('"book_genre"' in query['sql'] for query in ctx.captured_queries)
+        # 장르가 생기면 세대가 바뀌므로 다음 조회에서 다시 읽습니다.
+        created = GenreFactory(name='Unknown')
+        assert genre_registry.id_for('Unknown') == created.pk
+
+    def test_by_genre_filters_through_table_only(self):
+        genre_registry.load()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('book-by-genre'), {'genre': 'Poetry'})
+        assert [item['id'] for item in response.data] == [self.book.pk]
+        assert not any('"book_genre"' in query['sql'] for query in ctx.captured_queries)
+        assert self.client.get(reverse('book-by-genre'), {'genre': 'Unknown'}).data == []
+
+    def test_bulk_set_genres(self):
+        other = BookFactory()
+        updated_at = self.book.updated_at
+        genre_registry.load()
+        with CaptureQueriesContext(connection) as ctx:
+            changed = bulk_set_genres({
+                self.book.pk: ['Fantasy'],
+                other.pk: [self.fantasy.pk, 'Poetry'],
+            })
+        assert changed == 2
+        # 기존 행 조회, 추가, 삭제, updated_at 갱신(대상 pk 조회, UPDATE, 변경 이벤트) (+ 트랜잭션)
+        assert len([q for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]) == 6
+        assert list(self.book.genres.values_list('name', flat=True)) == ['Fantasy']
+        assert set(other.genres.values_list('name', flat=True)) == {'Fantasy', 'Poetry'}
+        self.book.refresh_from_db()
+        assert self.book.updated_at > updated_at
+        assert bulk_set_genres({self.book.pk: ['Fantasy']}) == 0
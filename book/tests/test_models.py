@@ -1,5 +1,6 @@
 import pytest
 from .factories import AuthorFactory, BookFactory
+from book.models import Author, Book, recount_author_books
 from django.utils import timezone
 
 @pytest.mark.django_db
@@ -13,6 +14,47 @@ class TestAuthorModel:
         author = AuthorFactory()
         assert str(author) == author.name
 
+
+@pytest.mark.django_db
+class TestAuthorBookCount:
+    def count(self, author):
+        return Author.objects.values_list('book_count', flat=True).get(pk=author.pk)
+
+    def test_tracks_create_soft_delete_restore_and_hard_delete(self):
+        author = AuthorFactory()
+        book = BookFactory(author=author)
+        BookFactory(author=author)
+        assert self.count(author) == 2
+
+        book.delete()
+        assert self.count(author) == 1
+        book.delete()  # 이미 삭제된 책은 다시 빼지 않음
+        assert self.count(author) == 1
+        book.restore()
+        assert self.count(author) == 2
+
+        Book.objects.get(pk=book.pk).hard_delete()
+        assert self.count(author) == 1
+        Book.objects.all_with_deleted().filter(author=author).delete()
+        assert self.count(author) == 0
+
+    def test_moving_a_book_moves_the_count(self):
+        old, new = AuthorFactory(), AuthorFactory()
+        book = BookFactory(author=old)
+        book = Book.objects.only('title').get(pk=book.pk)  # author_id 를 읽지 않은 인스턴스
+        book.author = new
+        book.save()
+        assert (self.count(old), self.count(new)) == (0, 1)
+
+    def test_recount_fixes_updates_that_skip_save(self):
+        author = AuthorFactory()
+        BookFactory.create_batch(3, author=author)
+        Book.objects.filter(pk__in=Book.objects.filter(author=author)[:1]).update(deleted=True)
+        assert self.count(author) == 3
+        assert recount_author_books() == 1
+        assert self.count(author) == 2
+        assert recount_author_books() == 0
+
 @pytest.mark.django_db
 class TestBookModel:
     def test_book_creation(self):
@@ -1,10 +1,13 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
-from .factories import UserFactory, AuthorFactory, BookFactory
+from .factories import UserFactory, AuthorFactory, BookFactory, GenreFactory
 from book.models import Book
+from django.db.models import Avg
 
 @pytest.mark.django_db
 class TestBookViews:
@@ -111,3 +114,91 @@ class TestBookViews:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['is_new_release'] == True
 
+
+
+@pytest.mark.django_db
+class TestAuthorBookCountViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+        self.busy, self.quiet = AuthorFactory(), AuthorFactory()
+        BookFactory.create_batch(3, author=self.busy)
+        BookFactory(author=self.quiet)
+        BookFactory(author=self.quiet, deleted=True)
+
+    def test_prolific_counts_only_live_books(self):
+        response = self.client.get(reverse('author-prolific'), {'book_count': 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [author['id'] for author in response.data] == [self.busy.pk]
+        assert response.data[0]['books_count'] == 3
+        expected = Book.objects.filter(author=self.busy).aggregate(Avg('rating'))['rating__avg']
+        assert response.data[0]['average_book_rating'] == pytest.approx(expected)
+
+    def test_prolific_rejects_invalid_book_count(self):
+        response = self.client.get(reverse('author-prolific'), {'book_count': 'many'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'book_count' in response.data
+
+    def test_min_books_filter(self):
+        response = self.client.get(reverse('author-list'), {'min_books': 1})
+        assert {author['id'] for author in response.data['results']} == {self.busy.pk, self.quiet.pk}
+        response = self.client.get(reverse('author-list'), {'min_books': 2})
+        assert [author['id'] for author in response.data['results']] == [self.busy.pk]
+
+
+@pytest.mark.django_db
+class TestSyncViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory())
+
+    def sync(self, name, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(reverse(f'{name}-sync'), params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_book_sync_returns_deltas_and_tombstones(self, monkeypatch):
+        monkeypatch.setattr('blog_project.sync.SETTLE_SECONDS', 0)
+        kept, removed = BookFactory(), BookFactory()
+        BookFactory(deleted=True)
+        first = self.sync('book')
+        assert [book['id'] for book in first['results']] == [kept.pk, removed.pk]
+        assert first['deleted'] == [] and not first['has_more']
+        assert self.sync('book', first['next']) == {
+            'results': [], 'deleted': [], 'next': first['next'], 'has_more': False,
+        }
+
+        removed.delete()
+        kept.title = 'Renamed'
+        kept.save()
+        delta = self.sync('book', first['next'])
+        assert [book['title'] for book in delta['results']] == ['Renamed']
+        assert [tombstone['id'] for tombstone in delta['deleted']] == [removed.pk]
+
+    def test_author_rename_and_genre_change_resync_books(self, monkeypatch):
+        monkeypatch.setattr('blog_project.sync.SETTLE_SECONDS', 0)
+        book = BookFactory()
+        watermark = self.sync('book')['next']
+        book.author.name = 'New Name'
+        book.author.save()
+        assert [row['author'] for row in self.sync('book', watermark)['results']] == ['New Name']
+        watermark = self.sync('book', watermark)['next']
+        book.genres.add(GenreFactory())
+        assert [row['id'] for row in self.sync('book', watermark)['results']] == [book.pk]
+        assert [row['id'] for row in self.sync('author')['results']] == [book.author.pk]
+
+    def test_author_sync_leaves_out_book_rating_average(self, monkeypatch):
+        monkeypatch.setattr('blog_project.sync.SETTLE_SECONDS', 0)
+        book = BookFactory()
+        with CaptureQueriesContext(connection) as ctx:
+            rows = self.sync('author')['results']
+        assert [row['id'] for row in rows] == [book.author.pk]
+        assert 'average_book_rating' not in rows[0] and 'books_count' in rows[0]
+        assert not any('AVG' in query['sql'] for query in ctx.captured_queries)
+
+    def test_invalid_watermark(self):
+        response = self.client.get(reverse('book-sync'), {'since': 'garbage'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'since' in response.data
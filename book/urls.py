@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet, complex_book_analysis
+from .views import BookViewSet, AuthorViewSet, complex_book_analysis
 
 router = DefaultRouter()
 router.register(r'books', BookViewSet)
+router.register(r'authors', AuthorViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
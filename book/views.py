@@ -1,16 +1,11 @@
-import logging
-import datetime
-import asyncio
-from asgiref.sync import sync_to_async
-from rest_framework import viewsets, filters, status
+from rest_framework import filters, serializers, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.permissions import IsAuthenticated, IsAdminUser, BasePermission
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, BasePermission, SAFE_METHODS
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from .models import Book, Author, UserProfile, BookRecommendation
+from .models import Book, Author, UserProfile, BookRecommendation, BOOK_CACHE_NAMESPACE
 from .serializers import (
     BookSerializer,
     AuthorSerializer,
@@ -18,20 +13,26 @@ from .serializers import (
     UserRecommendationsSerializer,
 )
 from .filters import BookFilter, AuthorFilter
-from django.db.models import Count, Avg
+from .genres import genre_registry
+from django.db.models import Avg, OuterRef, Subquery
 from rest_framework.pagination import (
     PageNumberPagination,
     LimitOffsetPagination,
     CursorPagination,
 )
+from blog_project import timewindows
+from blog_project.cache import generation, get_or_compute
 from blog_project.exceptions import CustomAPIException
+from blog_project.sync import SyncViewMixin
+from blog_project.viewsets import BaseModelViewSet
+from blog_project.throttling import UserRateThrottle, AnonRateThrottle
 from django.http import FileResponse, Http404
+from django.utils.http import urlencode
 from django.db import models
-from django.utils import timezone
 from rest_framework.views import APIView
 
-logger = logging.getLogger(__name__)
-
+# recent 와 분석의 "최근 출판" 기간 (일)
+RECENT_DAYS = 30
 
 # 소유자 또는 읽기 전용 권한
 class IsOwnerOrReadOnly(BasePermission):
@@ -60,8 +61,12 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 @extend_schema(tags=["Books"])  # Swagger 문서화를 위한 데코레이터
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+class BookViewSet(SyncViewMixin, BaseModelViewSet):
+    # 직렬화 시 책마다 저자를 조회하지 않도록 미리 로드
+    # (장르는 BookSerializer 가 through 테이블에서 페이지마다 한 번에 읽음)
+    queryset = Book.objects.select_related("author")
+    # 증분 동기화 (?since=), 소프트 삭제된 책은 tombstone 으로
+    sync_queryset = Book.objects.all_with_deleted().select_related("author")
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
@@ -76,6 +81,23 @@ class BookViewSet(viewsets.ModelViewSet):
     pagination_class = StandardResultsSetPagination
     # pagination_class = LimitOffsetPagination
     # pagination_class = CursorPagination
+    # count, 목록, 장르 id + author 필터 검증 또는 장르 레지스트리 갱신
+    query_budget = {"list": 4, "retrieve": 2}
+    # popular/top_rated/by_genre 응답 캐시 시간 (초), 책/저자/장르가 바뀌면 즉시 무효화
+    cache_timeout = 300
+
+    def cache_key(self, exclude=()):
+        params = urlencode(
+            sorted(item for item in self.request.query_params.lists() if item[0] not in exclude),
+            doseq=True,
+        )
+        return f"{BOOK_CACHE_NAMESPACE}:{generation(BOOK_CACHE_NAMESPACE)}:{self.action}:{params}"
+
+    def cached_data(self, compute):
+        """
+        액션과 쿼리 파라미터별로 직렬화 결과를 캐시합니다.
+        """
+        return get_or_compute(self.cache_key(), compute, self.cache_timeout)
 
     # 인기 있는 책 목록 반환
     @extend_schema(
@@ -90,9 +112,6 @@ class BookViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"])
     def popular(self, request):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.popular, URL: {request.get_full_path()}"
-        )
         min_rating = request.query_params.get("min_rating", 4.0)
         try:
             min_rating = float(min_rating)
@@ -101,59 +120,56 @@ class BookViewSet(viewsets.ModelViewSet):
                 {"min_rating": "Must be a valid number"}, code="invalid"
             )
 
-        books = Book.objects.filter(rating__gte=min_rating, deleted=False)
-        if not books.exists():
-            raise NotFound("No books found matching the criteria", code="not_found")
+        def compute():
+            books = self.get_queryset().filter(rating__gte=min_rating)
+            return self.get_serializer(books, many=True).data
 
-        serializer = self.get_serializer(books, many=True)
-        return Response(serializer.data)
+        data = self.cached_data(compute)
+        if not data:
+            raise NotFound("No books found matching the criteria", code="not_found")
+        return Response(data)
 
     # 삭제 시 소프트 삭제 수행
     def perform_destroy(self, instance):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.perform_destroy, URL: {self.request.get_full_path()}"
-        )
         if instance.deleted:
             raise ValidationError(
                 {"detail": "This book is already deleted"}, code="already_deleted"
             )
         instance.delete()  # 소프트 삭제 메서드 호출
 
+    # 최근 RECENT_DAYS 일 안에 출판된 책. 하루 동안 같은 결과이므로 직렬화한 행만 자정까지
+    # 캐시하고, 페이지와 next/previous 링크는 요청의 호스트로 매번 만듭니다.
     @action(detail=False, methods=["get"])
     def recent(self, request):
-        recent_books = Book.objects.filter(
-            publication_date__gte=timezone.now() - datetime.timedelta(days=30)
-        )
-        page = self.paginate_queryset(recent_books)
+        def compute():
+            recent_books = timewindows.recent(
+                self.get_queryset(), "publication_date", RECENT_DAYS
+            )
+            return self.get_serializer(recent_books, many=True).data
+
+        paginator = self.paginator
+        page_params = (paginator.page_query_param, paginator.page_size_query_param) if paginator else ()
+        rows = timewindows.cached_for_today(self.cache_key(exclude=page_params), compute)
+        page = self.paginate_queryset(rows)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(recent_books, many=True)
-        return Response(serializer.data)
+            return self.get_paginated_response(page)
+        return Response(rows)
 
     @action(detail=False, methods=["get"])
     def by_price_range(self, request):
         min_price = request.query_params.get("min_price")
         max_price = request.query_params.get("max_price")
         if min_price and max_price:
-            books = Book.objects.filter(price__gte=min_price, price__lte=max_price)
-            serializer = self.get_serializer(books, many=True)
-            return Response(serializer.data)
+            # 목록과 같은 BookFilter 로 검증/필터링합니다 (잘못된 숫자는 400).
+            books = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(books)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         return Response(
             {"error": "Please provide both min_price and max_price"},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    def partial_update(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.partial_update, URL: {request.get_full_path()}"
-        )
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
-        return Response(serializer.data)
-
     @action(detail=True, methods=["get"])
     def download_attachment(self, request, pk=None):
         book = self.get_object()
@@ -174,17 +190,26 @@ class BookViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def top_rated(self, request):
-        top_books = Book.objects.order_by("-average_rating")[:10]
-        serializer = self.get_serializer(top_books, many=True)
-        return Response(serializer.data)
+        def compute():
+            top_books = self.get_queryset().order_by("-average_rating")[:10]
+            return self.get_serializer(top_books, many=True).data
+
+        return Response(self.cached_data(compute))
 
     @action(detail=False, methods=["get"])
     def by_genre(self, request):
         genre_name = request.query_params.get("genre", None)
         if genre_name:
-            books = Book.objects.filter(genres__name=genre_name)
-            serializer = self.get_serializer(books, many=True)
-            return Response(serializer.data)
+
+            def compute():
+                # 이름은 레지스트리로 id 로 바꾸고 through 테이블만 조인합니다.
+                genre_id = genre_registry.id_for(genre_name)
+                if genre_id is None:
+                    return []
+                books = self.get_queryset().filter(genres=genre_id)
+                return self.get_serializer(books, many=True).data
+
+            return Response(self.cached_data(compute))
         return Response(
             {"error": "Genre parameter is required"}, status=status.HTTP_400_BAD_REQUEST
         )
@@ -243,9 +268,23 @@ class PopularBooksView(APIView):
         return Response(serializer.data)
 
 
+def book_rating_average():
+    """
+    저자별 책 평균 평점 서브쿼리 (AuthorSerializer.average_book_rating 이 그대로 씀).
+    """
+    return Subquery(
+        Book.objects.filter(author=OuterRef("pk"))
+        .order_by()
+        .values("author")
+        .annotate(value=Avg("rating"))
+        .values("value")
+    )
+
+
 @extend_schema(tags=["Authors"])
-class AuthorViewSet(viewsets.ModelViewSet):
+class AuthorViewSet(SyncViewMixin, BaseModelViewSet):
     queryset = Author.objects.all()
+    sync_queryset = Author.objects.all_with_deleted()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticated]
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
@@ -260,44 +299,13 @@ class AuthorViewSet(viewsets.ModelViewSet):
     pagination_class = StandardResultsSetPagination
     # pagination_class = LimitOffsetPagination
     # pagination_class = CursorPagination
-
-    def list(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.list, URL: {request.get_full_path()}"
-        )
-        return super().list(request, *args, **kwargs)
-
-    def create(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.create, URL: {request.get_full_path()}"
-        )
-        return super().create(request, *args, **kwargs)
-
-    def retrieve(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.retrieve, URL: {request.get_full_path()}"
-        )
-        return super().retrieve(request, *args, **kwargs)
-
-    def update(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.update, URL: {request.get_full_path()}"
-        )
-        return super().update(request, *args, **kwargs)
-
-    def destroy(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.destroy, URL: {request.get_full_path()}"
-        )
-        return super().destroy(request, *args, **kwargs)
+    # 책 평점이 바뀌어도 저자의 updated_at 은 그대로이므로 동기화에서는 빼고 보냅니다.
+    sync_exclude_fields = ("average_book_rating",)
 
     # 특정 저자의 책 목록 반환
     @extend_schema(responses=BookSerializer(many=True))
     @action(detail=True, methods=["get"])
     def books(self, request, pk=None):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.books, URL: {request.get_full_path()}"
-        )
         try:
             author = self.get_object()
         except Author.DoesNotExist:
@@ -312,9 +320,6 @@ class AuthorViewSet(viewsets.ModelViewSet):
 
     # 삭제 시 소프트 삭제 수행
     def perform_destroy(self, instance):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.perform_destroy, URL: {self.request.get_full_path()}"
-        )
         if instance.deleted:
             raise ValidationError(
                 {"detail": "This author is already deleted"}, code="already_deleted"
@@ -323,78 +328,67 @@ class AuthorViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def prolific(self, request):
-        book_count = request.query_params.get("book_count", 5)
-        authors = Author.objects.annotate(book_count=Count("books")).filter(
-            book_count__gte=book_count
+        try:
+            book_count = serializers.IntegerField(min_value=0).run_validation(
+                request.query_params.get("book_count", 5)
+            )
+        except ValidationError as exc:
+            raise ValidationError({"book_count": exc.detail})
+        authors = (
+            Author.objects.filter(book_count__gte=book_count)
+            .annotate(book_rating_avg=book_rating_average())
+            .order_by("-book_count", "pk")
         )
         serializer = self.get_serializer(authors, many=True)
         return Response(serializer.data)
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-async def complex_book_analysis(request):
-    """
-    복잡한 비동기 뷰 함수
+# 분석 결과 캐시 시간 (초), 책/저자/장르가 바뀌면 즉시 무효화
+ANALYSIS_CACHE_TIMEOUT = 600
 
-    이 함수는 다음과 같은 작업을 수행합니다:
-    1. 모든 책의 평균 평점을 계산
-    2. 가장 많은 책을 쓴 작가를 찾음
-    3. 최근 30일 내에 출판된 책들을 조회
-    4. 각 장르별 책 수를 계산
 
-    모든 작업은 비동기적으로 수행되며, 결과는 하나의 응답으로 합쳐집니다.
+def book_analysis():
     """
-
-    @sync_to_async
-    def get_average_rating():
-        return Book.objects.aggregate(Avg("rating"))["rating__avg"]
-
-    @sync_to_async
-    def get_most_prolific_author():
-        return (
-            Author.objects.annotate(book_count=models.Count("books"))
-            .order_by("-book_count")
-            .first()
-        )
-
-    @sync_to_async
-    def get_recent_books():
-        thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
-        return list(Book.objects.filter(publication_date__gte=thirty_days_ago))
-
-    @sync_to_async
-    def get_genre_counts():
-        return dict(
-            Book.objects.values("genre")
+    모든 책의 평균 평점, 가장 많은 책을 쓴 작가, 최근 30일 내 출판된 책,
+    장르별 책 수를 계산해 직렬화된 결과로 반환합니다.
+    """
+    prolific_author = Author.objects.order_by("-book_count", "pk").first()
+    recent_books = timewindows.recent(
+        Book.objects.select_related("author"), "publication_date", RECENT_DAYS
+    )
+    names = genre_registry.names()
+    return {
+        "average_rating": Book.objects.aggregate(Avg("rating"))["rating__avg"],
+        "most_prolific_author": AuthorSerializer(prolific_author).data,
+        "recent_books": BookSerializer(recent_books, many=True).data,
+        "genre_counts": {
+            names.get(genre_id): count
+            for genre_id, count in Book.objects.values("genres")
             .annotate(count=models.Count("id"))
-            .values_list("genre", "count")
-        )
+            .values_list("genres", "count")
+        },
+    }
 
-    # 모든 비동기 작업을 동시에 실행
-    avg_rating, prolific_author, recent_books, genre_counts = await asyncio.gather(
-        get_average_rating(),
-        get_most_prolific_author(),
-        get_recent_books(),
-        get_genre_counts(),
-    )
 
-    # 결과 직렬화
-    prolific_author_serializer = AuthorSerializer(prolific_author)
-    recent_books_serializer = BookSerializer(recent_books, many=True)
+def cached_book_analysis():
+    # 최근 출판 목록이 날짜에 따라 바뀌므로 키에 날짜를 넣습니다.
+    key = f"{BOOK_CACHE_NAMESPACE}:{generation(BOOK_CACHE_NAMESPACE)}:analysis:{timewindows.today()}"
+    return get_or_compute(key, book_analysis, ANALYSIS_CACHE_TIMEOUT)
 
-    # 응답 데이터 구성
-    response_data = {
-        "average_rating": avg_rating,
-        "most_prolific_author": prolific_author_serializer.data,
-        "recent_books": recent_books_serializer.data,
-        "genre_counts": genre_counts,
-    }
 
-    return Response(response_data)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def complex_book_analysis(request):
+    """
+    책 전체 통계 (book_analysis 참고).
+
+    DRF 뷰는 비동기로 실행되지 않으므로 네 개의 집계를 동시에 돌리는 대신
+    결과를 캐시하고, 배포 후에는 warm_caches 명령으로 미리 계산해 둡니다.
+    """
+    return Response(cached_book_analysis())
 
 
-class UserProfileViewSet(viewsets.ModelViewSet):
+class UserProfileViewSet(BaseModelViewSet):
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
 
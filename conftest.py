@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def throttle_store(settings):
+    # 테스트는 공유 SQLite 파일 대신 프로세스 내부 저장소를 사용합니다.
+    settings.THROTTLE_STORE = {"BACKEND": "blog_project.throttling.MemoryThrottleStore"}
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    # 뷰에 선언된 query_budget 을 초과하면 테스트가 실패합니다.
+    settings.QUERY_BUDGET_ENFORCE = True
+
+
+@pytest.fixture(autouse=True)
+def cache_backend(settings):
+    # L2 를 공유 SQLite 파일 대신 LocMemCache 로 바꾸고, 테스트마다 비웁니다.
+    settings.CACHES = {
+        **settings.CACHES,
+        "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    from django.core.cache import caches
+
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
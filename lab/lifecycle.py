@@ -0,0 +1,119 @@
+"""
+실험 상태 자동 전이.
+
+PLANNED 는 start_date 가 되면 IN_PROGRESS 로, IN_PROGRESS 는 end_date 가 되면 COMPLETED 로
+바꿉니다. 읽는 쪽(by_status, is_active)은 저장된 status 와 인덱스만 보면 됩니다.
+
+ExperimentLifecycle 은 앞으로 lookahead 초 안의 시작/종료 시각을 blog_project.scheduler 힙에
+올려 두고, 시각이 도래하면 그때까지 도래한 전이를 상태별 UPDATE 한 문장씩으로 처리합니다.
+reload_interval 마다(또는 이 프로세스에서 실험이 저장되면) 예정 시각을 다시 읽고, 놓친
+전이도 그때 함께 처리하므로 여러 프로세스에서 돌거나 재시작해도 결과는 같습니다.
+
+    python manage.py run_scheduler
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from blog_project.scheduler import Scheduler
+
+from .models import Experiment
+
+# (현재 상태, 바뀔 상태, 기준 시각 필드). validators.VALID_TRANSITIONS 에 있는 전이만 씁니다.
+AUTO_TRANSITIONS = [
+    ("PLANNED", "IN_PROGRESS", "start_date"),
+    ("IN_PROGRESS", "COMPLETED", "end_date"),
+]
+# 힙에 올려 둘 예정 시각의 범위 (초)와 최대 개수
+LOOKAHEAD = 3600
+MAX_BOUNDARIES = 1000
+# 예정 시각을 다시 읽는 간격 (초)
+RELOAD_INTERVAL = 300
+
+
+def apply_due_transitions(now=None):
+    """
+    now 까지 도래한 전이를 적용하고 {바뀐 상태: 행 수} 를 반환합니다.
+    시작과 종료가 모두 지난 PLANNED 실험은 IN_PROGRESS 를 거쳐 COMPLETED 가 됩니다.
+    """
+    now = now or timezone.now()
+    changed = {}
+    with transaction.atomic():
+        for old, new, field in AUTO_TRANSITIONS:
+            changed[new] = Experiment.objects.filter(
+                status=old, **{f"{field}__lte": now}
+            ).update(status=new, updated_at=now)
+    return changed
+
+
+def upcoming_boundaries(now, until, limit=MAX_BOUNDARIES):
+    """
+    (now, until] 사이에 전이가 일어날 시각 목록 (중복 제거, 오름차순).
+    """
+    times = set()
+    for index, (old, _, field) in enumerate(AUTO_TRANSITIONS):
+        # 아직 앞 단계 상태인 실험도 이후 단계 경계에서 전이됩니다.
+        statuses = [status for status, _, _ in AUTO_TRANSITIONS[: index + 1]]
+        times.update(
+            Experiment.objects.filter(
+                status__in=statuses, **{f"{field}__gt": now, f"{field}__lte": until}
+            )
+            .order_by(field)
+            .values_list(field, flat=True)[:limit]
+        )
+    return sorted(times)[:limit]
+
+
+class ExperimentLifecycle:
+    def __init__(self, scheduler=None, lookahead=LOOKAHEAD, reload_interval=RELOAD_INTERVAL):
+        self.scheduler = Scheduler() if scheduler is None else scheduler
+        self.lookahead = lookahead
+        self.reload_interval = reload_interval
+        self.horizon = None
+        self.scheduler.register("experiments", self.on_due)
+        self.scheduler.register("experiments:reload", self.reload)
+
+    def on_due(self, due_times=None):
+        return apply_due_transitions()
+
+    def reload(self, due_times=None):
+        """
+        놓친 전이를 적용하고 앞으로 lookahead 초 안의 경계를 힙에 올립니다.
+        """
+        now = timezone.now()
+        changed = apply_due_transitions(now)
+        self.horizon = now + datetime.timedelta(seconds=self.lookahead)
+        boundaries = upcoming_boundaries(now, self.horizon)
+        for when in boundaries:
+            self.scheduler.schedule(when.timestamp(), "experiments")
+        if len(boundaries) >= MAX_BOUNDARIES:
+            # 범위 안 경계가 너무 많으면 올린 마지막 경계에서 이어서 읽습니다.
+            self.horizon = boundaries[-1]
+        next_reload = min(now.timestamp() + self.reload_interval, self.horizon.timestamp())
+        self.scheduler.schedule(next_reload, "experiments:reload")
+        return changed
+
+    def on_experiment_saved(self, sender, instance, **kwargs):
+        # 이 프로세스에서 저장된 실험의 경계는 다음 reload 를 기다리지 않고 바로 올립니다.
+        if self.horizon is None:
+            return
+        for _, _, field in AUTO_TRANSITIONS:
+            when = getattr(instance, field, None)
+            if isinstance(when, datetime.datetime) and when <= self.horizon:
+                self.scheduler.schedule(when.timestamp(), "experiments")
+
+    def start(self, background=True):
+        post_save.connect(
+            self.on_experiment_saved, sender=Experiment, weak=False, dispatch_uid="lab.lifecycle"
+        )
+        self.reload()
+        if background:
+            self.scheduler.start()
+        else:
+            self.scheduler.run_forever()
+
+    def stop(self):
+        post_save.disconnect(sender=Experiment, dispatch_uid="lab.lifecycle")
+        self.scheduler.stop()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from lab.lifecycle import LOOKAHEAD, RELOAD_INTERVAL, ExperimentLifecycle, apply_due_transitions
+
+
+class Command(BaseCommand):
+    help = (
+        "실험 상태 자동 전이(PLANNED -> IN_PROGRESS -> COMPLETED)를 예정 시각에 맞춰 실행합니다. "
+        "외부 브로커 없이 이 프로세스 안의 힙 스케줄러로 동작합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="도래한 전이만 적용하고 종료")
+        parser.add_argument("--lookahead", type=int, default=LOOKAHEAD, help="힙에 올릴 예정 시각 범위 (초)")
+        parser.add_argument("--reload-interval", type=int, default=RELOAD_INTERVAL)
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            changed = apply_due_transitions()
+            self.stdout.write(", ".join(f"{status}: {count}" for status, count in changed.items()))
+            return
+        lifecycle = ExperimentLifecycle(
+            lookahead=options["lookahead"], reload_interval=options["reload_interval"]
+        )
+        self.stdout.write("scheduler started")
+        try:
+            lifecycle.start(background=False)
+        except KeyboardInterrupt:
+            lifecycle.stop()
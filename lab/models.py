@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from outbox.capture import ChangeTrackingManager, ChangeTrackingMixin
 from user.models import CustomUser
+from .validators import status_predecessors
 
-class SoftDeleteManager(models.Manager):
+class SoftDeleteManager(ChangeTrackingManager):
     def get_queryset(self):
         return super().get_queryset().filter(deleted=False)
 
@@ -31,7 +33,7 @@ class BaseModel(models.Model):
     def hard_delete(self):
         super().delete()
 
-class Experiment(BaseModel):
+class Experiment(ChangeTrackingMixin, BaseModel):
     name = models.CharField(max_length=100)
     description = models.TextField()
     start_date = models.DateTimeField()
@@ -48,6 +50,22 @@ class Experiment(BaseModel):
         ordering = ['-start_date']
         verbose_name = 'Experiment'
         verbose_name_plural = 'Experiments'
+        indexes = [
+            # by_status (삭제되지 않은 실험, 상태별, 시작일 역순). SQLite 에서는 deleted=False 가
+            # NOT deleted 로 컴파일되어 (deleted, ...) 복합 인덱스의 앞 열로 쓰이지 않으므로
+            # 같은 조건의 부분 인덱스로 둡니다.
+            models.Index(
+                fields=['status', '-start_date'],
+                name='experiment_live_status_idx',
+                condition=models.Q(deleted=False),
+            ),
+            # 종료 시각이 된 실험 (lab.lifecycle)
+            models.Index(
+                fields=['status', 'end_date'],
+                name='experiment_live_status_end_idx',
+                condition=models.Q(deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -59,3 +77,32 @@ class Experiment(BaseModel):
     @property
     def duration(self):
         return (self.end_date - self.start_date).total_seconds() / 3600  # Duration in hours
+
+def transition_experiments(queryset, ids, new_status):
+    """
+    queryset 안의 실험 ids 를 new_status 로 한 번에 바꾸고 입력 순서대로 결과를 반환합니다.
+
+    상태 전이표(validators.VALID_TRANSITIONS)에서 new_status 로 갈 수 있는 상태인 행만
+    UPDATE ... WHERE status IN (...) 한 문장으로 바꿉니다. 결과는
+    {"id", "result": "updated" | "invalid_transition" | "not_found", "status"} 목록입니다.
+    """
+    predecessors = status_predecessors(new_status)
+    with transaction.atomic(using=queryset.db):
+        # 행을 잠그고 읽은 상태로 결과를 만듭니다 (SQLite 는 쓰기 트랜잭션이 직렬화됨).
+        current = dict(
+            queryset.select_for_update().filter(pk__in=ids).values_list('pk', 'status')
+        )
+        changed = [pk for pk, status in current.items() if status in predecessors]
+        if changed:
+            queryset.filter(pk__in=ids, status__in=predecessors).update(
+                status=new_status, updated_at=timezone.now()
+            )
+    results = []
+    for pk in ids:
+        if pk not in current:
+            results.append({'id': pk, 'result': 'not_found', 'status': None})
+        elif current[pk] in predecessors:
+            results.append({'id': pk, 'result': 'updated', 'status': new_status})
+        else:
+            results.append({'id': pk, 'result': 'invalid_transition', 'status': current[pk]})
+    return results
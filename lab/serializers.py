@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
+from blog_project.fieldsets import SparseFieldsetMixin
+from user.serializers import CustomUserSerializer
 from .models import Experiment
+from .validators import validate_experiment_status_change
 from django.utils import timezone
 
-class ExperimentSerializer(serializers.ModelSerializer):
+# 한 번에 상태를 바꿀 수 있는 실험 수
+MAX_TRANSITION_IDS = 1000
+
+class ExperimentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     is_active = serializers.SerializerMethodField()
     duration = serializers.SerializerMethodField()
     time_remaining = serializers.SerializerMethodField()
@@ -12,11 +19,28 @@ class ExperimentSerializer(serializers.ModelSerializer):
         model = Experiment
         fields = ['id', 'name', 'description', 'start_date', 'end_date', 'status', 'is_active', 'duration', 'time_remaining', 'researcher', 'created_at', 'updated_at', 'deleted']
         read_only_fields = ['created_at', 'updated_at', 'deleted']
+        # 메서드 필드가 읽는 컬럼 (목록 조회 시 컬럼 가지치기에 사용)
+        method_field_columns = {
+            'is_active': ['status'],
+            'duration': ['start_date', 'end_date'],
+            'time_remaining': ['status', 'end_date'],
+        }
+        # ?expand=researcher 로 사용자 이름 대신 사용자 객체를 반환
+        expandable_fields = {'researcher': CustomUserSerializer}
 
     def create(self, validated_data):
         validated_data['researcher'] = self.context['request'].user
         return super().create(validated_data)
 
+    def validate_status(self, value):
+        # 수정 시 상태 전이표에 없는 변경은 거부
+        if self.instance is not None and value != self.instance.status:
+            try:
+                validate_experiment_status_change(self.instance.status, value)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError(exc.messages)
+        return value
+
     def get_is_active(self, obj):
         return obj.status == 'IN_PROGRESS'
 
@@ -30,3 +54,12 @@ class ExperimentSerializer(serializers.ModelSerializer):
         if now > obj.end_date:
             return 0
         return (obj.end_date - now).total_seconds() / 3600  # Remaining time in hours
+
+class ExperimentTransitionSerializer(serializers.Serializer):
+    """
+    여러 실험의 상태를 한 번에 바꾸는 요청 (ExperimentViewSet.transition).
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_TRANSITION_IDS
+    )
+    status = serializers.ChoiceField(choices=Experiment._meta.get_field('status').choices)
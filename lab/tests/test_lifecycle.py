@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from blog_project.scheduler import Scheduler
+from lab.lifecycle import AUTO_TRANSITIONS, ExperimentLifecycle, apply_due_transitions
+from lab.models import Experiment
+from lab.validators import VALID_TRANSITIONS
+from .factories import ExperimentFactory
+
+
+def hours(n):
+    return timezone.now() + datetime.timedelta(hours=n)
+
+
+def status_of(experiment):
+    return Experiment.objects.all_with_deleted().get(pk=experiment.pk).status
+
+
+def test_auto_transitions_follow_transition_table():
+    for old, new, _ in AUTO_TRANSITIONS:
+        assert new in VALID_TRANSITIONS[old]
+
+
+@pytest.mark.django_db
+class TestLifecycle:
+    def test_apply_due_transitions(self):
+        starting = ExperimentFactory(status='PLANNED', start_date=hours(-1), end_date=hours(1))
+        finished = ExperimentFactory(status='PLANNED', start_date=hours(-3), end_date=hours(-1))
+        ending = ExperimentFactory(status='IN_PROGRESS', start_date=hours(-3), end_date=hours(-1))
+        future = ExperimentFactory(status='PLANNED', start_date=hours(1), end_date=hours(2))
+        cancelled = ExperimentFactory(status='CANCELLED', start_date=hours(-3), end_date=hours(-1))
+        deleted = ExperimentFactory(status='PLANNED', start_date=hours(-1), end_date=hours(1), deleted=True)
+
+        assert apply_due_transitions() == {'IN_PROGRESS': 2, 'COMPLETED': 2}
+        assert status_of(starting) == 'IN_PROGRESS'
+        assert status_of(finished) == 'COMPLETED'
+        assert status_of(ending) == 'COMPLETED'
+        assert status_of(future) == 'PLANNED'
+        assert status_of(cancelled) == 'CANCELLED'
+        assert status_of(deleted) == 'PLANNED'
+
+    def test_boundaries_are_scheduled_and_applied_when_due(self):
+        start, end = hours(1), hours(2)
+        experiment = ExperimentFactory(status='PLANNED', start_date=start, end_date=end)
+        ExperimentFactory(status='PLANNED', start_date=hours(5), end_date=hours(6))
+        scheduler = Scheduler()
+        lifecycle = ExperimentLifecycle(scheduler, lookahead=3 * 3600, reload_interval=3 * 3600)
+        lifecycle.reload()
+
+        due = sorted(when for when, _, name in scheduler._heap if name == 'experiments')
+        assert due == [start.timestamp(), end.timestamp()]
+
+        # 시작 시각이 된 것처럼 실험 시각을 당겨 실행
+        Experiment.objects.filter(pk=experiment.pk).update(start_date=hours(-1))
+        assert scheduler.run_pending(now=start.timestamp()) == {'experiments': [start.timestamp()]}
+        assert status_of(experiment) == 'IN_PROGRESS'
+
+    def test_saved_experiment_is_scheduled_without_reload(self):
+        scheduler = Scheduler()
+        lifecycle = ExperimentLifecycle(scheduler, lookahead=3600)
+        lifecycle.reload()
+        lifecycle.on_experiment_saved(Experiment, ExperimentFactory.build(start_date=hours(0.5), end_date=hours(5)))
+        assert len([1 for _, _, name in scheduler._heap if name == 'experiments']) == 1
@@ -3,7 +3,12 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from .factories import UserFactory, ExperimentFactory
+from lab.models import Experiment
+from lab.serializers import ExperimentSerializer
+from lab.validators import status_predecessors
 
 @pytest.mark.django_db
 class TestExperimentViews:
@@ -59,7 +64,20 @@ class TestExperimentViews:
         url = reverse('experiment-by-status')
         response = self.client.get(url, {'status': 'IN_PROGRESS'})
         assert response.status_code == 200
-        assert len(response.data) == 3
+        assert response.data['count'] == 3
+        assert len(response.data['results']) == 3
+
+    def test_experiments_by_status_validates_and_paginates(self):
+        ExperimentFactory.create_batch(12, researcher=self.user, status='PLANNED')
+        ExperimentFactory(researcher=self.user, status='PLANNED', deleted=True)
+        url = reverse('experiment-by-status')
+        response = self.client.get(url, {'status': 'PLANNED'})
+        assert response.data['count'] == 12
+        assert len(response.data['results']) == 10
+        assert response.data['next'] is not None
+        response = self.client.get(url, {'status': 'DONE'})
+        assert response.status_code == 400
+        assert 'status' in response.data
 
     def test_experiment_filter_by_status(self, client):
         ExperimentFactory(status='PLANNED')
@@ -97,3 +115,67 @@ class TestExperimentViews:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['duration'] == 5.0
 
+
+
+@pytest.mark.django_db
+class TestExperimentTransition:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('experiment-transition')
+
+    def test_bulk_transition_reports_each_id(self):
+        running = ExperimentFactory.create_batch(3, researcher=self.user, status='IN_PROGRESS')
+        planned = ExperimentFactory(researcher=self.user, status='PLANNED')
+        other = ExperimentFactory(status='IN_PROGRESS')
+        ids = [e.pk for e in running] + [planned.pk, other.pk, 999999]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {'ids': ids, 'status': 'COMPLETED'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 3
+        assert [r['result'] for r in response.data['results']] == (
+            ['updated'] * 3 + ['invalid_transition', 'not_found', 'not_found']
+        )
+        assert response.data['results'][3]['status'] == 'PLANNED'
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "lab_experiment"')]
+        assert len(updates) == 1
+
+        assert set(Experiment.objects.filter(status='COMPLETED').values_list('pk', flat=True)) == {e.pk for e in running}
+        other.refresh_from_db()
+        assert other.status == 'IN_PROGRESS'
+
+    def test_large_transition_is_one_guarded_update(self):
+        running = ExperimentFactory.build_batch(550, researcher=self.user, status='IN_PROGRESS')
+        planned = ExperimentFactory.build(researcher=self.user, status='PLANNED')
+        Experiment.objects.bulk_create(running + [planned])
+        ids = list(Experiment.objects.order_by('pk').values_list('pk', flat=True))
+        assert len(ids) == 551
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {'ids': ids, 'status': 'COMPLETED'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 550
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "lab_experiment"')]
+        assert len(updates) == 1
+        # 상태 전이 조건이 UPDATE 문에 그대로 남아 있습니다.
+        assert '"lab_experiment"."status" IN (' in updates[0]
+        assert Experiment.objects.filter(status='COMPLETED').count() == 550
+        assert Experiment.objects.filter(status='PLANNED').count() == 1
+
+    @pytest.mark.parametrize('payload', [
+        {'ids': [], 'status': 'COMPLETED'},
+        {'ids': [1], 'status': 'DONE'},
+        {'status': 'COMPLETED'},
+    ])
+    def test_invalid_payload(self, payload):
+        response = self.client.post(self.url, payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_update_enforces_transition_table(self):
+        experiment = ExperimentFactory(researcher=self.user, status='COMPLETED')
+        assert status_predecessors('COMPLETED') == ['IN_PROGRESS']
+        serializer = ExperimentSerializer(experiment, data={'status': 'PLANNED'}, partial=True)
+        assert not serializer.is_valid()
+        assert 'status' in serializer.errors
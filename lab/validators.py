@@ -9,14 +9,20 @@ def validate_experiment_duration(start_date, end_date):
             _('Experiment duration must be between 1 hour and 1 week.'),
         )
 
+# 실험 상태 전이표 {현재 상태: [바꿀 수 있는 상태]}
+VALID_TRANSITIONS = {
+    'PLANNED': ['IN_PROGRESS', 'CANCELLED'],
+    'IN_PROGRESS': ['COMPLETED', 'CANCELLED'],
+    'COMPLETED': [],
+    'CANCELLED': [],
+}
+
+# new_status 로 바꿀 수 있는 현재 상태 목록
+def status_predecessors(new_status):
+    return [old for old, targets in VALID_TRANSITIONS.items() if new_status in targets]
+
 def validate_experiment_status_change(old_status, new_status):
-    valid_transitions = {
-        'PLANNED': ['IN_PROGRESS', 'CANCELLED'],
-        'IN_PROGRESS': ['COMPLETED', 'CANCELLED'],
-        'COMPLETED': [],
-        'CANCELLED': [],
-    }
-    if new_status not in valid_transitions.get(old_status, []):
+    if new_status not in VALID_TRANSITIONS.get(old_status, []):
         raise ValidationError(
             _(f'Invalid status transition from {old_status} to {new_status}.'),
         )
@@ -1,14 +1,14 @@
-import logging
-from rest_framework import viewsets, filters, status
+from rest_framework import filters, serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from .models import Experiment
-from .serializers import ExperimentSerializer
+from .models import Experiment, transition_experiments
+from .serializers import ExperimentSerializer, ExperimentTransitionSerializer
 from book.views import IsOwnerOrReadOnly
+from blog_project.viewsets import BaseModelViewSet
 from django.views.generic import (
     ListView,
     DetailView,
@@ -18,11 +18,9 @@ from django.views.generic import (
 )
 from django.urls import reverse_lazy
 
-logger = logging.getLogger(__name__)
-
 
 @extend_schema(tags=["Experiments"])
-class ExperimentViewSet(viewsets.ModelViewSet):
+class ExperimentViewSet(BaseModelViewSet):
     queryset = Experiment.objects.all()
     serializer_class = ExperimentSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
@@ -35,36 +33,6 @@ class ExperimentViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "description"]
     ordering_fields = ["start_date", "end_date", "created_at", "updated_at"]
 
-    def list(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.list, URL: {request.get_full_path()}"
-        )
-        return super().list(request, *args, **kwargs)
-
-    def create(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.create, URL: {request.get_full_path()}"
-        )
-        return super().create(request, *args, **kwargs)
-
-    def retrieve(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.retrieve, URL: {request.get_full_path()}"
-        )
-        return super().retrieve(request, *args, **kwargs)
-
-    def update(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.update, URL: {request.get_full_path()}"
-        )
-        return super().update(request, *args, **kwargs)
-
-    def destroy(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.destroy, URL: {request.get_full_path()}"
-        )
-        return super().destroy(request, *args, **kwargs)
-
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -77,17 +45,45 @@ class ExperimentViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"])
     def by_status(self, request):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.by_status, URL: {request.get_full_path()}"
-        )
-        status = request.query_params.get("status", "IN_PROGRESS")
-        experiments = Experiment.objects.filter(status=status, deleted=False)
-        if not experiments.exists():
+        choices = Experiment._meta.get_field("status").choices
+        try:
+            status = serializers.ChoiceField(choices=choices).run_validation(
+                request.query_params.get("status", "IN_PROGRESS")
+            )
+        except ValidationError as exc:
+            raise ValidationError({"status": exc.detail})
+        # 삭제되지 않은 실험의 (status, -start_date) 부분 인덱스 조회
+        experiments = self.filter_queryset(self.get_queryset()).filter(status=status)
+        page = self.paginate_queryset(experiments)
+        if not page:
             raise NotFound(
                 "No experiments found with the given status", code="no_experiments"
             )
-        serializer = self.get_serializer(experiments, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(request=ExperimentTransitionSerializer)
+    @action(detail=False, methods=["post"])
+    def transition(self, request):
+        """
+        {"ids": [...], "status": "COMPLETED"} 로 여러 실험의 상태를 한 번에 바꿉니다.
+        상태 전이표에 맞는 실험만 바뀌며, 결과는 id 별로 반환합니다.
+        """
+        serializer = ExperimentTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = Experiment.objects.all()
+        if not request.user.is_staff:
+            queryset = queryset.filter(researcher=request.user)
+        results = transition_experiments(
+            queryset, serializer.validated_data["ids"], serializer.validated_data["status"]
+        )
+        return Response(
+            {
+                "status": serializer.validated_data["status"],
+                "updated": sum(result["result"] == "updated" for result in results),
+                "results": results,
+            }
+        )
 
     def perform_create(self, serializer):
         serializer.save(researcher=self.request.user)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class OutboxConfig(AppConfig):
+    name = 'outbox'
+
+    def ready(self):
+        from .capture import connect_signals
+
+        connect_signals()
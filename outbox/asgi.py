@@ -0,0 +1,140 @@
+"""
+목록 변경 피드의 ASGI 엔드포인트 (outbox.feeds).
+
+    GET /api/feeds/books/?author=3&min_price=10       (SSE, text/event-stream)
+    ws://.../api/feeds/experiments/?status=IN_PROGRESS (WebSocket, 텍스트 JSON)
+
+쿼리 파라미터는 해당 목록 API 와 같고, 인증은 목록 API 와 같은 방식(또는 ?token=<JWT>)입니다.
+메시지는 {"resource": ..., "changes": [{"type": "create|update|delete", "id": ..., "data": ...}]}.
+구독자가 밀려 델타를 잃으면 reset 을 보내고 연결을 닫으므로 클라이언트는 목록을 다시 읽습니다.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from rest_framework.utils.encoders import JSONEncoder
+
+from .feeds import OVERFLOW, FeedError, get_feed
+
+PREFIX = '/api/feeds/'
+KEEPALIVE_SECONDS = 15
+
+
+def _dumps(message):
+    return json.dumps(message, cls=JSONEncoder, ensure_ascii=False)
+
+
+class ChangeFeedASGIHandler:
+    """
+    ASGI 애플리케이션 앞에서 /api/feeds/<resource>/ 의 SSE(GET)와 WebSocket 연결을 처리합니다.
+    """
+
+    def __init__(self, application, feed=None, prefix=PREFIX):
+        self.application = application
+        self.feed = feed
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] not in ('http', 'websocket') or not scope['path'].startswith(self.prefix):
+            return await self.application(scope, receive, send)
+        if scope['type'] == 'http' and scope['method'] != 'GET':
+            return await self.application(scope, receive, send)
+        feed = self.feed or get_feed()
+        resource = scope['path'][len(self.prefix):].strip('/')
+        if scope['type'] == 'websocket':
+            return await self.websocket(feed, resource, scope, receive, send)
+        return await self.event_stream(feed, resource, scope, receive, send)
+
+    async def subscribe(self, feed, resource, scope):
+        feed_filter = await sync_to_async(feed.subscribe)(resource, scope)
+        mailbox = feed.broker.subscribe(feed_filter.channel)
+        feed.start()
+        return feed_filter, mailbox
+
+    async def unsubscribe(self, feed, feed_filter, mailbox):
+        feed.broker.unsubscribe(feed_filter.channel, mailbox)
+        feed.unsubscribe(feed_filter)
+
+    async def messages(self, mailbox, receive, disconnect):
+        """
+        mailbox 의 메시지를 꺼냅니다. KEEPALIVE_SECONDS 동안 없으면 None, 연결이 끊기면 종료.
+        """
+        closed = asyncio.ensure_future(self._wait_for(receive, disconnect))
+        try:
+            while True:
+                getter = asyncio.ensure_future(mailbox.get())
+                done, _ = await asyncio.wait(
+                    {getter, closed}, timeout=KEEPALIVE_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if closed in done:
+                    getter.cancel()
+                    return
+                if getter not in done:
+                    getter.cancel()
+                    yield None
+                    continue
+                message = getter.result()
+                yield message
+                if message is OVERFLOW:
+                    return
+        finally:
+            closed.cancel()
+
+    async def _wait_for(self, receive, message_type):
+        while (await receive())['type'] != message_type:
+            pass
+
+    async def event_stream(self, feed, resource, scope, receive, send):
+        try:
+            feed_filter, mailbox = await self.subscribe(feed, resource, scope)
+        except FeedError as exc:
+            body = _dumps({'detail': exc.detail}).encode()
+            await send({
+                'type': 'http.response.start', 'status': exc.status,
+                'headers': [(b'content-type', b'application/json')],
+            })
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        try:
+            await send({
+                'type': 'http.response.start', 'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': b'retry: 1000\n\n', 'more_body': True})
+            async for message in self.messages(mailbox, receive, 'http.disconnect'):
+                if message is None:
+                    chunk = ': keepalive\n\n'
+                elif message is OVERFLOW:
+                    chunk = 'event: reset\ndata: {}\n\n'
+                else:
+                    chunk = f"event: changes\ndata: {_dumps(message)}\n\n"
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            await self.unsubscribe(feed, feed_filter, mailbox)
+
+    async def websocket(self, feed, resource, scope, receive, send):
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        await send({'type': 'websocket.accept'})
+        try:
+            feed_filter, mailbox = await self.subscribe(feed, resource, scope)
+        except FeedError as exc:
+            await send({'type': 'websocket.send', 'text': _dumps({'detail': exc.detail})})
+            await send({'type': 'websocket.close', 'code': 4000 + exc.status})
+            return
+        try:
+            async for message in self.messages(mailbox, receive, 'websocket.disconnect'):
+                if message is None:
+                    continue
+                if message is OVERFLOW:
+                    await send({'type': 'websocket.send', 'text': _dumps({'type': 'reset'})})
+                    await send({'type': 'websocket.close', 'code': 4409})
+                    return
+                await send({'type': 'websocket.send', 'text': _dumps(message)})
+        finally:
+            await self.unsubscribe(feed, feed_filter, mailbox)
@@ -0,0 +1,230 @@
+"""
+모델 쓰기를 같은 트랜잭션 안에서 ChangeEvent 로 남깁니다 (transactional outbox).
+
+ChangeTrackingMixin 을 상속하고 매니저가 ChangeTrackingQuerySet 을 쓰는 모델이 대상입니다.
+
+- instance.save(): 생성/수정/소프트 삭제(BaseModel.delete)/복구 이벤트 1건
+- queryset.update() (관리자 액션, 일괄 전이 등): 대상 pk 를 먼저 읽고(가능하면 잠금) 원래 조건에
+  그 pk 를 더해 UPDATE 한 뒤 행마다 이벤트. deleted=True/False 는 소프트 삭제/복구로 기록합니다.
+- queryset.bulk_create(): 그대로 일괄 INSERT 하고(save()/시그널 없음) 새 행마다 이벤트.
+  pk 를 돌려받지 못하는 DB(SQLite)에서는 INSERT 전 가장 큰 pk 뒤에 생긴 행을 읽습니다.
+- 실제 삭제(hard_delete, queryset.delete(), CASCADE): post_delete 시그널
+- ManyToMany 변경: m2m_changed 시그널, fields 는 관계 필드 이름
+
+이벤트는 쓰기와 같은 DB 에 들어가므로 샤드 행의 이벤트는 그 샤드에 있습니다.
+_base_manager 의 update(), raw SQL 은 이벤트를 남기지 않습니다.
+"""
+import sqlite3
+import threading
+
+from django.apps import apps
+from django.db import connections, models, router, transaction
+from django.db.models import Max
+from django.db.models.signals import m2m_changed, post_delete
+from django.utils import timezone
+
+from .models import ChangeEvent
+
+# 이벤트 INSERT 한 번에 넣는 행 수
+EVENT_BATCH_SIZE = 500
+
+# 이 프로세스에서 이벤트가 커밋되면 long-poll/SSE 대기를 깨웁니다.
+_committed = threading.Condition()
+
+
+def wait_for_commit(timeout):
+    with _committed:
+        _committed.wait(timeout)
+
+
+def _notify_committed():
+    with _committed:
+        _committed.notify_all()
+
+
+def record_changes(model, pks, action, fields=None, using=None):
+    """
+    model 의 pks 행에 대한 이벤트를 using DB 에 추가합니다. 쓰기와 같은 트랜잭션 안에서 호출합니다.
+    """
+    if not pks:
+        return
+    using = using or router.db_for_write(model)
+    fields = sorted(fields) if fields is not None else None
+    now = timezone.now()
+    ChangeEvent.objects.using(using).bulk_create(
+        [
+            ChangeEvent(
+                model=model._meta.label_lower, object_id=str(pk), action=action,
+                fields=fields, created_at=now,
+            )
+            for pk in pks
+        ],
+        batch_size=EVENT_BATCH_SIZE,
+    )
+    transaction.on_commit(_notify_committed, using=using)
+
+
+def _update_action(values):
+    deleted = values.get('deleted')
+    if deleted is True:
+        return ChangeEvent.SOFT_DELETE
+    if deleted is False:
+        return ChangeEvent.RESTORE
+    return ChangeEvent.UPDATE
+
+
+def max_query_params(connection):
+    """
+    한 문장의 파라미터 수 한도 (None 이면 제한 없음). Django 3.2 는 SQLite 를 999 로 가정하지만
+    실제 한도는 연결에서 읽습니다 (SQLite 3.32 부터 32766).
+    """
+    if connection.vendor == 'sqlite':
+        connection.ensure_connection()
+        getlimit = getattr(connection.connection, 'getlimit', None)
+        if getlimit is not None:
+            return getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    return connection.features.max_query_params
+
+
+class ChangeTrackingQuerySet(models.QuerySet):
+    def _update_batch_size(self, values):
+        # IN 절 pk 수는 파라미터 수 한도 안에서 최대한 크게 (보통 UPDATE 한 문장)
+        max_params = max_query_params(connections[self.db])
+        if max_params is None:
+            return None
+        _, params = self.query.sql_with_params()
+        return max(1, max_params - len(params) - len(values))
+
+    def update(self, **kwargs):
+        if self.query.is_sliced:
+            raise TypeError('Cannot update a query once a slice has been taken.')
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = self.order_by('pk').values_list('pk', flat=True)
+            if connections[self.db].features.has_select_for_update:
+                rows = rows.select_for_update()
+            pks = list(rows)
+            if not pks:
+                return 0
+            batch_size = self._update_batch_size(kwargs) or len(pks)
+            updated = 0
+            for start in range(0, len(pks), batch_size):
+                # 원래 조건(예: 상태 전이의 status IN (...))을 그대로 둔 채 읽은 pk 로만 좁힙니다.
+                batch = self.filter(pk__in=pks[start:start + batch_size])
+                updated += super(ChangeTrackingQuerySet, batch).update(**kwargs)
+            record_changes(self.model, pks, _update_action(kwargs), kwargs, self.db)
+        return updated
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        objs = list(objs)
+        connection = connections[self.db]
+        with transaction.atomic(using=self.db, savepoint=False):
+            if connection.features.can_return_rows_from_bulk_insert and not ignore_conflicts:
+                objs = super().bulk_create(objs, batch_size=batch_size)
+                pks = [obj.pk for obj in objs]
+            else:
+                pks = self._bulk_create_unreturned(objs, batch_size, ignore_conflicts)
+            record_changes(self.model, pks, ChangeEvent.CREATE, using=self.db)
+        return objs
+
+    bulk_create.alters_data = True
+
+    def _bulk_create_unreturned(self, objs, batch_size, ignore_conflicts):
+        """
+        새 pk 를 돌려받지 못할 때 INSERT 한 행의 pk 를 같은 트랜잭션 안에서 다시 읽습니다.
+        자동 증가 pk 는 INSERT 전 가장 큰 pk 뒤의 행, 지정한 pk 는 INSERT 전에 없던 것입니다.
+        SQLite 는 쓰기가 직렬화되므로 그 사이 다른 트랜잭션의 행이 끼지 않습니다. 다른 DB 의
+        ignore_conflicts 에서는 동시에 들어온 행의 create 이벤트가 한 번 더 남을 수 있습니다.
+        """
+        rows = self.model._base_manager.using(self.db)
+        explicit = {obj.pk for obj in objs if obj.pk is not None}
+        existing = set(rows.filter(pk__in=explicit).values_list('pk', flat=True)) if explicit else set()
+        auto = isinstance(self.model._meta.pk, models.AutoField) and len(explicit) < len(objs)
+        last = rows.aggregate(last=Max('pk'))['last'] if auto else None
+        super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+        pks = explicit - existing
+        if auto:
+            created = rows.filter(pk__gt=last) if last is not None else rows
+            pks.update(created.values_list('pk', flat=True))
+        return sorted(pks)
+
+
+ChangeTrackingManager = models.Manager.from_queryset(ChangeTrackingQuerySet)
+
+
+class ChangeTrackingMixin:
+    """
+    save() 를 atomic 으로 감싸 저장과 이벤트를 함께 커밋합니다.
+    from_db 때 읽은 deleted 값과 비교해 소프트 삭제/복구를 구분합니다.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_deleted = instance.__dict__.get('deleted')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or 'deleted' in fields:
+            self._saved_deleted = self.__dict__.get('deleted')
+
+    def change_action(self):
+        if self._state.adding:
+            return ChangeEvent.CREATE
+        previous = getattr(self, '_saved_deleted', None)
+        current = self.__dict__.get('deleted')
+        if previous is False and current is True:
+            return ChangeEvent.SOFT_DELETE
+        if previous is True and current is False:
+            return ChangeEvent.RESTORE
+        return ChangeEvent.UPDATE
+
+    def save_base(self, raw=False, force_insert=False, force_update=False, using=None, update_fields=None):
+        using = using or router.db_for_write(self.__class__, instance=self)
+        action = self.change_action()
+        with transaction.atomic(using=using, savepoint=False):
+            super().save_base(
+                raw=raw, force_insert=force_insert, force_update=force_update,
+                using=using, update_fields=update_fields,
+            )
+            record_changes(type(self), [self.pk], action, update_fields, using)
+        self._saved_deleted = self.__dict__.get('deleted')
+
+
+def record_delete(sender, instance, using, **kwargs):
+    record_changes(sender, [instance.pk], ChangeEvent.DELETE, using=using)
+
+
+# through 모델 -> (추적 모델, 관계 필드 이름)
+_m2m_fields = {}
+
+
+def record_m2m_change(sender, instance, action, reverse, pk_set, using, **kwargs):
+    model, name = _m2m_fields[sender]
+    if not reverse:
+        if action == 'post_clear' or (action in ('post_add', 'post_remove') and pk_set):
+            record_changes(model, [instance.pk], ChangeEvent.UPDATE, [name], using)
+    elif action in ('post_add', 'post_remove'):
+        record_changes(model, pk_set, ChangeEvent.UPDATE, [name], using)
+    elif action == 'pre_clear':
+        # 역방향 clear 는 post_clear 에 pk 목록이 없으므로 지우기 전에 읽습니다.
+        pks = model._base_manager.using(using).filter(**{name: instance}).values_list('pk', flat=True)
+        record_changes(model, list(pks), ChangeEvent.UPDATE, [name], using)
+
+
+def tracked_models():
+    return [model for model in apps.get_models() if issubclass(model, ChangeTrackingMixin)]
+
+
+def connect_signals():
+    for model in tracked_models():
+        post_delete.connect(record_delete, sender=model, dispatch_uid=f'outbox:{model._meta.label_lower}')
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            _m2m_fields[through] = (model, field.name)
+            m2m_changed.connect(
+                record_m2m_change, sender=through,
+                dispatch_uid=f'outbox:{model._meta.label_lower}.{field.name}',
+            )
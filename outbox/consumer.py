@@ -0,0 +1,134 @@
+"""
+변경 이벤트 읽기와 체크포인트.
+
+커서는 DB 별칭별로 마지막으로 읽은 이벤트 id 입니다 ("default:120", 샤드가 있으면
+"default:120,shard_0:37"). 빈 커서는 처음부터 읽습니다.
+
+    consumer = Consumer("search-index")
+    consumer.process(reindex)  # 다음 배치를 처리한 뒤 체크포인트 이동 (최소 한 번 처리)
+
+DB 안에서는 id 순서를 지키고 DB 사이의 순서는 보장하지 않습니다. 늦게 커밋된 트랜잭션의
+이벤트가 더 작은 id 를 가질 수 있으므로(PostgreSQL), id 에 빈틈이 있으면 빈틈 뒤의 이벤트는
+GAP_WAIT 초가 지나야 읽습니다. 롤백으로 생긴 빈틈은 그 뒤 건너뜁니다.
+"""
+import datetime
+import time
+
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from blog_project.sharding import shard_aliases
+
+from .capture import wait_for_commit
+from .models import ChangeEvent, ConsumerCheckpoint
+
+BATCH_SIZE = 100
+MAX_BATCH_SIZE = 1000
+GAP_WAIT = 5
+# 다른 프로세스의 커밋을 확인하는 간격 (초). 이 프로세스의 커밋은 바로 깨웁니다.
+POLL_INTERVAL = 1.0
+
+
+def databases():
+    return list(dict.fromkeys([DEFAULT_DB_ALIAS, *shard_aliases()]))
+
+
+def parse_cursor(cursor):
+    """
+    커서 문자열을 {별칭: 위치} 로 바꿉니다. 별칭 없는 숫자는 default 위치입니다.
+    """
+    aliases = databases()
+    positions = {}
+    for part in filter(None, (cursor or '').split(',')):
+        alias, _, position = part.strip().rpartition(':')
+        alias = alias or DEFAULT_DB_ALIAS
+        if alias not in aliases or not position.isdigit():
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+        positions[alias] = int(position)
+    return positions
+
+
+def format_cursor(positions):
+    return ','.join(f"{alias}:{positions.get(alias, 0)}" for alias in databases())
+
+
+def latest_cursor():
+    """
+    지금까지 기록된 마지막 이벤트 위치 (이후 이벤트만 읽을 때의 시작 커서).
+    """
+    return format_cursor({
+        alias: ChangeEvent.objects.using(alias).order_by('-id').values_list('id', flat=True).first() or 0
+        for alias in databases()
+    })
+
+
+def read_events(cursor='', limit=BATCH_SIZE, now=None):
+    """
+    cursor 다음 이벤트를 최대 limit 건 읽어 (이벤트 목록, 다음 커서) 를 반환합니다.
+    각 이벤트의 database 속성은 읽은 DB 별칭입니다.
+    """
+    positions = parse_cursor(cursor)
+    settled = (now or timezone.now()) - datetime.timedelta(seconds=GAP_WAIT)
+    events = []
+    for alias in databases():
+        remaining = limit - len(events)
+        if remaining <= 0:
+            break
+        position = positions.get(alias, 0)
+        rows = ChangeEvent.objects.using(alias).filter(id__gt=position).order_by('id')[:remaining]
+        for event in rows:
+            if event.id != position + 1 and event.created_at > settled:
+                break
+            event.database = alias
+            events.append(event)
+            position = event.id
+        positions[alias] = position
+    return events, format_cursor(positions)
+
+
+def wait_for_events(cursor='', limit=BATCH_SIZE, timeout=0):
+    """
+    read_events 와 같되 이벤트가 없으면 최대 timeout 초 동안 기다립니다 (long-poll).
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        events, next_cursor = read_events(cursor, limit)
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            return events, next_cursor
+        wait_for_commit(min(POLL_INTERVAL, remaining))
+
+
+class Consumer:
+    def __init__(self, name, batch_size=BATCH_SIZE):
+        self.name = name
+        self.batch_size = batch_size
+
+    def cursor(self):
+        cursor = (
+            ConsumerCheckpoint.objects.using(DEFAULT_DB_ALIAS)
+            .filter(name=self.name)
+            .values_list('cursor', flat=True)
+            .first()
+        )
+        return cursor or ''
+
+    def read(self, limit=None, timeout=0):
+        return wait_for_events(self.cursor(), limit or self.batch_size, timeout)
+
+    def commit(self, cursor):
+        parse_cursor(cursor)
+        ConsumerCheckpoint.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+            name=self.name, defaults={'cursor': cursor}
+        )
+
+    def process(self, handler, limit=None, timeout=0):
+        """
+        다음 배치를 handler(events) 로 처리하고 체크포인트를 옮긴 뒤 처리한 이벤트 수를 반환합니다.
+        handler 가 예외를 내면 체크포인트는 그대로이므로 다음 호출에서 같은 배치를 다시 받습니다.
+        """
+        events, cursor = self.read(limit, timeout)
+        if events:
+            handler(events)
+            self.commit(cursor)
+        return len(events)
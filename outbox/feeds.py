@@ -0,0 +1,374 @@
+"""
+목록 구독 (변경 피드).
+
+클라이언트는 목록 API 와 같은 필터 파라미터로 구독하고(outbox.asgi), 목록에 들어오거나
+바뀌거나 빠지는 행만 create/update/delete 델타로 받습니다.
+
+- 구독할 때 뷰셋의 인증/권한/쓰로틀과 filter_queryset 을 그대로 거친 QuerySet 의 WHERE 를
+  한 번 Python 조건(Predicate)으로 컴파일합니다. 같은 SQL 의 구독은 채널 하나를 공유합니다.
+- ChangeFeed 의 스레드가 변경 이벤트(outbox.consumer)를 읽어 리소스별로 바뀐 행을 한 번만
+  읽고 직렬화한 뒤, 채널마다 조건을 행에 적용해 델타를 broker 로 보냅니다.
+  컴파일할 수 없는 조건(검색, 관계 조회 등)은 배치마다 채널당 쿼리 한 번으로 확인합니다.
+- 조건에 맞지 않는 행의 delete 델타는 삭제되었거나 조건에 쓰인 필드가 바뀐 경우에 보냅니다
+  (목록에 없던 id 면 클라이언트는 무시합니다).
+
+broker 는 CHANGE_FEED_BROKER 로 바꿀 수 있고 기본값은 프로세스 안의 InMemoryBroker 입니다.
+"""
+import asyncio
+import hashlib
+import logging
+import operator
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.db.models.sql.where import AND, NothingNode, WhereNode
+from django.http import QueryDict
+from django.utils.module_loading import import_string
+
+from .consumer import BATCH_SIZE, latest_cursor, wait_for_events
+from .models import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# 구독자 하나가 쌓아 둘 수 있는 메시지 수. 넘치면 reset 을 보내고 연결을 닫습니다.
+QUEUE_SIZE = 100
+# 변경 이벤트가 없을 때 다시 확인하는 간격 (초)
+WAIT_TIMEOUT = 5
+# 구독자에게 보내는 마지막 메시지 (밀려서 델타를 잃었음)
+OVERFLOW = object()
+
+
+class FeedError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def _text(op):
+    return lambda value, other: isinstance(value, str) and op(value, other)
+
+
+def _itext(op):
+    return lambda value, other: isinstance(value, str) and op(value.lower(), str(other).lower())
+
+
+LOOKUPS = {
+    'exact': operator.eq,
+    'iexact': _itext(operator.eq),
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'in': lambda value, other: value in other,
+    'contains': _text(lambda value, other: other in value),
+    'icontains': _itext(lambda value, other: other in value),
+    'startswith': _text(str.startswith),
+    'istartswith': _itext(str.startswith),
+    'endswith': _text(str.endswith),
+    'iendswith': _itext(str.endswith),
+}
+
+
+class Predicate:
+    """
+    행(모델 인스턴스)에 적용하는 컴파일된 조건. fields 는 조건에 쓰인 attname 집합입니다.
+    """
+
+    def __init__(self, test, fields):
+        self.test = test
+        self.fields = frozenset(fields)
+
+    def __call__(self, instance):
+        return self.test(instance)
+
+
+def _compile_lookup(lookup, table):
+    lhs, value = lookup.lhs, lookup.rhs
+    if not isinstance(lhs, Col) or lhs.alias != table or hasattr(value, 'resolve_expression'):
+        return None
+    attname = lhs.target.attname
+    if lookup.lookup_name == 'isnull':
+        return Predicate(lambda instance: (getattr(instance, attname) is None) == value, [attname])
+    compare = LOOKUPS.get(lookup.lookup_name)
+    if compare is None:
+        return None
+
+    def test(instance):
+        current = getattr(instance, attname)
+        return current is not None and compare(current, value)
+
+    return Predicate(test, [attname])
+
+
+def _compile_node(node, table):
+    if isinstance(node, NothingNode):
+        return Predicate(lambda instance: False, [])
+    if isinstance(node, Lookup):
+        return _compile_lookup(node, table)
+    if not isinstance(node, WhereNode):
+        return None
+    children = [_compile_node(child, table) for child in node.children]
+    if any(child is None for child in children):
+        return None
+    combine = all if node.connector == AND else any
+    negated = node.negated
+
+    def test(instance):
+        return combine(child(instance) for child in children) != negated
+
+    return Predicate(test, set().union(*(child.fields for child in children)))
+
+
+def compile_predicate(queryset):
+    """
+    queryset 의 WHERE 를 Predicate 로 컴파일합니다. 자기 테이블 컬럼과 값의 비교로만 이루어지지
+    않았으면(JOIN, 서브쿼리, 식) None 을 반환하므로 DB 에서 확인해야 합니다.
+    """
+    query = queryset.query
+    if query.is_sliced or query.combinator or query.distinct_fields:
+        return None
+    return _compile_node(query.where, query.base_table)
+
+
+class FeedFilter:
+    """
+    같은 SQL 조건의 구독이 공유하는 채널.
+    """
+
+    def __init__(self, resource, channel, queryset):
+        self.resource = resource
+        self.channel = channel
+        self.queryset = queryset
+        self.predicate = compile_predicate(queryset)
+        self.subscribers = 0
+
+    def matching(self, rows):
+        """
+        rows({pk: 인스턴스}) 중 조건에 맞는 pk 집합.
+        """
+        if self.predicate is not None:
+            return {pk for pk, row in rows.items() if self.predicate(row)}
+        return set(self.queryset.filter(pk__in=list(rows)).values_list('pk', flat=True))
+
+    def touches(self, fields):
+        # 바뀐 필드를 모르거나(전체 저장) 조건을 컴파일하지 못했으면 조건이 바뀐 것으로 봅니다.
+        if fields is None or self.predicate is None:
+            return True
+        return bool(self.predicate.fields & fields)
+
+
+class Mailbox:
+    """
+    구독자 하나의 메시지 큐. 구독자의 이벤트 루프에서 만들고 다른 스레드에서 넣을 수 있습니다.
+    """
+
+    def __init__(self, maxsize=QUEUE_SIZE):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self._deliver, message)
+
+    def _deliver(self, message):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = OVERFLOW
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryBroker:
+    """
+    프로세스 안 채널별 게시/구독. publish 는 스레드 안전합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mailboxes = {}
+
+    def subscribe(self, channel):
+        mailbox = Mailbox()
+        with self._lock:
+            self._mailboxes.setdefault(channel, set()).add(mailbox)
+        return mailbox
+
+    def unsubscribe(self, channel, mailbox):
+        with self._lock:
+            mailboxes = self._mailboxes.get(channel, set())
+            mailboxes.discard(mailbox)
+            if not mailboxes:
+                self._mailboxes.pop(channel, None)
+
+    def publish(self, channel, message):
+        with self._lock:
+            mailboxes = list(self._mailboxes.get(channel, ()))
+        for mailbox in mailboxes:
+            mailbox.put(message)
+
+
+def feed_viewsets():
+    return {
+        resource: import_string(path)
+        for resource, path in getattr(settings, 'CHANGE_FEEDS', {}).items()
+    }
+
+
+def list_view(viewset_class, scope):
+    """
+    ASGI scope 로 뷰셋의 list 요청을 만들고 인증/권한/쓰로틀을 확인한 뷰를 반환합니다.
+    브라우저 EventSource/WebSocket 은 헤더를 못 보내므로 ?token= 을 Bearer 토큰으로 씁니다.
+    """
+    request = ASGIRequest({**scope, 'method': 'GET'}, None)
+    token = QueryDict(scope.get('query_string', b'').decode('latin-1')).get('token')
+    if token and 'HTTP_AUTHORIZATION' not in request.META:
+        request.META['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    view = viewset_class()
+    view.action_map = {'get': 'list'}
+    view.action = 'list'
+    view.args, view.kwargs = (), {}
+    view.format_kwarg = None
+    view.headers = {}
+    view.request = view.initialize_request(request)
+    view.initial(view.request)
+    return view
+
+
+class ChangeFeed:
+    def __init__(self, broker=None, viewsets=None):
+        if broker is None:
+            broker = import_string(getattr(settings, 'CHANGE_FEED_BROKER', 'outbox.feeds.InMemoryBroker'))()
+        self.broker = broker
+        self.viewsets = feed_viewsets() if viewsets is None else viewsets
+        self.filters = {}
+        self.cursor = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, resource, scope):
+        """
+        resource 목록을 scope 의 쿼리 파라미터로 구독하고 FeedFilter 를 반환합니다 (DB 접근, 동기).
+        인증/권한/필터 검증에 실패하면 FeedError.
+        """
+        from rest_framework.exceptions import APIException
+
+        viewset_class = self.viewsets.get(resource)
+        if viewset_class is None:
+            raise FeedError(404, 'Unknown feed')
+        try:
+            view = list_view(viewset_class, scope)
+            queryset = view.filter_queryset(view.get_queryset()).order_by()
+        except APIException as exc:
+            raise FeedError(exc.status_code, exc.detail)
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            sql = ''
+        channel = f"{resource}:{hashlib.sha1(sql.encode()).hexdigest()[:16]}"
+        with self._lock:
+            feed_filter = self.filters.get(channel)
+            if feed_filter is None:
+                feed_filter = self.filters[channel] = FeedFilter(resource, channel, queryset)
+            feed_filter.subscribers += 1
+            if self.cursor is None:
+                self.cursor = latest_cursor()
+        return feed_filter
+
+    def unsubscribe(self, feed_filter):
+        with self._lock:
+            feed_filter.subscribers -= 1
+            if feed_filter.subscribers <= 0:
+                self.filters.pop(feed_filter.channel, None)
+
+    def publish_changes(self, events):
+        """
+        변경 이벤트 배치에서 구독 중인 목록의 델타를 만들어 채널별로 보냅니다.
+        """
+        with self._lock:
+            filters = list(self.filters.values())
+        by_resource = {}
+        for feed_filter in filters:
+            by_resource.setdefault(feed_filter.resource, []).append(feed_filter)
+        for resource, resource_filters in by_resource.items():
+            viewset_class = self.viewsets[resource]
+            model = viewset_class.queryset.model
+            label = model._meta.label_lower
+            changes = {}
+            for event in events:
+                if event.model != label:
+                    continue
+                pk = model._meta.pk.to_python(event.object_id)
+                first, fields = changes.get(pk, (event.action, set()))
+                if event.fields is None or fields is None:
+                    fields = None
+                else:
+                    fields |= {model._meta.get_field(name).attname for name in event.fields}
+                changes[pk] = (first, fields)
+            if changes:
+                self._publish_resource(viewset_class, resource_filters, changes)
+
+    def _publish_resource(self, viewset_class, filters, changes):
+        # 바뀐 행은 리소스마다 한 번만 읽고 직렬화합니다. 삭제된 행은 여기서 빠집니다.
+        rows = viewset_class.queryset.filter(pk__in=list(changes)).in_bulk()
+        data = {}
+        for feed_filter in filters:
+            matching = feed_filter.matching(rows)
+            deltas = []
+            for pk, (first, fields) in changes.items():
+                if pk in matching:
+                    if pk not in data:
+                        data[pk] = viewset_class.serializer_class(rows[pk]).data
+                    kind = 'create' if first == ChangeEvent.CREATE else 'update'
+                    deltas.append({'type': kind, 'id': pk, 'data': data[pk]})
+                elif first != ChangeEvent.CREATE and (pk not in rows or feed_filter.touches(fields)):
+                    # 이번 배치에서 생긴 행은 목록에 있던 적이 없으므로 지울 것도 없습니다.
+                    deltas.append({'type': 'delete', 'id': pk})
+            if deltas:
+                self.broker.publish(feed_filter.channel, {'resource': feed_filter.resource, 'changes': deltas})
+
+    def pump_once(self, timeout=0):
+        events, cursor = wait_for_events(self.cursor, BATCH_SIZE, timeout)
+        self.publish_changes(events)
+        self.cursor = cursor
+        return len(events)
+
+    def run(self):
+        while True:
+            with self._lock:
+                if not self.filters:
+                    self._thread = None
+                    self.cursor = None
+                    return
+            close_old_connections()
+            try:
+                self.pump_once(WAIT_TIMEOUT)
+            except Exception:
+                logger.exception("change feed pump failed")
+                time.sleep(WAIT_TIMEOUT)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="change-feed", daemon=True)
+                self._thread.start()
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_feed():
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = ChangeFeed()
+        return _feed
@@ -0,0 +1,25 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from outbox.consumer import databases
+from outbox.models import ChangeEvent
+
+KEEP_DAYS = 7
+
+
+class Command(BaseCommand):
+    help = (
+        "보관 기간이 지난 변경 이벤트를 모든 DB 에서 지웁니다. "
+        "그보다 오래 멈춰 있던 소비자는 테이블을 다시 읽어야 합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=KEEP_DAYS, help="보관할 기간 (일)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        for alias in databases():
+            deleted, _ = ChangeEvent.objects.using(alias).filter(created_at__lt=cutoff).delete()
+            self.stdout.write(f"{alias}: {deleted} events pruned")
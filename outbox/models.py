@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeEvent(models.Model):
+    """
+    모델 쓰기 한 건의 변경 이벤트. 쓰기와 같은 트랜잭션, 같은 DB 에 추가됩니다 (outbox.capture).
+    id 가 DB 별 이벤트 위치이며 소비자는 id 순서로 읽습니다 (outbox.consumer).
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    SOFT_DELETE = 'soft_delete'
+    RESTORE = 'restore'
+    DELETE = 'delete'
+    ACTION_CHOICES = [
+        (CREATE, 'Create'),
+        (UPDATE, 'Update'),
+        (SOFT_DELETE, 'Soft delete'),
+        (RESTORE, 'Restore'),
+        (DELETE, 'Delete'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=100)  # 예: "book.book"
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    # 바뀐 필드 이름 목록. 모든 필드가 저장되었으면 null
+    fields = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    # 샤드 모델(ReadingHistory)의 이벤트도 같은 트랜잭션에 넣기 위해 모든 샤드에 둡니다.
+    on_every_shard = True
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.id} {self.action} {self.model}:{self.object_id}"
+
+
+class ConsumerCheckpoint(models.Model):
+    """
+    소비자별로 처리를 마친 위치 (outbox.consumer.format_cursor 형식).
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    cursor = models.CharField(max_length=1000, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.cursor}"
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from .consumer import BATCH_SIZE, MAX_BATCH_SIZE, parse_cursor
+from .models import ChangeEvent
+
+# long-poll 최대 대기 시간 (초)
+MAX_WAIT = 30
+
+
+def validate_cursor(value):
+    try:
+        parse_cursor(value)
+    except ValueError as exc:
+        raise serializers.ValidationError(str(exc))
+    return value
+
+
+class ChangeEventSerializer(serializers.ModelSerializer):
+    database = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = ChangeEvent
+        fields = ['id', 'database', 'model', 'object_id', 'action', 'fields', 'created_at']
+
+
+class ChangeQuerySerializer(serializers.Serializer):
+    """
+    변경 이벤트 조회 파라미터. cursor 가 없으면 consumer 의 체크포인트에서 읽습니다.
+    """
+    cursor = serializers.CharField(required=False, allow_blank=True, validators=[validate_cursor])
+    consumer = serializers.CharField(required=False, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_BATCH_SIZE, default=BATCH_SIZE)
+    wait = serializers.FloatField(min_value=0, max_value=MAX_WAIT, default=0)
+
+
+class CheckpointSerializer(serializers.Serializer):
+    cursor = serializers.CharField(allow_blank=True, max_length=1000, validators=[validate_cursor])
@@ -0,0 +1,134 @@
+import datetime
+
+import pytest
+from django.contrib import admin
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from book.admin import AuthorAdmin
+from book.models import Author, Book, Genre, ReadingHistory, UserProfile
+from book.tests.factories import AuthorFactory, BookFactory, GenreFactory, UserFactory
+from outbox.models import ChangeEvent
+
+
+def events(model, **filters):
+    return list(
+        ChangeEvent.objects.filter(model=model._meta.label_lower, **filters)
+        .order_by('id')
+        .values_list('object_id', 'action', 'fields')
+    )
+
+
+@pytest.mark.django_db
+class TestChangeCapture:
+    def test_save_soft_delete_and_restore(self):
+        book = BookFactory()
+        key = str(book.pk)
+        book = Book.objects.get(pk=book.pk)
+        book.title = 'Renamed'
+        book.save(update_fields=['title'])
+        book.delete()
+        book.restore()
+        assert events(Book, object_id=key) == [
+            (key, 'create', None),
+            (key, 'update', ['title']),
+            (key, 'soft_delete', None),
+            (key, 'restore', None),
+        ]
+        # 책 수가 바뀐 저자도 update() 이벤트를 남깁니다.
+        assert ('update', ['book_count', 'updated_at']) in [
+            (action, fields) for _, action, fields in events(Author, object_id=str(book.author_id))
+        ]
+
+    def test_admin_queryset_update_records_each_row(self):
+        authors = AuthorFactory.create_batch(3)
+        ChangeEvent.objects.all().delete()
+        AuthorAdmin(Author, admin.site).soft_delete(None, Author.objects.filter(pk__in=[a.pk for a in authors[:2]]))
+        assert events(Author) == [
+            (str(author.pk), 'soft_delete', ['deleted', 'deleted_at', 'updated_at'])
+            for author in sorted(authors[:2], key=lambda author: author.pk)
+        ]
+        assert Author.objects.count() == 1
+
+    def test_hard_delete_and_m2m_changes(self):
+        book = BookFactory()
+        genre = GenreFactory()
+        ChangeEvent.objects.all().delete()
+        key = str(book.pk)
+        book.genres.add(genre)
+        # 역방향 clear 도 책 쪽 이벤트로 남습니다.
+        genre.books.clear()
+        book.hard_delete()
+        # 장르 변경은 updated_at 갱신(touch_books_on_genre_change)과 관계 변경을 함께 남깁니다.
+        assert events(Book) == [
+            (key, 'update', ['updated_at']),
+            (key, 'update', ['genres']),
+            (key, 'update', ['updated_at']),
+            (key, 'update', ['genres']),
+            (key, 'delete', None),
+        ]
+
+    def test_bulk_create_inserts_in_bulk_without_save(self, monkeypatch):
+        author = AuthorFactory()
+        existing = BookFactory(author=author)
+        ChangeEvent.objects.all().delete()
+
+        def save(*args, **kwargs):
+            raise AssertionError('bulk_create must not call save()')
+
+        monkeypatch.setattr(Book, 'save', save)
+        books = [
+            BookFactory.build(author=author, slug=f'bulk-{i}', isbn=f'978000000{i:04d}') for i in range(20)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            Book.objects.bulk_create(books)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "book_book"')]
+        assert len(inserts) == 1
+        created = Book.objects.exclude(pk=existing.pk).order_by('pk')
+        assert events(Book) == [(str(pk), 'create', None) for pk in created.values_list('pk', flat=True)]
+        # save() 를 거치지 않으므로 저자의 책 수도 그대로입니다 (sync_book_counts 로 맞춤).
+        author.refresh_from_db()
+        assert author.book_count == 1
+
+    def test_bulk_create_ignore_conflicts_records_only_new_rows(self):
+        genre = GenreFactory(name='Kept')
+        ChangeEvent.objects.all().delete()
+        Genre.objects.bulk_create([Genre(name='Kept'), Genre(name='New')], ignore_conflicts=True)
+        assert events(Genre) == [(str(Genre.objects.get(name='New').pk), 'create', None)]
+        assert genre.pk != Genre.objects.get(name='New').pk
+
+    def test_author_rename_and_genre_change_record_book_events(self):
+        book = BookFactory()
+        genre = GenreFactory()
+        author = Author.objects.get(pk=book.author_id)
+        ChangeEvent.objects.all().delete()
+        author.name = 'Renamed'
+        author.save()
+        book.genres.add(genre)
+        genre.books.clear()
+        assert [(action, fields) for _, action, fields in events(Book)] == [
+            ('update', ['updated_at']),
+            ('update', ['updated_at']),
+            ('update', ['genres']),
+            ('update', ['updated_at']),
+            ('update', ['genres']),
+        ]
+
+    def test_rolled_back_write_leaves_no_event(self):
+        ChangeEvent.objects.all().delete()
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                AuthorFactory()
+                raise RuntimeError
+        assert not ChangeEvent.objects.exists()
+
+    def test_sharded_rows_record_events(self):
+        profile = UserProfile.objects.create(user=UserFactory())
+        history = ReadingHistory.objects.create(
+            user=profile, book=BookFactory(), date_read=datetime.date(2024, 1, 1), rating=4
+        )
+        ReadingHistory.objects.for_user(profile).update(rating=5)
+        ReadingHistory.objects.for_user(profile).delete()
+        assert [action for _, action, _ in events(ReadingHistory, object_id=str(history.pk))] == [
+            'create', 'update', 'delete'
+        ]
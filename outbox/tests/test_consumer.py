@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from book.tests.factories import AuthorFactory, UserFactory
+from outbox.consumer import Consumer, format_cursor, read_events
+from outbox.models import ChangeEvent
+from outbox.views import sse_stream
+
+
+def start_cursor():
+    last = ChangeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    return format_cursor({'default': last})
+
+
+@pytest.mark.django_db
+class TestConsumer:
+    def test_batches_and_checkpoint(self):
+        consumer = Consumer('search-index', batch_size=2)
+        consumer.commit(start_cursor())
+        authors = AuthorFactory.create_batch(3)
+        handled = []
+        assert consumer.process(handled.extend) == 2
+        assert consumer.process(handled.extend) == 1
+        assert consumer.process(handled.extend) == 0
+        assert [event.object_id for event in handled] == [str(author.pk) for author in authors]
+        assert {event.database for event in handled} == {'default'}
+
+        # 처리 중 실패하면 체크포인트가 그대로라 같은 배치를 다시 받습니다.
+        AuthorFactory()
+        cursor = consumer.cursor()
+        with pytest.raises(RuntimeError):
+            consumer.process(lambda events: (_ for _ in ()).throw(RuntimeError()))
+        assert consumer.cursor() == cursor
+        assert consumer.process(handled.extend) == 1
+
+    def test_waits_out_gaps_from_uncommitted_transactions(self):
+        cursor = start_cursor()
+        base = int(cursor.split(':')[1])
+        now = timezone.now()
+        ChangeEvent.objects.create(id=base + 1, model='book.author', object_id='1', action='create', created_at=now)
+        ChangeEvent.objects.create(id=base + 3, model='book.author', object_id='3', action='create', created_at=now)
+        found, next_cursor = read_events(cursor, now=now)
+        assert [event.id for event in found] == [base + 1]
+        # 빈틈이 GAP_WAIT 보다 오래되면 롤백된 것으로 보고 넘어갑니다.
+        found, _ = read_events(next_cursor, now=now + datetime.timedelta(minutes=1))
+        assert [event.id for event in found] == [base + 3]
+
+    def test_sse_stream_ids_are_cursors(self):
+        cursor = start_cursor()
+        author = AuthorFactory()
+        chunks = list(sse_stream(cursor, limit=10, duration=0.01))
+        assert chunks[0].startswith('retry:')
+        event = ChangeEvent.objects.get(model='book.author', object_id=str(author.pk))
+        assert f"id: default:{event.id}\nevent: change\n" in chunks[1]
+        assert '"action":"create"' in chunks[1]
+
+
+@pytest.mark.django_db
+class TestChangeViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+
+    def test_list_and_checkpoint(self):
+        url = reverse('consumer_checkpoint', args=['analytics'])
+        cursor = start_cursor()
+        assert self.client.put(url, {'cursor': cursor}, format='json').data['cursor'] == cursor
+        author = AuthorFactory()
+        response = self.client.get(reverse('change_list'), {'consumer': 'analytics'})
+        assert response.status_code == 200
+        assert [(e['model'], e['object_id'], e['action']) for e in response.data['events']] == [
+            ('book.author', str(author.pk), 'create')
+        ]
+        response = self.client.get(reverse('change_list'), {'cursor': response.data['cursor'], 'wait': 0.01})
+        assert response.data['events'] == []
+
+    def test_rejects_invalid_cursor_and_non_staff(self):
+        assert self.client.get(reverse('change_list'), {'cursor': 'nowhere:1'}).status_code == 400
+        self.client.force_authenticate(user=UserFactory())
+        assert self.client.get(reverse('change_list')).status_code == 403
@@ -0,0 +1,119 @@
+import asyncio
+import datetime
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book.filters import BookFilter
+from book.models import Book
+from book.tests.factories import AuthorFactory
+from lab.tests.factories import ExperimentFactory, UserFactory
+from lab.views import ExperimentViewSet
+from outbox.asgi import ChangeFeedASGIHandler
+from outbox.consumer import read_events
+from outbox.feeds import ChangeFeed, FeedError, InMemoryBroker, compile_predicate
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def scope(path, query='', user=None, type='http'):
+    headers = [(b'authorization', f'Bearer {AccessToken.for_user(user)}'.encode())] if user else []
+    return {'type': type, 'path': path, 'query_string': query.encode(), 'headers': headers}
+
+
+@pytest.mark.django_db
+class TestCompilePredicate:
+    def test_filterset_conditions_compile_to_python(self):
+        author = AuthorFactory()
+        queryset = BookFilter(
+            {'author': author.pk, 'min_price': '10', 'publication_year': '2021'}, queryset=Book.objects.all()
+        ).qs
+        predicate = compile_predicate(queryset)
+        assert predicate.fields == {'deleted', 'author_id', 'price', 'publication_date'}
+        book = Book(author=author, price=Decimal('12.00'), publication_date=datetime.date(2021, 5, 1))
+        assert predicate(book)
+        book.price = Decimal('9.99')
+        assert not predicate(book)
+        book.price, book.deleted = Decimal('12.00'), True
+        assert not predicate(book)
+
+    def test_joins_fall_back_to_the_database(self):
+        assert compile_predicate(Book.objects.filter(author__name='Kim')) is None
+
+
+@pytest.mark.django_db
+class TestChangeFeed:
+    def setup_method(self):
+        self.broker = RecordingBroker()
+        self.feed = ChangeFeed(broker=self.broker, viewsets={'experiments': ExperimentViewSet})
+        self.user = UserFactory()
+
+    def test_subscribers_with_same_filter_share_a_channel(self):
+        first = self.feed.subscribe('experiments', scope('/', 'status=IN_PROGRESS', self.user))
+        second = self.feed.subscribe('experiments', scope('/', 'status=IN_PROGRESS&token=', self.user))
+        other = self.feed.subscribe('experiments', scope('/', 'status=PLANNED', self.user))
+        assert first is second and first is not other
+        assert first.predicate is not None
+        with pytest.raises(FeedError) as error:
+            self.feed.subscribe('experiments', scope('/', 'status=IN_PROGRESS'))
+        assert error.value.status == 401
+
+    def test_deltas_follow_the_filter(self):
+        feed_filter = self.feed.subscribe('experiments', scope('/', 'status=IN_PROGRESS', self.user))
+        running = ExperimentFactory(researcher=self.user, status='IN_PROGRESS')
+        planned = ExperimentFactory(researcher=self.user, status='PLANNED')
+        self.feed.pump_once()
+        running.status = 'COMPLETED'
+        running.save(update_fields=['status'])
+        planned.name = 'Renamed'
+        planned.save(update_fields=['name'])
+        self.feed.pump_once()
+        channels = {channel for channel, _ in self.broker.published}
+        assert channels == {feed_filter.channel}
+        changes = [message['changes'] for _, message in self.broker.published]
+        assert [(c['type'], c['id']) for c in changes[0]] == [('create', running.pk)]
+        assert changes[0][0]['data']['status'] == 'IN_PROGRESS'
+        # 조건 필드가 바뀌어 빠진 행만 delete, 조건과 무관한 변경은 보내지 않습니다.
+        assert changes[1] == [{'type': 'delete', 'id': running.pk}]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_websocket_receives_deltas(monkeypatch):
+    user = UserFactory()
+    feed = ChangeFeed(broker=InMemoryBroker(), viewsets={'experiments': ExperimentViewSet})
+    monkeypatch.setattr(feed, 'start', lambda: None)
+    handler = ChangeFeedASGIHandler(None, feed=feed)
+
+    def change():
+        experiment = ExperimentFactory(researcher=user, status='IN_PROGRESS')
+        feed.pump_once()
+        return experiment
+
+    async def run():
+        incoming, outgoing = asyncio.Queue(), asyncio.Queue()
+        await incoming.put({'type': 'websocket.connect'})
+        task = asyncio.ensure_future(handler(
+            scope('/api/feeds/experiments/', 'status=IN_PROGRESS', user, type='websocket'),
+            incoming.get, outgoing.put,
+        ))
+        assert (await outgoing.get())['type'] == 'websocket.accept'
+        while not feed.filters:
+            await asyncio.sleep(0.01)
+        experiment = await sync_to_async(change)()
+        message = await asyncio.wait_for(outgoing.get(), 5)
+        await incoming.put({'type': 'websocket.disconnect'})
+        await asyncio.wait_for(task, 5)
+        return experiment, message
+
+    experiment, message = asyncio.run(run())
+    assert f'"id": {experiment.pk}' in message['text'] and '"type": "create"' in message['text']
+    assert feed.filters == {}
+    assert read_events()[0]
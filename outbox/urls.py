@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import change_list, change_stream, consumer_checkpoint
+
+urlpatterns = [
+    path('changes/', change_list, name='change_list'),
+    path('changes/stream/', change_stream, name='change_stream'),
+    path('changes/consumers/<str:name>/', consumer_checkpoint, name='consumer_checkpoint'),
+]
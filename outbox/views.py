@@ -0,0 +1,101 @@
+import time
+
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .consumer import Consumer, format_cursor, parse_cursor, wait_for_events
+from .serializers import ChangeEventSerializer, ChangeQuerySerializer, CheckpointSerializer
+
+# SSE 연결 하나를 유지하는 시간 (초). 끊기면 클라이언트가 Last-Event-ID 로 다시 연결합니다.
+STREAM_SECONDS = 60
+KEEPALIVE_SECONDS = 15
+RETRY_MILLISECONDS = 1000
+
+
+class EventStreamRenderer(JSONRenderer):
+    # EventSource 는 Accept: text/event-stream 으로 요청합니다. 오류 응답은 JSON 본문입니다.
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+
+def _query(request, cursor=None):
+    params = request.query_params.dict()
+    if cursor is not None and 'cursor' not in params:
+        params['cursor'] = cursor
+    serializer = ChangeQuerySerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    query = serializer.validated_data
+    if 'cursor' not in query:
+        query['cursor'] = Consumer(query['consumer']).cursor() if 'consumer' in query else ''
+    return query
+
+
+@extend_schema(tags=['Changes'], parameters=[ChangeQuerySerializer])
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def change_list(request):
+    """
+    cursor 다음 변경 이벤트와 다음 커서. 이벤트가 없으면 wait 초 동안 기다립니다 (long-poll).
+    """
+    query = _query(request)
+    events, cursor = wait_for_events(query['cursor'], query['limit'], query['wait'])
+    return Response({'events': ChangeEventSerializer(events, many=True).data, 'cursor': cursor})
+
+
+def sse_stream(cursor, limit, duration=STREAM_SECONDS):
+    """
+    변경 이벤트를 text/event-stream 형식으로 내보냅니다. 각 이벤트의 id 는 그 이벤트까지의 커서입니다.
+    """
+    renderer = JSONRenderer()
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+    deadline = time.monotonic() + duration
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        events, next_cursor = wait_for_events(cursor, limit, min(KEEPALIVE_SECONDS, remaining))
+        positions = parse_cursor(cursor)
+        for event in events:
+            positions[event.database] = event.id
+            data = renderer.render(ChangeEventSerializer(event).data).decode()
+            yield f"id: {format_cursor(positions)}\nevent: change\ndata: {data}\n\n"
+        if not events:
+            yield ": keepalive\n\n"
+        cursor = next_cursor
+
+
+@extend_schema(tags=['Changes'], parameters=[ChangeQuerySerializer], responses={200: None})
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def change_stream(request):
+    """
+    변경 이벤트 SSE 스트림. 다시 연결할 때는 Last-Event-ID 헤더의 커서부터 이어서 보냅니다.
+    연결마다 워커 하나를 STREAM_SECONDS 동안 쓰므로 로컬/내부 소비자용입니다.
+    """
+    query = _query(request, cursor=request.headers.get('Last-Event-ID'))
+    response = StreamingHttpResponse(
+        sse_stream(query['cursor'], query['limit']), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@extend_schema(tags=['Changes'], request=CheckpointSerializer, responses=CheckpointSerializer)
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAdminUser])
+def consumer_checkpoint(request, name):
+    """
+    소비자 name 의 체크포인트. 처리를 마친 배치의 cursor 를 PUT 으로 저장합니다.
+    """
+    consumer = Consumer(name)
+    if request.method == 'PUT':
+        serializer = CheckpointSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        consumer.commit(serializer.validated_data['cursor'])
+    return Response({'name': name, 'cursor': consumer.cursor()})
@@ -1,7 +1,8 @@
 from django.db import models
 from django.utils import timezone
+from outbox.capture import ChangeTrackingManager, ChangeTrackingMixin
 
-class SoftDeleteManager(models.Manager):
+class SoftDeleteManager(ChangeTrackingManager):
     def get_queryset(self):
         return super().get_queryset().filter(deleted=False)
 
@@ -30,7 +31,7 @@ class BaseModel(models.Model):
     def hard_delete(self):
         super().delete()
 
-class Person(BaseModel):
+class Person(ChangeTrackingMixin, BaseModel):
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     email = models.EmailField(unique=True)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from blog_project.fieldsets import SparseFieldsetMixin
 from .models import Person
 from django.utils import timezone
 
-class PersonSerializer(serializers.ModelSerializer):
+class PersonSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
     age = serializers.SerializerMethodField()
     is_adult = serializers.SerializerMethodField()
@@ -12,6 +13,13 @@ class PersonSerializer(serializers.ModelSerializer):
         model = Person
         fields = ['id', 'first_name', 'last_name', 'full_name', 'email', 'birth_date', 'age', 'is_adult', 'zodiac_sign', 'gender', 'created_at', 'updated_at', 'deleted']
         read_only_fields = ['created_at', 'updated_at', 'deleted']
+        # 메서드 필드가 읽는 컬럼 (목록 조회 시 컬럼 가지치기에 사용)
+        method_field_columns = {
+            'full_name': ['first_name', 'last_name'],
+            'age': ['birth_date'],
+            'is_adult': ['birth_date'],
+            'zodiac_sign': ['birth_date'],
+        }
 
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
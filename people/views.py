@@ -1,5 +1,4 @@
-import logging
-from rest_framework import viewsets, filters, status
+from rest_framework import filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -9,6 +8,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from .models import Person
 from .serializers import PersonSerializer
 from book.views import IsOwnerOrReadOnly
+from blog_project.viewsets import BaseModelViewSet
 from django.views.generic import (
     ListView,
     DetailView,
@@ -21,11 +21,9 @@ from django.urls import reverse_lazy
 from django.views.generic.list import MultipleObjectMixin
 from django.views.generic.detail import SingleObjectMixin
 
-logger = logging.getLogger(__name__)
-
 
 @extend_schema(tags=["People"])
-class PersonViewSet(viewsets.ModelViewSet):
+class PersonViewSet(BaseModelViewSet):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
@@ -44,36 +42,6 @@ class PersonViewSet(viewsets.ModelViewSet):
         "updated_at",
     ]
 
-    def list(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.list, URL: {request.get_full_path()}"
-        )
-        return super().list(request, *args, **kwargs)
-
-    def create(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.create, URL: {request.get_full_path()}"
-        )
-        return super().create(request, *args, **kwargs)
-
-    def retrieve(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.retrieve, URL: {request.get_full_path()}"
-        )
-        return super().retrieve(request, *args, **kwargs)
-
-    def update(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.update, URL: {request.get_full_path()}"
-        )
-        return super().update(request, *args, **kwargs)
-
-    def destroy(self, request, *args, **kwargs):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.destroy, URL: {request.get_full_path()}"
-        )
-        return super().destroy(request, *args, **kwargs)
-
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -83,9 +51,6 @@ class PersonViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"])
     def adults(self, request):
-        logger.info(
-            f"Accessed {self.__class__.__name__}.adults, URL: {request.get_full_path()}"
-        )
         min_age = int(request.query_params.get("min_age", 18))
         adults = Person.objects.filter(age__gte=min_age, deleted=False)
         if not adults.exists():
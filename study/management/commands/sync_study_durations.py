@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from study.models import recompute_durations
+
+
+class Command(BaseCommand):
+    help = (
+        "Study.duration_days 를 시작/종료일로 다시 계산합니다. sync_indexes 로 컬럼을 추가한 "
+        "뒤나 save() 를 거치지 않고 날짜를 바꾼 뒤 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        fixed = recompute_durations(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"{fixed} studies fixed."))
@@ -1,8 +1,15 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
+from blog_project.cache import bump_generation
+from outbox.capture import ChangeTrackingManager, ChangeTrackingMixin
 from user.models import CustomUser
 
-class SoftDeleteManager(models.Manager):
+# 진행 중인 스터디 캐시(StudyViewSet.active/ongoing) 무효화
+STUDY_CACHE_NAMESPACE = 'studies'
+
+class SoftDeleteManager(ChangeTrackingManager):
     def get_queryset(self):
         return super().get_queryset().filter(deleted=False)
 
@@ -31,25 +38,76 @@ class BaseModel(models.Model):
     def hard_delete(self):
         super().delete()
 
-class Study(BaseModel):
+class Study(ChangeTrackingMixin, BaseModel):
     title = models.CharField(max_length=100)
     description = models.TextField()
     start_date = models.DateField()
     end_date = models.DateField()
     owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='studies')
+    # end_date - start_date (일). 저장할 때 계산합니다 (by_duration, 정렬용).
+    duration_days = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-start_date']
         verbose_name = 'Study'
         verbose_name_plural = 'Studies'
+        indexes = [
+            # 오늘 진행 중인 스터디 (blog_project.timewindows.ongoing)
+            models.Index(fields=['start_date', 'end_date'], name='study_interval_idx'),
+            models.Index(fields=['duration_days'], name='study_duration_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        start = self._meta.get_field('start_date').to_python(self.start_date)
+        end = self._meta.get_field('end_date').to_python(self.end_date)
+        self.duration_days = (end - start).days
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'start_date', 'end_date'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'duration_days'}
+        super().save(*args, **kwargs)
+
     @property
     def is_active(self):
-        return self.start_date <= timezone.now().date() <= self.end_date
+        return self.start_date <= timezone.localdate() <= self.end_date
 
     @property
     def duration(self):
-        return (self.end_date - self.start_date).days
+        return self.duration_days
+
+def recompute_durations(using=None, batch_size=1000):
+    """
+    duration_days 가 날짜와 맞지 않는 스터디를 고치고 고친 수를 반환합니다.
+    save() 를 거치지 않고 넣거나 바꾼 행(컬럼 추가 직후의 기존 행 등)에 사용합니다.
+    """
+    fixed = 0
+    rows = Study.objects.db_manager(using).all_with_deleted().order_by('pk').only('start_date', 'end_date', 'duration_days')
+    batch = []
+    for study in rows.iterator(chunk_size=batch_size):
+        days = (study.end_date - study.start_date).days
+        if study.duration_days != days:
+            study.duration_days = days
+            batch.append(study)
+        if len(batch) >= batch_size:
+            Study.objects.db_manager(using).all_with_deleted().bulk_update(batch, ['duration_days'])
+            fixed += len(batch)
+            batch = []
+    if batch:
+        Study.objects.db_manager(using).all_with_deleted().bulk_update(batch, ['duration_days'])
+        fixed += len(batch)
+    if fixed:
+        bump_generation(STUDY_CACHE_NAMESPACE)
+    return fixed
+
+@receiver(post_save, sender=Study)
+@receiver(post_delete, sender=Study)
+def invalidate_study_caches(sender, **kwargs):
+    bump_generation(STUDY_CACHE_NAMESPACE)
+
+# 응답에 소유자 이름이 들어가므로 사용자 변경도 반영 (로그인 시각 갱신은 제외)
+@receiver(post_save, sender=CustomUser)
+def invalidate_study_owner_caches(sender, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_generation(STUDY_CACHE_NAMESPACE)
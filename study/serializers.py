@@ -1,11 +1,13 @@
 from rest_framework import serializers
+from blog_project.fieldsets import SparseFieldsetMixin
+from user.serializers import CustomUserSerializer
 from .models import Study
 from .validators import validate_date_not_in_past, validate_end_date_after_start_date
-from django.utils import timezone
+from blog_project.timewindows import today
 
-class StudySerializer(serializers.ModelSerializer):
+class StudySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     is_active = serializers.SerializerMethodField()
-    duration = serializers.SerializerMethodField()
+    duration = serializers.IntegerField(source='duration_days', read_only=True)
     progress_percentage = serializers.SerializerMethodField()
     owner = serializers.ReadOnlyField(source='owner.username')
 
@@ -13,16 +15,20 @@ class StudySerializer(serializers.ModelSerializer):
         model = Study
         fields = ['id', 'title', 'description', 'start_date', 'end_date', 'is_active', 'duration', 'progress_percentage', 'owner', 'created_at', 'updated_at', 'deleted']
         read_only_fields = ['created_at', 'updated_at', 'deleted']
+        # 메서드 필드가 읽는 컬럼 (목록 조회 시 컬럼 가지치기에 사용)
+        method_field_columns = {
+            'is_active': ['start_date', 'end_date'],
+            'progress_percentage': ['start_date', 'end_date'],
+        }
+        # ?expand=owner 로 사용자 이름 대신 사용자 객체를 반환
+        expandable_fields = {'owner': CustomUserSerializer}
 
     def get_is_active(self, obj):
-        now = timezone.now().date()
+        now = today()
         return obj.start_date <= now <= obj.end_date
 
-    def get_duration(self, obj):
-        return (obj.end_date - obj.start_date).days
-
     def get_progress_percentage(self, obj):
-        now = timezone.now().date()
+        now = today()
         if now < obj.start_date:
             return 0
         elif now > obj.end_date:
@@ -34,7 +40,9 @@ class StudySerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
         super(StudySerializer, self).__init__(*args, **kwargs)
-        self.fields['start_date'].validators.append(validate_date_not_in_past)
+        # ?fields= 로 start_date 를 빼고 조회할 수 있습니다.
+        if 'start_date' in self.fields:
+            self.fields['start_date'].validators.append(validate_date_not_in_past)
 
     def validate(self, data):
         if 'start_date' in data and 'end_date' in data:
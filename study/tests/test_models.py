@@ -1,5 +1,6 @@
 import pytest
 from .factories import StudyFactory
+from study.models import Study, recompute_durations
 from django.utils import timezone
 
 @pytest.mark.django_db
@@ -21,3 +22,12 @@ class TestStudyModel:
     def test_duration(self):
         study = StudyFactory(start_date=timezone.now().date(), end_date=timezone.now().date() + timezone.timedelta(days=7))
         assert study.duration == 7
+
+    def test_recompute_durations(self):
+        study = StudyFactory(start_date='2030-01-01', end_date='2030-01-08')
+        deleted = StudyFactory(start_date='2030-01-01', end_date='2030-01-03', deleted=True)
+        Study.objects.all_with_deleted().update(duration_days=0)
+        assert recompute_durations() == 2
+        assert Study.objects.get(pk=study.pk).duration_days == 7
+        assert Study.objects.all_with_deleted().get(pk=deleted.pk).duration_days == 2
+        assert recompute_durations() == 0
@@ -91,5 +91,19 @@ class TestStudyViews:
         url = reverse('study-by-duration')
         response = self.client.get(url, {'min_duration': 10, 'max_duration': 20})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['duration'] == 15
+
+    def test_study_by_duration_rejects_invalid_bounds(self):
+        url = reverse('study-by-duration')
+        response = self.client.get(url, {'min_duration': 'ten', 'max_duration': 20})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'min_duration' in response.data
+
+    def test_duration_updated_with_dates(self):
+        study = StudyFactory(owner=self.user, start_date='2030-01-01', end_date='2030-01-11')
+        study.end_date = timezone.datetime(2030, 2, 1).date()
+        study.save(update_fields=['end_date'])
+        study.refresh_from_db()
+        assert study.duration_days == 31
 
@@ -1,30 +1,41 @@
-from rest_framework import viewsets, filters
+from rest_framework import filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from .models import Study
+from .models import STUDY_CACHE_NAMESPACE, Study
 from .serializers import StudySerializer
 from book.views import IsOwnerOrReadOnly
-from datetime import timezone
-import logging
+from blog_project.viewsets import BaseModelViewSet
+from rest_framework import status
 from rest_framework.exceptions import NotFound, ValidationError
-from django.db import models
-from datetime import timedelta
-from django.db.models import ExpressionWrapper, F, DurationField
-
-logger = logging.getLogger(__name__)
+from django.utils.http import urlencode
+from blog_project import timewindows
+from blog_project.cache import generation
 
 @extend_schema(tags=['Studies'])
-class StudyViewSet(viewsets.ModelViewSet):
+class StudyViewSet(BaseModelViewSet):
     queryset = Study.objects.all()
     serializer_class = StudySerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['start_date', 'end_date', 'deleted']
     search_fields = ['title', 'description']
-    ordering_fields = ['start_date', 'end_date', 'created_at', 'updated_at']
+    ordering_fields = ['start_date', 'end_date', 'duration_days', 'created_at', 'updated_at']
+
+    def ongoing_data(self):
+        """
+        오늘 진행 중인 스터디의 직렬화 결과. 하루 동안 같으므로 자정까지 캐시합니다.
+        """
+        params = urlencode(sorted(self.request.query_params.lists()), doseq=True)
+        key = f"{STUDY_CACHE_NAMESPACE}:{generation(STUDY_CACHE_NAMESPACE)}:ongoing:{params}"
+
+        def compute():
+            studies = timewindows.ongoing(self.get_queryset(), 'start_date', 'end_date')
+            return self.get_serializer(studies, many=True).data
+
+        return timewindows.cached_for_today(key, compute)
 
     @extend_schema(
         parameters=[
@@ -33,37 +44,36 @@ class StudyViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=['get'])
     def active(self, request):
-        logger.info(f"Accessed {self.__class__.__name__}.active, URL: {request.get_full_path()}")
-        active_studies = Study.objects.filter(
-            start_date__lte=timezone.now().date(),
-            end_date__gte=timezone.now().date(),
-            deleted=False
-        )
-        if not active_studies.exists():
+        data = self.ongoing_data()
+        if not data:
             raise NotFound("No active studies found", code='no_active_studies')
-        serializer = self.get_serializer(active_studies, many=True)
-        return Response(serializer.data)
+        return Response(data)
 
     @action(detail=False, methods=['get'])
     def ongoing(self, request):
-        ongoing_studies = Study.objects.filter(start_date__lte=timezone.now(), end_date__gte=timezone.now())
-        serializer = self.get_serializer(ongoing_studies, many=True)
-        return Response(serializer.data)
+        return Response(self.ongoing_data())
 
     @action(detail=False, methods=['get'])
     def by_duration(self, request):
         min_duration = request.query_params.get('min_duration')
         max_duration = request.query_params.get('max_duration')
-        if min_duration and max_duration:
-            studies = Study.objects.annotate(
-                duration=ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField())
-            ).filter(duration__gte=timedelta(days=int(min_duration)), duration__lte=timedelta(days=int(max_duration)))
-            serializer = self.get_serializer(studies, many=True)
-            return Response(serializer.data)
-        return Response({"error": "Please provide both min_duration and max_duration"}, status=status.HTTP_400_BAD_REQUEST)
+        if not (min_duration and max_duration):
+            return Response({"error": "Please provide both min_duration and max_duration"}, status=status.HTTP_400_BAD_REQUEST)
+        bounds = {}
+        for name, value in (('min_duration', min_duration), ('max_duration', max_duration)):
+            try:
+                bounds[name] = serializers.IntegerField(min_value=0).run_validation(value)
+            except ValidationError as exc:
+                raise ValidationError({name: exc.detail})
+        # duration_days 인덱스 범위 조회, ?ordering=duration_days 도 사용 가능
+        studies = self.filter_queryset(self.get_queryset()).filter(
+            duration_days__gte=bounds['min_duration'], duration_days__lte=bounds['max_duration']
+        )
+        page = self.paginate_queryset(studies)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def perform_destroy(self, instance):
-        logger.info(f"Accessed {self.__class__.__name__}.perform_destroy, URL: {self.request.get_full_path()}")
         if instance.deleted:
             raise ValidationError({"detail": "This study is already deleted"}, code='already_deleted')
         instance.delete()
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser
 from django.utils import timezone
+from blog_project.authentication import invalidate_cached_user
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
@@ -11,10 +12,16 @@ class CustomUserAdmin(UserAdmin):
 
     # 소프트 삭제 액션
     def soft_delete(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         queryset.update(deleted=True, deleted_at=timezone.now())
+        for pk in pks:
+            invalidate_cached_user(pk)
     soft_delete.short_description = "Soft delete selected users"
 
     # 삭제 취소 액션
     def restore(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         queryset.update(deleted=False, deleted_at=None)
+        for pk in pks:
+            invalidate_cached_user(pk)
     restore.short_description = "Restore selected users"
@@ -1,12 +1,26 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils import timezone
+from blog_project.authentication import invalidate_cached_user
+from outbox.capture import ChangeTrackingMixin, ChangeTrackingQuerySet
 
-class CustomUser(AbstractUser):
+class CustomUserManager(UserManager.from_queryset(ChangeTrackingQuerySet)):
+    pass
+
+class CustomUser(ChangeTrackingMixin, AbstractUser):
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
     deleted = models.BooleanField(default=False)  # 소프트 삭제를 위한 필드
     deleted_at = models.DateTimeField(null=True, blank=True)  # 삭제 시간 기록
 
+    objects = CustomUserManager()
+
+    # 저장 시 캐시된 JWT 인증 정보 무효화 (삭제/복구/비활성화/비밀번호 변경 반영)
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_cached_user(self.pk)
+
     # 소프트 삭제 메서드
     def soft_delete(self):
         self.deleted = True
@@ -18,3 +32,8 @@ class CustomUser(AbstractUser):
         self.deleted = False
         self.deleted_at = None
         self.save()
+
+# 실제 삭제(instance.delete(), queryset.delete(), 관리자 "선택 삭제") 시에도 캐시 무효화
+@receiver(post_delete, sender=CustomUser)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
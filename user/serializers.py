@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from blog_project.fieldsets import SparseFieldsetMixin
 from .models import CustomUser
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ('id', 'username', 'email', 'profile_image', 'deleted')
@@ -0,0 +1,15 @@
+import factory
+from faker import Faker
+from user.models import CustomUser
+
+fake = Faker()
+
+class CustomUserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CustomUser
+
+    username = factory.Faker('user_name')
+    email = factory.Faker('email')
+    password = factory.PostGenerationMethodCall('set_password', 'password123')
+
+UserFactory = CustomUserFactory
@@ -1,11 +1,12 @@
-from rest_framework import viewsets, status
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .models import CustomUser
+from blog_project.viewsets import BaseModelViewSet
 from .serializers import CustomUserSerializer, UserRegistrationSerializer, UserUpdateSerializer
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(BaseModelViewSet):
     queryset = CustomUser.objects.filter(deleted=False)
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]